@@ -0,0 +1,3 @@
+from .dataset_runner import DatasetEvaluationRunner, count_rows
+
+__all__ = ["DatasetEvaluationRunner", "count_rows"]
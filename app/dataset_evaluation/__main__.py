@@ -0,0 +1,63 @@
+"""
+Evaluate a JSONL dataset of {"ground_truth", "response"} rows:
+
+    python -m app.dataset_evaluation dataset.jsonl results.jsonl [--no-hallucination]
+
+Rerunning the same command after a crash resumes from the checkpoint next to the output.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import argparse
+from typing import Optional
+from app.dataset_evaluation.dataset_runner import DEFAULT_CHUNK_SIZE, DEFAULT_LLM_CONCURRENCY, DatasetEvaluationRunner
+
+
+def print_progress(progress: dict) -> None:
+    eta = progress["eta_seconds"]
+    print(
+        f"\r{progress['rows_done']}/{progress['total_rows']} rows | "
+        f"{progress['rows_per_second']:.1f} rows/s | ETA {f'{eta:.0f}s' if eta is not None else '--'}",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Streaming evaluation of a JSONL dataset with checkpoint/resume.")
+    parser.add_argument("input", help="JSONL file with ground_truth and response fields (optional id)")
+    parser.add_argument("output", help="JSONL file the per-row results are appended to")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, help="Metric worker processes (default: CPU count)")
+    parser.add_argument("--llm-concurrency", type=int, default=DEFAULT_LLM_CONCURRENCY)
+    parser.add_argument("--no-hallucination", action="store_true", help="Only compute the lexical/cosine metrics")
+    args = parser.parse_args(argv)
+
+    checker = None
+    if not args.no_hallucination:
+        from app.tools.hallucination_checker import HallucinationCheckerTool
+        checker = HallucinationCheckerTool()
+
+    runner = DatasetEvaluationRunner(
+        args.input,
+        args.output,
+        checkpoint_path=args.checkpoint,
+        chunk_size=args.chunk_size,
+        metric_workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        hallucination_checker=checker,
+        on_progress=print_progress,
+    )
+    summary = runner.run()
+    print(
+        f"\nEvaluated {summary['rows_done']} rows in {summary['elapsed_seconds']:.1f}s "
+        f"({summary['rows_per_second']:.1f} rows/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
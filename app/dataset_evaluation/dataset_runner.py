@@ -0,0 +1,241 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import asyncio
+import json
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+from app.tools.evaluate_llm.evaluate_llm_service_responses import EvaluateLLMResponsesService
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_LLM_CONCURRENCY = 8
+
+# One metrics service per worker process, created on its first chunk
+_process_service: Optional[EvaluateLLMResponsesService] = None
+
+
+def _score_chunk(pairs: List[dict]) -> List[dict]:
+    """Process-pool entry point: vectorized lexical/cosine/conciseness scores for a chunk."""
+    global _process_service
+    if _process_service is None:
+        _process_service = EvaluateLLMResponsesService()
+    return _process_service.evaluate_batch(pairs) if pairs else []
+
+
+def count_rows(path: str) -> int:
+    """Count non-empty lines without parsing them."""
+    rows = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                rows += 1
+    return rows
+
+
+def file_fingerprint(path: str) -> dict:
+    """Path, size and modification time of a file, to tell whether a checkpoint still
+    matches its input without reading the whole file."""
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class DatasetEvaluationRunner:
+    """
+    Evaluates a JSONL dataset of {"ground_truth", "response"} rows.
+
+    Rows are read in chunks; lexical/cosine/conciseness metrics for each chunk run on a
+    process pool and hallucination checks on a concurrency-limited async LLM pool.
+    Results are appended to the output JSONL in input order, and after every chunk a
+    checkpoint records how far input and output got, so a rerun resumes where a crash
+    stopped. The checkpoint is removed once the run completes, and ignored if the input
+    file's size or modification time has changed since it was written. At most `max_inflight_chunks` chunks are held in memory at once.
+    """
+
+    def __init__(
+        self,
+        input_path: str,
+        output_path: str,
+        checkpoint_path: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        metric_workers: Optional[int] = None,
+        llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+        hallucination_checker=None,
+        max_inflight_chunks: Optional[int] = None,
+        on_progress: Optional[Callable[[dict], None]] = None,
+    ):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0")
+        self.input_path = input_path
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+        self.chunk_size = chunk_size
+        self.metric_workers = metric_workers or os.cpu_count() or 1
+        self.llm_concurrency = llm_concurrency
+        self.hallucination_checker = hallucination_checker
+        self.max_inflight_chunks = max_inflight_chunks or self.metric_workers + 1
+        self.on_progress = on_progress or self._log_progress
+        self._input_fingerprint: Optional[dict] = None
+        logger.info(
+            f"DatasetEvaluationRunner initialized (chunk_size={chunk_size}, metric_workers={self.metric_workers}, "
+            f"llm_concurrency={llm_concurrency}, hallucination={'on' if hallucination_checker else 'off'})"
+        )
+
+    def run(self) -> dict:
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> dict:
+        self._input_fingerprint = file_fingerprint(self.input_path)
+        checkpoint = self._load_checkpoint()
+        total_rows = count_rows(self.input_path)
+        rows_done = checkpoint["rows_done"]
+        if rows_done:
+            logger.info(f"Resuming from checkpoint: {rows_done} of {total_rows} rows already evaluated")
+
+        started = time.perf_counter()
+        rows_this_run = 0
+        llm_slots = asyncio.Semaphore(self.llm_concurrency)
+        in_flight: deque = deque()
+
+        with open(self.output_path, "ab") as out:
+            out.truncate(checkpoint["output_offset"])
+            out.seek(checkpoint["output_offset"])
+            pool = ProcessPoolExecutor(max_workers=self.metric_workers, mp_context=multiprocessing.get_context("spawn"))
+            with pool, open(self.input_path, "rb") as src:
+                src.seek(checkpoint["input_offset"])
+
+                async def flush_oldest() -> None:
+                    nonlocal rows_done, rows_this_run
+                    task, input_offset = in_flight.popleft()
+                    results = await task
+                    for result in results:
+                        out.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+                    out.flush()
+                    os.fsync(out.fileno())
+                    rows_done += len(results)
+                    rows_this_run += len(results)
+                    self._save_checkpoint(input_offset, out.tell(), rows_done)
+                    self.on_progress(self._progress(rows_done, rows_this_run, total_rows, started))
+
+                for rows, input_offset in self._read_chunks(src, rows_done):
+                    if len(in_flight) >= self.max_inflight_chunks:
+                        await flush_oldest()
+                    task = asyncio.ensure_future(self._evaluate_chunk(rows, pool, llm_slots))
+                    in_flight.append((task, input_offset))
+                while in_flight:
+                    await flush_oldest()
+
+        # A finished output must not be resumed (and truncated) by the next run
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        summary = self._progress(rows_done, rows_this_run, total_rows, started)
+        logger.info(f"Dataset evaluation completed: {rows_done} rows written to {self.output_path}")
+        return summary
+
+    def _read_chunks(self, src, first_row: int):
+        """Yield (rows, input offset after the chunk); each row is (row number, raw line)."""
+        rows = []
+        row_number = first_row
+        for line in src:
+            if not line.strip():
+                continue
+            rows.append((row_number, line))
+            row_number += 1
+            if len(rows) == self.chunk_size:
+                yield rows, src.tell()
+                rows = []
+        if rows:
+            yield rows, src.tell()
+
+    async def _evaluate_chunk(self, rows, pool, llm_slots) -> List[dict]:
+        results = []
+        pairs = []
+        for row_number, line in rows:
+            result = {"row": row_number}
+            try:
+                record = json.loads(line)
+                ground_truth, response = record.get("ground_truth"), record.get("response")
+                if not isinstance(ground_truth, str) or not ground_truth or not isinstance(response, str) or not response:
+                    raise ValueError("ground_truth and response must be non-empty strings")
+                if "id" in record:
+                    result["id"] = record["id"]
+                pairs.append({"ground_truth": ground_truth, "response": response})
+            except (ValueError, AttributeError) as e:
+                result["error"] = f"Invalid row: {e}"
+            results.append(result)
+
+        valid = [result for result in results if "error" not in result]
+        loop = asyncio.get_running_loop()
+        metrics = loop.run_in_executor(pool, _score_chunk, pairs)
+        checks = [self._check_hallucination(pair, llm_slots) for pair in pairs] if self.hallucination_checker else []
+        scores, *hallucinations = await asyncio.gather(metrics, *checks)
+
+        for i, result in enumerate(valid):
+            result["scores"] = scores[i]
+            if self.hallucination_checker:
+                result["hallucination"] = hallucinations[i]
+        return results
+
+    async def _check_hallucination(self, pair: dict, llm_slots: asyncio.Semaphore) -> dict:
+        async with llm_slots:
+            try:
+                output = await asyncio.to_thread(self.hallucination_checker.run, pair)
+                return output["result"]
+            except Exception as e:
+                logger.warning(f"Hallucination check failed: {e}")
+                return {"error": str(e)}
+
+    def _load_checkpoint(self) -> dict:
+        empty = {"input_offset": 0, "output_offset": 0, "rows_done": 0}
+        if not os.path.exists(self.checkpoint_path):
+            if os.path.exists(self.output_path) and os.path.getsize(self.output_path):
+                logger.warning(f"No checkpoint found; overwriting existing output {self.output_path}")
+            return empty
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("input_path") != os.path.abspath(self.input_path):
+            raise ValueError(f"Checkpoint {self.checkpoint_path} belongs to a different input file")
+        if checkpoint.get("input_fingerprint") != self._input_fingerprint:
+            logger.warning(f"Input {self.input_path} changed since checkpoint {self.checkpoint_path}; "
+                           f"starting over and overwriting {self.output_path}")
+            return empty
+        return {key: checkpoint[key] for key in empty}
+
+    def _save_checkpoint(self, input_offset: int, output_offset: int, rows_done: int) -> None:
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "input_path": os.path.abspath(self.input_path),
+                "input_fingerprint": self._input_fingerprint,
+                "input_offset": input_offset,
+                "output_offset": output_offset,
+                "rows_done": rows_done,
+            }, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @staticmethod
+    def _progress(rows_done: int, rows_this_run: int, total_rows: int, started: float) -> Dict[str, float]:
+        elapsed = time.perf_counter() - started
+        rate = rows_this_run / elapsed if elapsed > 0 else 0.0
+        remaining = max(total_rows - rows_done, 0)
+        return {
+            "rows_done": rows_done,
+            "total_rows": total_rows,
+            "elapsed_seconds": elapsed,
+            "rows_per_second": rate,
+            "eta_seconds": remaining / rate if rate > 0 else None,
+        }
+
+    @staticmethod
+    def _log_progress(progress: dict) -> None:
+        eta = progress["eta_seconds"]
+        logger.info(
+            f"{progress['rows_done']}/{progress['total_rows']} rows, {progress['rows_per_second']:.1f} rows/s, "
+            f"ETA {f'{eta:.0f}s' if eta is not None else 'unknown'}"
+        )
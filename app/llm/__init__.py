@@ -1,3 +1,15 @@
 from .gemini_client import GeminiClient, LLMClient
+from .fake_clients import CassetteLLMClient, SyntheticLLMClient, create_llm_client
+from .model_router import ModelRouter, get_route_stats, route_models, task_route
 
-__all__ = ["GeminiClient", "LLMClient"]
\ No newline at end of file
+__all__ = [
+    "GeminiClient",
+    "LLMClient",
+    "CassetteLLMClient",
+    "SyntheticLLMClient",
+    "create_llm_client",
+    "ModelRouter",
+    "get_route_stats",
+    "route_models",
+    "task_route",
+]
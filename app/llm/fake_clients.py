@@ -0,0 +1,213 @@
+"""
+Offline stand-ins for GeminiClient, for deterministic tests and benchmarks.
+
+- CassetteLLMClient records real responses to a JSONL cassette (mode "record") and
+  replays them without network (mode "replay").
+- SyntheticLLMClient fabricates schema-conforming answers with configurable latency,
+  error rate and rate limiting.
+
+`create_llm_client(model)` picks the implementation from LLM_CLIENT_MODE
+(live | record | replay | synthetic); the model router uses it for every model.
+"""
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, Optional
+from .interfaces import LLMClient
+from .gemini_client import GeminiClient
+import logging
+
+logger = logging.getLogger(__name__)
+
+LLM_CLIENT_MODES = ("live", "record", "replay", "synthetic")
+
+_cassettes: Dict[str, "Cassette"] = {}
+_cassettes_lock = threading.Lock()
+
+
+class ThrottledError(RuntimeError):
+    """Raised by SyntheticLLMClient when its rate limit is exceeded (like an HTTP 429)."""
+
+
+class SyntheticLLMError(RuntimeError):
+    """Injected failure from SyntheticLLMClient (like an HTTP 503)."""
+
+
+class Cassette:
+    """Recorded LLM responses keyed by a hash of the request, stored as JSONL."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry["response"]
+        logger.info(f"Cassette {path} loaded with {len(self._entries)} recorded responses")
+
+    @staticmethod
+    def key(model: str, system_prompt: str, user_prompt: str, response_schema: Optional[dict], temperature: float) -> str:
+        request = json.dumps([model, system_prompt, user_prompt, response_schema, temperature], sort_keys=True)
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, response: dict) -> None:
+        with self._lock:
+            self._entries[key] = response
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "response": response}, ensure_ascii=False) + "\n")
+
+
+def get_cassette(path: str) -> Cassette:
+    """One Cassette per file per process, shared by every client using it."""
+    path = os.path.abspath(path)
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+class CassetteLLMClient(LLMClient):
+    """
+    Replays recorded responses; in record mode, forwards misses to `inner` (a live
+    GeminiClient by default) and appends the answer to the cassette.
+    """
+
+    def __init__(self, cassette_path: str, model: str = "gemini-2.5-flash-lite", record: bool = False,
+                 inner: Optional[LLMClient] = None):
+        self.cassette = get_cassette(cassette_path)
+        self.model = model
+        self.record = record
+        self.inner = inner if inner is not None or not record else GeminiClient(model_name=model)
+
+    def generate(self, system_prompt: str, user_prompt: str, response_schema: dict = None,
+                 response_type: str = "application/json", temperature: float = 0.0) -> Dict:
+        key = Cassette.key(self.model, system_prompt, user_prompt, response_schema, temperature)
+        recorded = self.cassette.get(key)
+        if recorded is not None:
+            return recorded
+        if not self.record:
+            raise KeyError(f"No recorded response for this request in {self.cassette.path} (model {self.model})")
+        response = self.inner.generate(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            response_schema=response_schema,
+            response_type=response_type,
+            temperature=temperature,
+        )
+        self.cassette.put(key, response)
+        return response
+
+
+class SyntheticLLMClient(LLMClient):
+    """
+    Returns schema-conforming JSON built from the request after a log-normal delay
+    (median `latency_ms`, shape `latency_sigma`). A share `error_rate` of calls raise
+    SyntheticLLMError, and calls beyond `rate_limit` per second raise ThrottledError.
+    """
+
+    def __init__(self, model: str = "synthetic", latency_ms: float = 0.0, latency_sigma: float = 0.5,
+                 error_rate: float = 0.0, rate_limit: Optional[float] = None, seed: Optional[int] = None):
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.model = model
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = rate_limit or 0.0
+        self._refilled_at = time.monotonic()
+
+    def generate(self, system_prompt: str, user_prompt: str, response_schema: dict = None,
+                 response_type: str = "application/json", temperature: float = 0.0) -> Dict:
+        with self._lock:
+            self._take_token()
+            fail = self._random.random() < self.error_rate
+            delay = self.latency_ms * math.exp(self._random.gauss(0.0, self.latency_sigma)) / 1000 if self.latency_ms else 0.0
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise SyntheticLLMError("503 UNAVAILABLE: synthetic LLM error")
+
+        excerpt = " ".join(user_prompt.split()[-40:])
+        return {
+            "json": self._instance(response_schema, user_prompt, excerpt) if response_schema else None,
+            "text": excerpt,
+            "model": self.model,
+        }
+
+    def _take_token(self) -> None:
+        if not self.rate_limit:
+            return
+        now = time.monotonic()
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+        self._refilled_at = now
+        if self._tokens < 1.0:
+            raise ThrottledError("429 RESOURCE_EXHAUSTED: synthetic rate limit exceeded")
+        self._tokens -= 1.0
+
+    @classmethod
+    def _instance(cls, schema: dict, prompt: str, excerpt: str, name: str = "", index: int = 0):
+        """
+        Smallest instance of `schema`. Text fields named like a summary get `excerpt`, and
+        arrays of indexed objects get one item per "[n]" entry in the prompt (batched calls).
+        """
+        kind = schema.get("type")
+        if kind == "object":
+            properties = schema.get("properties", {})
+            required = schema.get("required", [])
+            return {
+                key: index if key == "index" else cls._instance(properties.get(key, {}), prompt, excerpt, key)
+                for key in required
+            }
+        if kind == "array":
+            items = schema.get("items", {})
+            count = schema.get("minItems", 0)
+            if "index" in items.get("properties", {}):
+                count = max(count, len(re.findall(r"^\[\d+\] ", prompt, re.MULTILINE)))
+            return [cls._instance(items, prompt, excerpt, name, i) for i in range(count)]
+        if kind == "string":
+            return excerpt if "summary" in name else f"synthetic {name}".strip()
+        if kind in ("number", "integer"):
+            value = schema.get("maximum", schema.get("minimum", 0))
+            return int(value) if kind == "integer" else float(value)
+        if kind == "boolean":
+            return False
+        return None
+
+
+def create_llm_client(model: str) -> LLMClient:
+    """LLMClient for `model` according to LLM_CLIENT_MODE (default "live")."""
+    mode = os.getenv("LLM_CLIENT_MODE", "live").lower()
+    if mode == "live":
+        return GeminiClient(model_name=model)
+    if mode in ("record", "replay"):
+        path = os.getenv("LLM_CASSETTE_PATH")
+        if not path:
+            raise ValueError(f"LLM_CLIENT_MODE={mode} requires LLM_CASSETTE_PATH")
+        return CassetteLLMClient(path, model=model, record=mode == "record")
+    if mode == "synthetic":
+        rate_limit = os.getenv("LLM_SYNTHETIC_RATE_LIMIT")
+        seed = os.getenv("LLM_SYNTHETIC_SEED")
+        return SyntheticLLMClient(
+            model=model,
+            latency_ms=float(os.getenv("LLM_SYNTHETIC_LATENCY_MS", "0")),
+            latency_sigma=float(os.getenv("LLM_SYNTHETIC_LATENCY_SIGMA", "0.5")),
+            error_rate=float(os.getenv("LLM_SYNTHETIC_ERROR_RATE", "0")),
+            rate_limit=float(rate_limit) if rate_limit else None,
+            seed=int(seed) if seed else None,
+        )
+    raise ValueError(f"Unknown LLM_CLIENT_MODE {mode!r}; expected one of {', '.join(LLM_CLIENT_MODES)}")
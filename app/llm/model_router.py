@@ -0,0 +1,195 @@
+import copy
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from .interfaces import LLMClient
+from .fake_clients import create_llm_client
+from app.utils.single_flight import SingleFlight
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROUTE_FAST = "fast"
+ROUTE_DEFAULT = "default"
+ROUTE_STRONG = "strong"
+
+DEFAULT_MODELS = {
+    ROUTE_FAST: "gemini-2.5-flash-lite",
+    ROUTE_DEFAULT: "gemini-2.5-flash",
+    ROUTE_STRONG: "gemini-2.5-pro",
+}
+# Tasks served by one route whatever the input size. A missed hallucination is worse than
+# a slower check, so fact checking never uses the fast model; warm-up pings always do.
+DEFAULT_TASK_ROUTES = {
+    "hallucination_check": ROUTE_DEFAULT,
+    "warmup": ROUTE_FAST,
+}
+DEFAULT_SMALL_INPUT_CHARS = 2000
+DEFAULT_ESCALATION_CONFIDENCE = 0.7
+# Rough token estimate used for the cost counters
+CHARS_PER_TOKEN = 4
+
+# Clients are shared process-wide: tools are created per request, connections should not be
+_clients: Dict[tuple, LLMClient] = {}
+_clients_lock = threading.Lock()
+
+# Identical deterministic requests in flight at the same time share one LLM call
+_generate_flight = SingleFlight("llm")
+
+_route_stats: Dict[str, dict] = {}
+_route_stats_lock = threading.Lock()
+
+
+def route_models() -> Dict[str, str]:
+    """Model per route, from LLM_MODEL_FAST / LLM_MODEL_DEFAULT / LLM_MODEL_STRONG."""
+    return {route: os.getenv(f"LLM_MODEL_{route.upper()}", model) for route, model in DEFAULT_MODELS.items()}
+
+
+def task_route(task: str) -> Optional[str]:
+    """Route pinned for `task` by LLM_ROUTE_<TASK> or DEFAULT_TASK_ROUTES; None routes by input size."""
+    route = os.getenv(f"LLM_ROUTE_{task.upper()}", DEFAULT_TASK_ROUTES.get(task) or "")
+    if route and route not in DEFAULT_MODELS:
+        raise ValueError(f"LLM_ROUTE_{task.upper()} must be one of {', '.join(DEFAULT_MODELS)}")
+    return route or None
+
+
+def _get_client(model: str, client_factory: Callable[[str], LLMClient]) -> LLMClient:
+    with _clients_lock:
+        key = (client_factory, model)
+        if key not in _clients:
+            _clients[key] = client_factory(model)
+        return _clients[key]
+
+
+def _record(task: str, route: str, model: str, seconds: float, input_chars: int, output_chars: int,
+            error: bool = False, escalated: bool = False) -> None:
+    with _route_stats_lock:
+        stats = _route_stats.setdefault(f"{task}/{route}", {
+            "model": model, "calls": 0, "errors": 0, "escalations": 0,
+            "total_seconds": 0.0, "input_tokens": 0, "output_tokens": 0,
+        })
+        stats["model"] = model
+        stats["calls"] += 1
+        stats["errors"] += int(error)
+        stats["escalations"] += int(escalated)
+        stats["total_seconds"] += seconds
+        stats["input_tokens"] += input_chars // CHARS_PER_TOKEN
+        stats["output_tokens"] += output_chars // CHARS_PER_TOKEN
+
+
+def get_route_stats() -> Dict[str, dict]:
+    """Calls, errors, escalations, latency and estimated tokens per task/route."""
+    with _route_stats_lock:
+        return {
+            key: dict(stats, avg_seconds=stats["total_seconds"] / stats["calls"] if stats["calls"] else 0.0)
+            for key, stats in _route_stats.items()
+        }
+
+
+def is_uncertain(output, threshold: float) -> bool:
+    """
+    True when a structured answer should be retried on the strong model: nothing was
+    parsed, or a reported `confidence` (top-level or on any batch item) is below `threshold`.
+    """
+    if not isinstance(output, dict):
+        return True
+    items = output.get("results") if isinstance(output.get("results"), list) else [output]
+    for item in items:
+        confidence = item.get("confidence") if isinstance(item, dict) else None
+        if confidence is not None and confidence < threshold:
+            return True
+    return False
+
+
+class ModelRouter(LLMClient):
+    """
+    LLMClient that picks the model per request.
+
+    A task can be pinned to one route (`route`, LLM_ROUTE_<TASK> or DEFAULT_TASK_ROUTES,
+    e.g. hallucination checks always use the default route). Otherwise requests whose prompts are at most `small_input_chars` (LLM_ROUTER_SMALL_INPUT_CHARS)
+    go to the fast route, the rest to the default route. A structured answer that comes
+    back unparsed or with confidence below `escalation_confidence`
+    (LLM_ROUTER_ESCALATION_CONFIDENCE) is retried once on the strong route
+    (LLM_ROUTER_ESCALATION=false disables this). Latency, errors and estimated tokens are
+    counted per task and route (see get_route_stats). Clients come from
+    `client_factory` (create_llm_client by default, which honours LLM_CLIENT_MODE).
+    Identical temperature-0 requests that are in flight at the same time share one call.
+    """
+
+    def __init__(
+        self,
+        task: str,
+        models: Optional[Dict[str, str]] = None,
+        small_input_chars: Optional[int] = None,
+        escalation_confidence: Optional[float] = None,
+        escalation: Optional[bool] = None,
+        client_factory: Optional[Callable[[str], LLMClient]] = None,
+        route: Optional[str] = None,
+    ):
+        self.task = task
+        self.route = route or task_route(task)
+        self.models = models or route_models()
+        self.small_input_chars = small_input_chars if small_input_chars is not None else int(
+            os.getenv("LLM_ROUTER_SMALL_INPUT_CHARS", str(DEFAULT_SMALL_INPUT_CHARS))
+        )
+        self.escalation_confidence = escalation_confidence if escalation_confidence is not None else float(
+            os.getenv("LLM_ROUTER_ESCALATION_CONFIDENCE", str(DEFAULT_ESCALATION_CONFIDENCE))
+        )
+        if escalation is None:
+            escalation = os.getenv("LLM_ROUTER_ESCALATION", "true").lower() in ("1", "true", "yes")
+        self.escalation = escalation
+        self.client_factory = client_factory or create_llm_client
+
+    def select_route(self, system_prompt: str, user_prompt: str) -> str:
+        if self.route is not None:
+            return self.route
+        if len(system_prompt) + len(user_prompt) <= self.small_input_chars:
+            return ROUTE_FAST
+        return ROUTE_DEFAULT
+
+    def generate(self, system_prompt: str, user_prompt: str, response_schema: dict = None,
+                 response_type: str = "application/json", temperature: float = 0.0) -> Dict:
+        if temperature:
+            # Sampled requests are expected to differ, so they are never coalesced
+            return self._generate(system_prompt, user_prompt, response_schema, response_type, temperature)
+        key = (
+            self.client_factory, tuple(sorted(self.models.items())), self.route, self.small_input_chars,
+            self.escalation, self.escalation_confidence,
+            system_prompt, user_prompt, json.dumps(response_schema, sort_keys=True), response_type,
+        )
+        result = _generate_flight.do(
+            key, lambda: self._generate(system_prompt, user_prompt, response_schema, response_type, temperature)
+        )
+        # Callers sharing a result must not see each other's changes
+        return copy.deepcopy(result)
+
+    def _generate(self, system_prompt: str, user_prompt: str, response_schema: Optional[dict],
+                  response_type: str, temperature: float) -> Dict:
+        route = self.select_route(system_prompt, user_prompt)
+        kwargs = dict(system_prompt=system_prompt, user_prompt=user_prompt, response_schema=response_schema,
+                      response_type=response_type, temperature=temperature)
+        result = self._call(route, kwargs)
+
+        if (self.escalation and response_schema and route != ROUTE_STRONG
+                and self.models[route] != self.models[ROUTE_STRONG]
+                and is_uncertain(result.get("json"), self.escalation_confidence)):
+            logger.info(f"Escalating {self.task} from {self.models[route]} to {self.models[ROUTE_STRONG]}")
+            result = self._call(ROUTE_STRONG, kwargs, escalated=True)
+        return result
+
+    def _call(self, route: str, kwargs: dict, escalated: bool = False) -> Dict:
+        model = self.models[route]
+        client = _get_client(model, self.client_factory)
+        input_chars = len(kwargs["system_prompt"]) + len(kwargs["user_prompt"])
+        started = time.perf_counter()
+        try:
+            result = client.generate(**kwargs)
+        except Exception:
+            _record(self.task, route, model, time.perf_counter() - started, input_chars, 0, error=True, escalated=escalated)
+            raise
+        _record(self.task, route, model, time.perf_counter() - started, input_chars,
+                len(str(result.get("json") or result.get("text") or "")), escalated=escalated)
+        logger.debug(f"{self.task} served by {model} ({route} route)")
+        return result
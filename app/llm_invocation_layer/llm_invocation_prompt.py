@@ -29,7 +29,8 @@ Available Tools:
 4. summarize_text
    Description: Summarizes a given text using an LLM.
    Arguments:
-     - text (string, required): The text to summarize
+     - text (string): The text to summarize
+     - text_uri (string): Reference returned by extract_pdf_text with by_reference=true, used instead of text
    Returns: Summary, prompt details, and metadata including document length, summary length, processing time
    Constraints: Text must not be empty
 
@@ -37,7 +38,9 @@ Available Tools:
    Description: Extracts text from a PDF file given a local path or HTTP URL.
    Arguments:
      - source (string, required): Local file path or HTTP URL to PDF
-   Returns: Extracted text and number of pages
+     - pages (string, optional): Page selection such as "1-3,7"; only these pages are parsed
+     - by_reference (boolean, optional): Keep the text server-side and return a text_uri for summarize_text
+   Returns: Extracted text (or text_uri), number of pages and per-page character offsets
    Constraints: File must exist locally or URL must be accessible
 
 6. detect_language
@@ -64,6 +67,13 @@ Available Tools:
        - response (string, required): The response to check for hallucinations
    Returns: Boolean indicating if hallucination exists, list of hallucinated statements, explanation, and metadata
    Constraints: Both ground_truth and response must be non-empty strings
+
+9. summarize_pdfs
+   Description: Summarizes a batch of PDF files from local paths or HTTP URLs in a single call.
+   Arguments:
+     - file_paths (array of strings, required): Local file paths or HTTP URLs to PDFs
+   Returns: Per-document summaries with metadata, followed by aggregate throughput statistics
+   Constraints: Use instead of repeated summarize_pdf calls when summarizing several documents
 """
 
 SYSTEM_PROMPT = f"""You are an intelligent agent with access to specialized tools. Your goal is to help users by:
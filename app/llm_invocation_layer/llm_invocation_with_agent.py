@@ -9,6 +9,7 @@ from .tool_wrappers import (
     extract_pdf_tool,
     summarize_text_tool,
     summarize_pdf_tool,
+    summarize_pdfs_tool,
     detect_language_tool,
     evaluate_llm_responses_tool,
     hallucination_checker_tool,
@@ -19,10 +20,11 @@ from .tool_wrappers import (
 # Load environment variables
 load_dotenv()
 class Agent():
-    def __init__(self):
-        # Initialize the Gemini model
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash-lite",
+    def __init__(self, llm=None):
+        # Initialize the Gemini model (AGENT_MODEL overrides the default); any
+        # LangChain chat model can be injected instead, e.g. a fake one for offline runs
+        self.llm = llm or ChatGoogleGenerativeAI(
+            model=os.getenv("AGENT_MODEL", "gemini-2.5-flash-lite"),
             temperature=0
         )
 
@@ -31,6 +33,7 @@ class Agent():
             extract_pdf_tool,
             summarize_text_tool,
             summarize_pdf_tool,
+            summarize_pdfs_tool,
             detect_language_tool,
             fetch_weather_tool,
             fetch_exchange_rate_tool,
@@ -55,29 +55,55 @@ def get_tools_function_definitions() -> list:
                 "required": ["pdf_path_or_url"]
             }
         },
+        {
+            "name": "summarize_pdfs",
+            "description": "Summarizes a batch of PDF files from local paths or HTTP URLs in one call. Returns each document's summary with metadata plus aggregate throughput. Prefer this over repeated summarize_pdf calls when several documents must be summarized.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Local file paths or HTTP URLs to the PDF files"
+                    }
+                },
+                "required": ["file_paths"]
+            }
+        },
         {
             "name": "summarize_text",
-            "description": "Summarizes a given text using an LLM. Returns summary, prompt details, and metadata including document length, summary length, processing time. Text must not be empty.",
+            "description": "Summarizes a given text using an LLM. Returns summary, prompt details, and metadata including document length, summary length, processing time. Pass either the text or a text_uri returned by extract_pdf_text. Text must not be empty.",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "text": {
                         "type": "string",
                         "description": "The text to summarize"
+                    },
+                    "text_uri": {
+                        "type": "string",
+                        "description": "Reference to server-side text returned by extract_pdf_text with by_reference=true"
                     }
-                },
-                "required": ["text"]
+                }
             }
         },
         {
             "name": "extract_pdf_text",
-            "description": "Extracts text from a PDF file given a local path or HTTP URL. Returns extracted text and number of pages. File must exist locally or URL must be accessible.",
+            "description": "Extracts text from a PDF file given a local path or HTTP URL. Returns extracted text, number of pages and per-page character offsets. File must exist locally or URL must be accessible.",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "source": {
                         "type": "string",
                         "description": "Local file path or HTTP URL to PDF"
+                    },
+                    "pages": {
+                        "type": "string",
+                        "description": "Optional page selection such as '1-3,7'"
+                    },
+                    "by_reference": {
+                        "type": "boolean",
+                        "description": "Return a text_uri for summarize_text instead of the full text (use for large documents)"
                     }
                 },
                 "required": ["source"]
@@ -1,4 +1,5 @@
-from typing import Iterator, Dict
+import threading
+from typing import Iterator, Dict, List
 from langgraph.config import get_stream_writer 
 from langchain.tools import tool
 from tools import (
@@ -16,20 +17,25 @@ from tools import (
     HALLUCINATION_CHECKER_ARGS_SCHEMA,
     SummarizePDFTool,
     SUMMARIZE_PDF_ARGS_SCHEMA,
+    SummarizePDFsTool,
+    SUMMARIZE_PDFS_ARGS_SCHEMA,
     EvaluateLLMResponsesTool,
     EVALUATION_INPUT_SCHEMA,
 )
 
 @tool("extract_pdf_text", args_schema=EXTRACT_PDF_ARGS_SCHEMA)
-def extract_pdf_tool(pdf_path_or_url: str) -> dict:
+def extract_pdf_tool(source: str, pages: str = None, by_reference: bool = False) -> dict:
     """Extracts text from a PDF file given a local path or HTTP URL.
     
-    Returns extracted text and number of pages.
+    Returns extracted text (or a text_uri when by_reference is set), number of pages
+    and per-page character offsets.
     
     Args:
-        pdf_path_or_url: Local file path or HTTP URL to the PDF file
+        source: Local file path or HTTP URL to the PDF file
+        pages: Optional page selection such as "1-3,7"
+        by_reference: Keep the text server-side and return a text_uri instead
     """
-    return ExtractPDFTextTool().run(pdf_path_or_url)
+    return ExtractPDFTextTool().run(source, pages=pages, by_reference=by_reference)
 
 
 @tool("detect_language", args_schema=DETECT_LANGUAGE_ARGS_SCHEMA)
@@ -70,15 +76,16 @@ def fetch_exchange_rate_tool(base_currency: str, target_currency: str) -> dict:
 
 
 @tool("summarize_text", args_schema=SUMMARIZE_TEXT_ARGS_SCHEMA)
-def summarize_text_tool(text: str) -> dict:
+def summarize_text_tool(text: str = None, text_uri: str = None) -> dict:
     """Summarizes a given text using an LLM.
     
     Returns a summary along with prompt and metadata information.
     
     Args:
         text: The text content to summarize
+        text_uri: Reference to server-side text returned by extract_pdf_text, used instead of text
     """
-    return SummarizeTextTool().run(text)
+    return SummarizeTextTool().run(text, text_uri=text_uri)
 
 
 @tool("hallucination_checker", args_schema=HALLUCINATION_CHECKER_ARGS_SCHEMA)
@@ -107,6 +114,38 @@ def summarize_pdf_tool(file_path: str) -> Iterator[Dict]:
     return event["final_summary"]
 
 
+# Shared by every agent call: the tool's service keeps extraction worker processes and an
+# LLM thread pool for its lifetime, which a per-call instance would start and never stop
+_summarize_pdfs = None
+_summarize_pdfs_lock = threading.Lock()
+
+
+def _get_summarize_pdfs() -> SummarizePDFsTool:
+    global _summarize_pdfs
+    with _summarize_pdfs_lock:
+        if _summarize_pdfs is None:
+            _summarize_pdfs = SummarizePDFsTool()
+        return _summarize_pdfs
+
+
+@tool("summarize_pdfs", args_schema=SUMMARIZE_PDFS_ARGS_SCHEMA)
+def summarize_pdfs_tool(file_paths: List[str]) -> List[Dict]:
+    """Summarizes a batch of PDF files from local paths or HTTP URLs.
+    
+    Streams each document's summary as it completes and returns all summaries
+    followed by aggregate throughput statistics.
+    
+    Args:
+        file_paths: Local file paths or HTTP URLs to the PDF files
+    """
+    writer = get_stream_writer()
+    events = []
+    for event in _get_summarize_pdfs().run(file_paths):
+        writer(event)
+        events.append(event)
+    return events
+
+
 @tool("evaluate_llm_responses", args_schema=EVALUATION_INPUT_SCHEMA)
 def evaluate_llm_responses_tool(ground_truth: str, response: str) -> dict:
     """Evaluates an LLM response against ground truth using cosine similarity, lexical similarity, and conciseness.
@@ -1,26 +1,41 @@
 from .extract_pdf_text import ExtractPDFTextTool, EXTRACT_PDF_ARGS_SCHEMA
 from .summarize_pdf import SummarizePDFTool, SUMMARIZE_PDF_ARGS_SCHEMA
+from .summarize_pdfs import SummarizePDFsTool, SUMMARIZE_PDFS_ARGS_SCHEMA
 from .summarize_text import SummarizeTextTool, SUMMARIZE_TEXT_ARGS_SCHEMA
-from .fetch_weather import FetchWeatherTool, FETCH_WEATHER_ARGS_SCHEMA
-from .fetch_exchange_rate import FetchExchangeRateTool, FETCH_EXCHANGE_RATE_ARGS_SCHEMA
+from .fetch_weather import FetchWeatherTool, FETCH_WEATHER_ARGS_SCHEMA, FETCH_WEATHER_MANY_ARGS_SCHEMA
+from .fetch_exchange_rate import (
+    FetchExchangeRateTool,
+    ConvertAmountsTool,
+    FETCH_EXCHANGE_RATE_ARGS_SCHEMA,
+    CONVERT_AMOUNTS_ARGS_SCHEMA,
+)
 from .detect_language import DetectLanguageTool, DETECT_LANGUAGE_ARGS_SCHEMA
 from .evaluate_llm import EvaluateLLMResponsesTool, EVALUATION_INPUT_SCHEMA
 from .hallucination_checker import HallucinationCheckerTool, HALLUCINATION_CHECKER_ARGS_SCHEMA
+from .registry import ToolRegistry
+from .executor import ToolExecutor
 
 
 __all__ = ["ExtractPDFTextTool", 
            "SummarizePDFTool", 
+           "SummarizePDFsTool",
            "SummarizeTextTool", 
            "FetchWeatherTool",
            "FetchExchangeRateTool",
+           "ConvertAmountsTool",
            "DetectLanguageTool",
            "EvaluateLLMResponsesTool",
            "HallucinationCheckerTool",
+           "ToolRegistry",
+           "ToolExecutor",
            "EXTRACT_PDF_ARGS_SCHEMA",
            "SUMMARIZE_PDF_ARGS_SCHEMA",
+           "SUMMARIZE_PDFS_ARGS_SCHEMA",
            "SUMMARIZE_TEXT_ARGS_SCHEMA",
            "FETCH_WEATHER_ARGS_SCHEMA",
+           "FETCH_WEATHER_MANY_ARGS_SCHEMA",
            "FETCH_EXCHANGE_RATE_ARGS_SCHEMA",
+           "CONVERT_AMOUNTS_ARGS_SCHEMA",
            "DETECT_LANGUAGE_ARGS_SCHEMA",
            "EVALUATION_INPUT_SCHEMA",
            "HALLUCINATION_CHECKER_ARGS_SCHEMA"]
\ No newline at end of file
@@ -1,14 +1,21 @@
 from .evaluate_llm_responses_schema import (
     EVALUATION_INPUT_SCHEMA,
     EVALUATION_OUTPUT_SCHEMA,
+    EVALUATION_BATCH_INPUT_SCHEMA,
+    EVALUATION_BATCH_OUTPUT_SCHEMA,
 )
 from .evaluate_llm_service_responses import EvaluateLLMResponsesService
+from app.utils import compile_schema
 from datetime import datetime, timezone
 import logging
-import jsonschema
 
 logger = logging.getLogger(__name__)
 
+_input_validator = compile_schema("evaluate_llm_responses.input", EVALUATION_INPUT_SCHEMA)
+_output_validator = compile_schema("evaluate_llm_responses.output", EVALUATION_OUTPUT_SCHEMA)
+_batch_input_validator = compile_schema("evaluate_llm_responses_batch.input", EVALUATION_BATCH_INPUT_SCHEMA)
+_batch_output_validator = compile_schema("evaluate_llm_responses_batch.output", EVALUATION_BATCH_OUTPUT_SCHEMA)
+
 
 class EvaluateLLMResponsesTool:
     name = "Evaluate_llm_responses"
@@ -26,11 +33,7 @@ class EvaluateLLMResponsesTool:
             logger.info("Starting LLM response evaluation")
             
             # Validate input against JSON schema
-            try:
-                jsonschema.validate(instance=input_data, schema=EVALUATION_INPUT_SCHEMA)
-            except jsonschema.ValidationError as e:
-                logger.error(f"Input validation failed: {e.message}")
-                raise ValueError(f"Invalid input data: {e.message}")
+            _input_validator.validate_input(input_data)
             
             ground_truth = input_data["ground_truth"]
             response = input_data["response"]
@@ -46,11 +49,7 @@ class EvaluateLLMResponsesTool:
             }
             
             # Validate output against JSON schema
-            try:
-                jsonschema.validate(instance=result, schema=EVALUATION_OUTPUT_SCHEMA)
-            except jsonschema.ValidationError as e:
-                logger.error(f"Output validation failed: {e.message}")
-                raise ValueError(f"Invalid output data: {e.message}")
+            _output_validator.validate_output(result)
             
             logger.info("LLM response evaluation completed successfully")
             return result
@@ -60,3 +59,32 @@ class EvaluateLLMResponsesTool:
         except Exception as e:
             logger.error(f"Error evaluating LLM response: {e}", exc_info=True)
             raise
+
+    def run_batch(self, input_data: dict) -> dict:
+        """Evaluate many ground truth/response pairs in one vectorized pass."""
+        try:
+            logger.info("Starting batch LLM response evaluation")
+
+            _batch_input_validator.validate_input(input_data)
+
+            scores = self.service.evaluate_batch(input_data["pairs"])
+
+            result = {
+                "results": scores,
+                "metadata": {
+                    "evaluated_at": datetime.now(timezone.utc).isoformat(),
+                    "metrics": ["cosine", "lexical", "conciseness"],
+                    "pairs": len(scores),
+                }
+            }
+
+            _batch_output_validator.validate_output(result)
+
+            logger.info(f"Batch LLM response evaluation completed: {len(scores)} pairs")
+            return result
+        except (ValueError, KeyError) as e:
+            logger.error(f"Error evaluating LLM responses batch: {e}", exc_info=True)
+            raise
+        except Exception as e:
+            logger.error(f"Error evaluating LLM responses batch: {e}", exc_info=True)
+            raise
@@ -41,3 +41,29 @@ EVALUATION_OUTPUT_SCHEMA = {
         }
     }
 }
+
+EVALUATION_BATCH_INPUT_SCHEMA = {
+    "type": "object",
+    "required": ["pairs"],
+    "properties": {
+        "pairs": {
+            "type": "array",
+            "minItems": 1,
+            "items": EVALUATION_INPUT_SCHEMA
+        }
+    }
+}
+
+EVALUATION_BATCH_OUTPUT_SCHEMA = {
+    "type": "object",
+    "required": ["results", "metadata"],
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": SIMILARITY_SCORES_SCHEMA
+        },
+        "metadata": {
+            "type": "object"
+        }
+    }
+}
@@ -1,6 +1,9 @@
 from .metrics import CosineSimilarityMetric
 from .metrics import LexicalSimilarityMetric
 from .metrics import ConcisenessMetric
+from .metrics import VectorizedMetrics
+from .metrics import analyze_text
+from typing import List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,9 +19,12 @@ class EvaluateLLMResponsesService:
     def evaluate(self, ground_truth: str, response: str) -> dict:
         try:
             logger.info("Computing evaluation metrics for ground truth and response")
-            cosine_score = self.cosine.compute(ground_truth, response)
-            lexical_score = self.lexical.compute(ground_truth, response)
-            conciseness_score = self.concise.compute(ground_truth, response)
+            # Tokenize once and share the result across all metrics
+            analyzed_gt = analyze_text(ground_truth)
+            analyzed_resp = analyze_text(response)
+            cosine_score = self.cosine.compute_analyzed(analyzed_gt, analyzed_resp)
+            lexical_score = self.lexical.compute_analyzed(analyzed_gt, analyzed_resp)
+            conciseness_score = self.concise.compute_analyzed(analyzed_gt, analyzed_resp)
             
             result = {
                 "cosine_similarity": cosine_score,
@@ -30,3 +36,28 @@ class EvaluateLLMResponsesService:
         except Exception as e:
             logger.error(f"Error computing evaluation metrics: {e}", exc_info=True)
             raise
+
+    def evaluate_batch(self, pairs: List[dict]) -> List[dict]:
+        """Score many {"ground_truth", "response"} pairs with vectorized metric computations."""
+        try:
+            logger.info(f"Computing evaluation metrics for a batch of {len(pairs)} pairs")
+            vectorized = VectorizedMetrics(model=self.cosine.model)
+            scores = vectorized.compute(
+                [pair["ground_truth"] for pair in pairs],
+                [pair["response"] for pair in pairs],
+            )
+            results = [
+                {
+                    "cosine_similarity": float(cosine),
+                    "lexical_similarity": float(lexical),
+                    "conciseness_score": float(conciseness),
+                }
+                for cosine, lexical, conciseness in zip(
+                    scores["cosine_similarity"], scores["lexical_similarity"], scores["conciseness_score"]
+                )
+            ]
+            logger.info(f"Batch evaluation metrics computed for {len(results)} pairs")
+            return results
+        except Exception as e:
+            logger.error(f"Error computing batch evaluation metrics: {e}", exc_info=True)
+            raise
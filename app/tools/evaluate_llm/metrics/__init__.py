@@ -1,9 +1,20 @@
-from .cosine_similarity import CosineSimilarityMetric
+from .analyzed_text import AnalyzedText, analyze_text
+from .cosine_similarity import CosineSimilarityMetric, EXCLUSIVE_TERM_IDF
 from .lexical_similarity import LexicalSimilarityMetric
 from .conciseness import ConcisenessMetric
+from .vectorized import VectorizedMetrics
+from .tfidf_model import fit_tfidf_model, save_tfidf_model, load_tfidf_model, get_default_tfidf_model
 
 __all__ = [
+    "AnalyzedText",
+    "analyze_text",
     "CosineSimilarityMetric",
+    "EXCLUSIVE_TERM_IDF",
     "LexicalSimilarityMetric",
     "ConcisenessMetric",
+    "VectorizedMetrics",
+    "fit_tfidf_model",
+    "save_tfidf_model",
+    "load_tfidf_model",
+    "get_default_tfidf_model",
 ]
\ No newline at end of file
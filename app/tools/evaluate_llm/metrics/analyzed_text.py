@@ -0,0 +1,65 @@
+# similarity/analyzed_text.py
+import hashlib
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Same tokenization as TfidfVectorizer's defaults (lowercase + token_pattern)
+TFIDF_TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+ANALYSIS_CACHE_SIZE = int(os.getenv("EVALUATION_ANALYSIS_CACHE_SIZE", "4096"))
+
+
+@dataclass(frozen=True)
+class AnalyzedText:
+    """
+    Everything the similarity metrics need from one text, computed in a single pass.
+    Instances are cached and shared between callers, so every field is read-only.
+    """
+    text: str
+    tokens: Tuple[str, ...]
+    token_set: FrozenSet[str]
+    term_counts: Mapping[str, int]
+
+    @property
+    def length(self) -> int:
+        return len(self.tokens)
+
+
+def _analyze(text: str) -> AnalyzedText:
+    tokens = tuple(text.lower().split())
+    term_counts = Counter(term for token in tokens for term in TFIDF_TOKEN_PATTERN.findall(token))
+    return AnalyzedText(text=text, tokens=tokens, token_set=frozenset(tokens),
+                        term_counts=MappingProxyType(dict(term_counts)))
+
+
+_cache: "OrderedDict[bytes, AnalyzedText]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def analyze_text(text: str) -> AnalyzedText:
+    """
+    Tokenize `text` once for all metrics: whitespace tokens (lowercased), their set and
+    count, and TF-IDF term counts. Results are LRU-cached on a digest of the text, so a
+    ground truth compared against many responses is only analyzed once
+    (EVALUATION_ANALYSIS_CACHE_SIZE).
+    """
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _cache_lock:
+        analyzed = _cache.get(key)
+        if analyzed is not None:
+            _cache.move_to_end(key)
+            return analyzed
+    analyzed = _analyze(text)
+    with _cache_lock:
+        _cache[key] = analyzed
+        if len(_cache) > ANALYSIS_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return analyzed
@@ -1,4 +1,5 @@
 # similarity/conciseness.py
+from .analyzed_text import AnalyzedText
 from .interfaces import SimilarityMetric
 import logging
 
@@ -6,11 +7,11 @@ logger = logging.getLogger(__name__)
 
 
 class ConcisenessMetric(SimilarityMetric):
-    def compute(self, ground_truth: str, response: str) -> float:
+    def compute_analyzed(self, ground_truth: AnalyzedText, response: AnalyzedText) -> float:
         try:
             logger.debug("Computing conciseness score")
-            gt_len = len(ground_truth.split())
-            resp_len = len(response.split())
+            gt_len = ground_truth.length
+            resp_len = response.length
 
             if resp_len == 0:
                 logger.debug("Empty response detected, returning 0.0")
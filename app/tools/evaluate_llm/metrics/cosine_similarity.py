@@ -1,21 +1,58 @@
 # similarity/cosine.py
-from sklearn.feature_extraction.text import TfidfVectorizer
+import math
 from sklearn.metrics.pairwise import cosine_similarity
+from .analyzed_text import AnalyzedText
 from .interfaces import SimilarityMetric
+from .tfidf_model import get_default_tfidf_model
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Fitting TF-IDF on just the two texts of a pair (smooth_idf, n=2) gives idf = 1 for
+# terms in both texts and 1 + ln(3/2) for terms in only one of them.
+EXCLUSIVE_TERM_IDF = 1.0 + math.log(1.5)
+
 
 class CosineSimilarityMetric(SimilarityMetric):
-    def compute(self, ground_truth: str, response: str) -> float:
+    """
+    TF-IDF cosine similarity.
+
+    With a corpus-fitted model (passed in, or loaded from COSINE_TFIDF_MODEL_PATH) each
+    call only transforms the two texts; otherwise IDF is that of a vectorizer fitted on
+    the pair itself, computed in closed form from the analyzed term counts.
+    """
+
+    def __init__(self, model=None):
+        self.model = model if model is not None else get_default_tfidf_model()
+
+    def compute_analyzed(self, ground_truth: AnalyzedText, response: AnalyzedText) -> float:
         try:
             logger.debug("Computing cosine similarity")
-            vectorizer = TfidfVectorizer()
-            vectors = vectorizer.fit_transform([ground_truth, response])
-            score = float(cosine_similarity(vectors[0], vectors[1])[0][0])
+            if self.model is not None:
+                vectors = self.model.transform([ground_truth.text, response.text])
+                score = float(cosine_similarity(vectors[0], vectors[1])[0][0])
+            else:
+                score = self._pair_fitted_cosine(ground_truth.term_counts, response.term_counts)
             logger.debug(f"Cosine similarity computed: {score:.3f}")
             return score
         except Exception as e:
             logger.error(f"Error computing cosine similarity: {e}", exc_info=True)
             raise
+
+    @staticmethod
+    def _pair_fitted_cosine(gt_counts, resp_counts) -> float:
+        if not gt_counts and not resp_counts:
+            # What TfidfVectorizer.fit_transform raises for the same input
+            raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+        shared = gt_counts.keys() & resp_counts.keys()
+        if not shared:
+            return 0.0
+
+        def weighted_norm(counts) -> float:
+            return math.sqrt(sum(
+                count * count * (1.0 if term in shared else EXCLUSIVE_TERM_IDF ** 2)
+                for term, count in counts.items()
+            ))
+
+        dot = sum(gt_counts[term] * resp_counts[term] for term in shared)
+        return dot / (weighted_norm(gt_counts) * weighted_norm(resp_counts))
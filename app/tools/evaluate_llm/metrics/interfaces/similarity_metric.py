@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
+from ..analyzed_text import AnalyzedText, analyze_text
 
 
 class SimilarityMetric(ABC):
-    @abstractmethod
     def compute(self, ground_truth: str, response: str) -> float:
+        return self.compute_analyzed(analyze_text(ground_truth), analyze_text(response))
+
+    @abstractmethod
+    def compute_analyzed(self, ground_truth: AnalyzedText, response: AnalyzedText) -> float:
         pass
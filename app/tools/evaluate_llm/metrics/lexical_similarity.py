@@ -1,4 +1,5 @@
 # similarity/lexical.py
+from .analyzed_text import AnalyzedText
 from .interfaces import SimilarityMetric
 import logging
 
@@ -6,11 +7,11 @@ logger = logging.getLogger(__name__)
 
 
 class LexicalSimilarityMetric(SimilarityMetric):
-    def compute(self, ground_truth: str, response: str) -> float:
+    def compute_analyzed(self, ground_truth: AnalyzedText, response: AnalyzedText) -> float:
         try:
             logger.debug("Computing lexical similarity")
-            gt_tokens = set(ground_truth.lower().split())
-            resp_tokens = set(response.lower().split())
+            gt_tokens = ground_truth.token_set
+            resp_tokens = response.token_set
 
             if not gt_tokens or not resp_tokens:
                 logger.debug("Empty token sets detected, returning 0.0")
@@ -0,0 +1,95 @@
+"""
+Corpus-fitted TF-IDF models for CosineSimilarityMetric.
+
+Fitting IDF once on a reference corpus (instead of on the two compared strings)
+gives meaningful term weights, makes scores comparable across calls, and reduces
+the per-call cost to a sparse transform plus a dot product.
+
+Fit and persist a model:
+    python -m app.tools.evaluate_llm.metrics.tfidf_model corpus.txt model.joblib [--hashing]
+
+`corpus.txt` holds one document per line. Point COSINE_TFIDF_MODEL_PATH at the
+saved file to have the evaluation server load it at startup.
+"""
+import argparse
+import os
+import threading
+from typing import Iterable, Optional
+import joblib
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.pipeline import Pipeline, make_pipeline
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HASHING_FEATURES = 2 ** 20
+
+_default_model = None
+_default_model_loaded = False
+_default_model_lock = threading.Lock()
+
+
+def fit_tfidf_model(corpus: Iterable[str], hashing: bool = False, n_features: int = DEFAULT_HASHING_FEATURES):
+    """
+    Fit IDF weights on a reference corpus.
+
+    With `hashing=True` terms are hashed into `n_features` buckets (HashingVectorizer)
+    so the vocabulary is unbounded and unseen terms still contribute; otherwise a
+    regular TfidfVectorizer vocabulary is built. Both return L2-normalized rows.
+    """
+    if hashing:
+        model = make_pipeline(
+            HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None),
+            TfidfTransformer(),
+        )
+    else:
+        model = TfidfVectorizer()
+    model.fit(corpus)
+    logger.info(f"Fitted {'hashing ' if hashing else ''}TF-IDF model")
+    return model
+
+
+def save_tfidf_model(model, path: str) -> None:
+    joblib.dump(model, path)
+    logger.info(f"TF-IDF model saved to {path}")
+
+
+def load_tfidf_model(path: str):
+    if not os.path.exists(path):
+        logger.error(f"TF-IDF model file does not exist: {path}")
+        raise FileNotFoundError(f"TF-IDF model file does not exist: {path}")
+    model = joblib.load(path)
+    if not isinstance(model, (TfidfVectorizer, Pipeline)):
+        raise ValueError(f"Unsupported TF-IDF model type: {type(model).__name__}")
+    logger.info(f"TF-IDF model loaded from {path}")
+    return model
+
+
+def get_default_tfidf_model():
+    """The model at COSINE_TFIDF_MODEL_PATH, loaded once per process; None when unset."""
+    global _default_model, _default_model_loaded
+    if _default_model_loaded:
+        return _default_model
+    with _default_model_lock:
+        if not _default_model_loaded:
+            path = os.getenv("COSINE_TFIDF_MODEL_PATH")
+            _default_model = load_tfidf_model(path) if path else None
+            _default_model_loaded = True
+    return _default_model
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fit and save a TF-IDF model for cosine similarity.")
+    parser.add_argument("corpus", help="Text file with one document per line")
+    parser.add_argument("output", help="Where to write the fitted model (joblib)")
+    parser.add_argument("--hashing", action="store_true", help="Use a HashingVectorizer (unbounded vocabulary)")
+    parser.add_argument("--n-features", type=int, default=DEFAULT_HASHING_FEATURES)
+    args = parser.parse_args(argv)
+
+    with open(args.corpus, encoding="utf-8") as f:
+        model = fit_tfidf_model((line for line in f if line.strip()), args.hashing, args.n_features)
+    save_tfidf_model(model, args.output)
+
+
+if __name__ == "__main__":
+    main()
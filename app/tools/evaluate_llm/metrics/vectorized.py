@@ -0,0 +1,120 @@
+# similarity/vectorized.py
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from scipy import sparse
+from .analyzed_text import analyze_text
+from .cosine_similarity import EXCLUSIVE_TERM_IDF
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class VectorizedMetrics:
+    """
+    Computes cosine, lexical (Jaccard) and conciseness scores for many pairs at once.
+
+    Every distinct text is tokenized once, all texts share sparse term matrices, and
+    the scores come out of whole-matrix operations. Results match CosineSimilarityMetric,
+    LexicalSimilarityMetric and ConcisenessMetric applied pair by pair (pairs with no
+    TF-IDF terms at all score 0.0 instead of raising).
+    """
+
+    def __init__(self, model=None):
+        self.model = model
+
+    def compute(self, ground_truths: Sequence[str], responses: Sequence[str]) -> Dict[str, np.ndarray]:
+        if len(ground_truths) != len(responses):
+            raise ValueError("ground_truths and responses must have the same length")
+        if not ground_truths:
+            empty = np.zeros(0)
+            return {"cosine_similarity": empty, "lexical_similarity": empty, "conciseness_score": empty}
+
+        texts, gt_rows, resp_rows = self._dedupe(ground_truths, responses)
+        logger.info(f"Computing vectorized metrics for {len(gt_rows)} pairs ({len(texts)} distinct texts)")
+        term_counts, word_sets, word_counts = self._analyze(texts)
+
+        return {
+            "cosine_similarity": self._cosine(texts, term_counts, gt_rows, resp_rows),
+            "lexical_similarity": self._jaccard(word_sets, gt_rows, resp_rows),
+            "conciseness_score": self._conciseness(word_counts, gt_rows, resp_rows),
+        }
+
+    @staticmethod
+    def _dedupe(ground_truths: Sequence[str], responses: Sequence[str]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        index: Dict[str, int] = {}
+        texts: List[str] = []
+
+        def row(text: str) -> int:
+            if text not in index:
+                index[text] = len(texts)
+                texts.append(text)
+            return index[text]
+
+        gt_rows = np.fromiter((row(t) for t in ground_truths), dtype=np.int64, count=len(ground_truths))
+        resp_rows = np.fromiter((row(t) for t in responses), dtype=np.int64, count=len(responses))
+        return texts, gt_rows, resp_rows
+
+    @staticmethod
+    def _analyze(texts: List[str]) -> Tuple[sparse.csr_matrix, sparse.csr_matrix, np.ndarray]:
+        """TF-IDF term counts, whitespace token sets and word counts from the shared analyzed texts."""
+        term_vocab: Dict[str, int] = {}
+        word_vocab: Dict[str, int] = {}
+        term_indices, term_data, term_indptr = [], [], [0]
+        word_indices, word_indptr = [], [0]
+        word_counts = np.empty(len(texts), dtype=np.float64)
+
+        for i, text in enumerate(texts):
+            analyzed = analyze_text(text)
+            word_counts[i] = analyzed.length
+            word_indices.extend(word_vocab.setdefault(w, len(word_vocab)) for w in analyzed.token_set)
+            word_indptr.append(len(word_indices))
+
+            for term, count in analyzed.term_counts.items():
+                term_indices.append(term_vocab.setdefault(term, len(term_vocab)))
+                term_data.append(count)
+            term_indptr.append(len(term_indices))
+
+        term_counts = sparse.csr_matrix(
+            (np.asarray(term_data, dtype=np.float64), term_indices, term_indptr),
+            shape=(len(texts), max(len(term_vocab), 1)),
+        )
+        word_sets = sparse.csr_matrix(
+            (np.ones(len(word_indices)), word_indices, word_indptr),
+            shape=(len(texts), max(len(word_vocab), 1)),
+        )
+        return term_counts, word_sets, word_counts
+
+    def _cosine(self, texts, term_counts, gt_rows, resp_rows) -> np.ndarray:
+        if self.model is not None:
+            # Corpus-fitted model: rows are already L2-normalized
+            vectors = self.model.transform(texts)
+            return np.asarray(vectors[gt_rows].multiply(vectors[resp_rows]).sum(axis=1)).ravel()
+
+        gt, resp = term_counts[gt_rows], term_counts[resp_rows]
+        shared = (gt > 0).multiply(resp > 0)
+        dot = np.asarray(gt.multiply(resp).sum(axis=1)).ravel()
+
+        def weighted_norm(counts):
+            squares = counts.multiply(counts)
+            total = np.asarray(squares.sum(axis=1)).ravel()
+            shared_part = np.asarray(squares.multiply(shared).sum(axis=1)).ravel()
+            return np.sqrt(shared_part + EXCLUSIVE_TERM_IDF ** 2 * (total - shared_part))
+
+        denominator = weighted_norm(gt) * weighted_norm(resp)
+        return np.divide(dot, denominator, out=np.zeros_like(dot), where=denominator > 0)
+
+    @staticmethod
+    def _jaccard(word_sets, gt_rows, resp_rows) -> np.ndarray:
+        gt, resp = word_sets[gt_rows], word_sets[resp_rows]
+        intersection = np.asarray(gt.multiply(resp).sum(axis=1)).ravel()
+        gt_size = np.diff(gt.indptr).astype(np.float64)
+        resp_size = np.diff(resp.indptr).astype(np.float64)
+        union = gt_size + resp_size - intersection
+        valid = (gt_size > 0) & (resp_size > 0)
+        return np.divide(intersection, union, out=np.zeros_like(intersection), where=valid)
+
+    @staticmethod
+    def _conciseness(word_counts, gt_rows, resp_rows) -> np.ndarray:
+        gt_len, resp_len = word_counts[gt_rows], word_counts[resp_rows]
+        ratio = np.divide(gt_len, resp_len, out=np.zeros_like(gt_len), where=resp_len > 0)
+        return np.minimum(ratio, 1.0)
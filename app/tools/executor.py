@@ -0,0 +1,194 @@
+"""
+Runs blocking tool calls off the MCP servers' event loop.
+
+The tools are synchronous. Called directly from an async handler, PDF parsing, TF-IDF,
+language detection and blocking HTTP/LLM calls would run on the event loop and
+serialize every request in the process. ToolExecutor runs them elsewhere:
+
+- CPU-bound tools on a process pool. They are not part of the server's registry: each
+  worker builds its own ToolRegistry from their factories once, in the pool initializer,
+  so the server process never loads them. Arguments and results must be picklable.
+- I/O-bound blocking tools on a bounded thread pool, sharing the server's registry.
+
+Pool sizes come from TOOL_PROCESS_WORKERS (default: CPU count; 0 runs CPU-bound tools on
+the thread pool) and TOOL_THREAD_WORKERS (default 16). TOOL_CONCURRENCY_<TOOL> caps the
+concurrent calls of one tool (e.g. TOOL_CONCURRENCY_EXTRACT_PDF_TEXT=2), so a single
+tool cannot take the whole pool; calls beyond the cap wait in a queue, reported by
+stats(). Process-wide counters kept inside the workers (e.g. schema validation stats)
+come back with every call as a `worker_stats()` snapshot, see worker_snapshots().
+"""
+import asyncio
+import inspect
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from .registry import ToolRegistry
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THREAD_WORKERS = 16
+
+# Set in worker processes by _init_worker
+_worker_registry: Optional[ToolRegistry] = None
+_worker_stats: Optional[Callable[[], Any]] = None
+
+
+def _init_worker(server: str, factories: dict, warmups: dict, stats: Optional[Callable[[], Any]]) -> None:
+    global _worker_registry, _worker_stats
+    _worker_stats = stats
+    _worker_registry = ToolRegistry(server, factories, warmups)
+    _worker_registry.warm()
+
+
+def _call(registry: Optional[ToolRegistry], tool: str, method: str, args: tuple, kwargs: dict) -> Any:
+    result = getattr((registry or _worker_registry).get(tool), method)(*args, **kwargs)
+    # Streaming tools: collect the events here, generators cannot leave the worker
+    return list(result) if inspect.isgenerator(result) else result
+
+
+def _call_in_worker(tool: str, method: str, args: tuple, kwargs: dict) -> tuple:
+    """_call in a worker process: (result, worker pid, the worker's stats snapshot or None)."""
+    result = _call(None, tool, method, args, kwargs)
+    return result, os.getpid(), _worker_stats() if _worker_stats is not None else None
+
+
+def _ready() -> bool:
+    return _worker_registry is not None and _worker_registry.ready
+
+
+class ToolExecutor:
+    def __init__(self, registry: ToolRegistry, cpu_factories: Optional[Dict[str, Callable[[], Any]]] = None,
+                 worker_warmups: Optional[Dict[str, Any]] = None,
+                 process_workers: Optional[int] = None, thread_workers: Optional[int] = None,
+                 worker_stats: Optional[Callable[[], Any]] = None):
+        """
+        `registry` holds the tools run on the thread pool. `cpu_factories` maps the CPU-bound
+        tools to their factories; they are built in the worker processes, which then run
+        the `worker_warmups` steps. Without worker processes they get a registry of their
+        own, warmed by warm(), and run on the thread pool. `worker_stats` (picklable, e.g.
+        get_validation_stats) is called in a worker after each of its calls; the latest
+        snapshot per worker is returned by worker_snapshots().
+        """
+        self.registry = registry
+        self.cpu_factories = dict(cpu_factories or {})
+        self.process_workers = process_workers if process_workers is not None else int(
+            os.getenv("TOOL_PROCESS_WORKERS", str(os.cpu_count() or 1))
+        )
+        self.thread_workers = thread_workers or int(os.getenv("TOOL_THREAD_WORKERS", str(DEFAULT_THREAD_WORKERS)))
+        self.cpu_bound = set(self.cpu_factories) if self.process_workers > 0 else set()
+        self.worker_warmups = worker_warmups or {}
+        self.worker_stats = worker_stats
+        self._worker_snapshots: Dict[int, Any] = {}
+        # CPU-bound tools when TOOL_PROCESS_WORKERS=0
+        self._cpu_registry = ToolRegistry(registry.server, self.cpu_factories, self.worker_warmups)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix=f"{registry.server}-tool")
+        self._pool_lock = threading.Lock()
+        self._limits: Dict[str, int] = {}
+        # asyncio.Semaphore belongs to one event loop, so each loop gets its own per tool
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats: Dict[str, dict] = {}
+        for name in [*registry.factories, *self.cpu_factories]:
+            pool_size = self.process_workers if name in self.cpu_bound else self.thread_workers
+            env = f"TOOL_CONCURRENCY_{name.upper()}"
+            self._limits[name] = max(1, int(os.getenv(env, str(pool_size))))
+            self._stats[name] = {"pool": "process" if name in self.cpu_bound else "thread", "calls": 0,
+                                 "errors": 0, "queued": 0, "running": 0, "max_queued": 0,
+                                 "wait_seconds": 0.0, "run_seconds": 0.0}
+
+    async def run(self, tool: str, method: str, *args, **kwargs) -> Any:
+        """`registry.get(tool).<method>(*args, **kwargs)` on the tool's pool, awaited."""
+        stats = self._stats[tool]
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        if tool not in semaphores:
+            semaphores[tool] = asyncio.Semaphore(self._limits[tool])
+        semaphore = semaphores[tool]
+
+        queued_at = time.perf_counter()
+        stats["calls"] += 1
+        stats["queued"] += 1
+        stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+        try:
+            await semaphore.acquire()
+        finally:
+            stats["queued"] -= 1
+        started = time.perf_counter()
+        stats["wait_seconds"] += started - queued_at
+        stats["running"] += 1
+        try:
+            if tool in self.cpu_bound:
+                future = self._processes().submit(_call_in_worker, tool, method, args, kwargs)
+                result, pid, snapshot = await asyncio.wrap_future(future)
+                if snapshot is not None:
+                    self._worker_snapshots[pid] = snapshot
+                return result
+            registry = self._cpu_registry if tool in self.cpu_factories else self.registry
+            return await asyncio.wrap_future(self._thread_pool.submit(_call, registry, tool, method, args, kwargs))
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            stats["running"] -= 1
+            stats["run_seconds"] += time.perf_counter() - started
+            semaphore.release()
+
+    def _processes(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._process_pool is None:
+                # spawn, not fork: the server process has running threads and an event loop
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.registry.server, self.cpu_factories, self.worker_warmups, self.worker_stats),
+                )
+                logger.info(f"{self.registry.server}: started {self.process_workers} tool worker processes")
+            return self._process_pool
+
+    def warm(self, registry: Optional[ToolRegistry] = None) -> None:
+        """Registry warm-up step: start every worker process and wait until its tools are warm."""
+        if not self.cpu_bound:
+            if self.cpu_factories:
+                self._cpu_registry.warm()
+            return
+        pool = self._processes()
+        futures = [pool.submit(_ready) for _ in range(self.process_workers)]
+        for future in futures:
+            future.result()
+
+    def worker_snapshots(self) -> List[Any]:
+        """The latest `worker_stats()` snapshot of every worker process that has handled a call."""
+        return list(self._worker_snapshots.values())
+
+    def shutdown(self) -> None:
+        self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        with self._pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+
+    def stats(self) -> dict:
+        """Per tool: pool, calls, errors, calls queued and running now, peak queue and time waiting/running."""
+        tools = {}
+        for name, stats in self._stats.items():
+            done = stats["calls"] - stats["queued"] - stats["running"]
+            tools[name] = dict(
+                stats,
+                limit=self._limits[name],
+                mean_wait_seconds=round(stats["wait_seconds"] / stats["calls"], 4) if stats["calls"] else 0.0,
+                mean_run_seconds=round(stats["run_seconds"] / done, 4) if done else 0.0,
+            )
+        return {
+            "process_workers": self.process_workers if self.cpu_bound else 0,
+            "thread_workers": self.thread_workers,
+            "queued": sum(stats["queued"] for stats in self._stats.values()),
+            "running": sum(stats["running"] for stats in self._stats.values()),
+            "tools": tools,
+        }
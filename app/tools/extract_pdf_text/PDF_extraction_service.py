@@ -1,10 +1,15 @@
-import os
-from typing import Dict, Union
+import copy
+from typing import Dict, List, Optional, Union
 from .interfaces import SourceLoader, PDFExtractor
+from app.utils import SingleFlight
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Concurrent requests for the same path or URL, pages and loader/extractor settings share
+# one download and parse
+_extraction_flight = SingleFlight("pdf_extraction")
+
 
 class PDFExtractionService:
     def __init__(
@@ -16,29 +21,42 @@ class PDFExtractionService:
         self.extractor = extractor
         logger.info("PDFExtractionService initialized")
 
-    def extract(self, source: str) -> Dict[str, Union[str, int, bool]]:
-        pdf_path = None
+    def extract(
+        self, source: Union[str, bytes], pages: Optional[List[int]] = None
+    ) -> Dict[str, Union[str, int, bool, list]]:
+        if not isinstance(source, str):
+            return self._extract(source, pages)
+        key = (source, tuple(pages) if pages is not None else None) + self._settings()
+        # Each caller gets its own copy, page_results included
+        return copy.deepcopy(_extraction_flight.do(key, lambda: self._extract(source, pages)))
+
+    def _extract(
+        self, source: Union[str, bytes], pages: Optional[List[int]] = None
+    ) -> Dict[str, Union[str, int, bool, list]]:
+        pdf = None
 
         try:
-            logger.info(f"Loading PDF from source: {source}")
-            pdf_path = self.loader.load(source)
+            logger.info(f"Loading PDF from source: {self._describe(source)}")
+            pdf = self.loader.load(source)
             logger.info(f"PDF loaded successfully, extracting text")
-            text, pages = self.extractor.extract(pdf_path)
+            text, page_count, page_spans = self.extractor.extract_with_offsets(pdf, pages)
 
             if not text:
                 logger.warning("PDF contains no extractable text")
                 return {
                     "success": True,
                     "text": "",
-                    "pages": pages,
+                    "pages": page_count,
+                    "page_results": page_spans,
                     "error": "PDF contains no extractable text."
                 }
 
-            logger.info(f"Text extraction successful: {pages} pages, {len(text)} characters")
+            logger.info(f"Text extraction successful: {page_count} pages, {len(text)} characters")
             return {
                 "success": True,
                 "text": text,
-                "pages": pages,
+                "pages": page_count,
+                "page_results": page_spans,
                 "error": None
             }
 
@@ -52,9 +70,21 @@ class PDFExtractionService:
             }
 
         finally:
-            if source.startswith(("http://", "https://")) and pdf_path:
-                try:
-                    logger.debug(f"Cleaning up temporary file: {pdf_path}")
-                    os.remove(pdf_path)
-                except OSError as e:
-                    logger.warning(f"Failed to remove temporary file {pdf_path}: {e}")
+            if pdf is not None and not isinstance(pdf, str):
+                # In-memory buffer or memory map returned by the loader
+                pdf.close()
+
+    def _settings(self) -> tuple:
+        """The loader and extractor settings that change the result of an extraction."""
+        return (
+            type(self.loader).__qualname__,
+            type(self.extractor).__qualname__,
+            getattr(self.loader, "use_mmap", None),
+            getattr(self.extractor, "streaming", None),
+            getattr(self.extractor, "spool_max_size", None),
+            getattr(self.extractor, "memory_limit_mb", None),
+        )
+
+    @staticmethod
+    def _describe(source: Union[str, bytes]) -> str:
+        return f"<{len(source)} bytes>" if isinstance(source, (bytes, bytearray)) else source
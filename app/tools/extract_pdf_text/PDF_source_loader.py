@@ -1,47 +1,61 @@
+import io
+import mmap
 import os
 import logging
-import requests
-import tempfile
+import httpx
+from typing import BinaryIO, Optional, Union
+from app.utils import get_http_client
 from .interfaces import SourceLoader
 
 logger = logging.getLogger(__name__)
 
 
 class PDFSourceLoader(SourceLoader):
+    """
+    Loads PDFs without touching the filesystem: downloads and raw bytes are served
+    from memory, and local files are returned as paths (or memory-mapped when
+    `use_mmap` / PDF_LOADER_MMAP is enabled). Downloads go through the shared pooled
+    HTTP client unless `http_client` is given.
+    """
 
-    def load(self, source: str) -> str:
+    def __init__(self, use_mmap: bool = None, http_client: Optional[httpx.Client] = None):
+        if use_mmap is None:
+            use_mmap = os.getenv("PDF_LOADER_MMAP", "false").lower() in ("1", "true", "yes")
+        self.use_mmap = use_mmap
+        self.http_client = http_client
+
+    def load(self, source: Union[str, bytes]) -> Union[str, BinaryIO]:
         try:
+            if isinstance(source, (bytes, bytearray)):
+                logger.info(f"Loading PDF from {len(source)} in-memory bytes")
+                return io.BytesIO(source)
+
             logger.info(f"Loading PDF from source: {source}")
             if source.startswith(("http://", "https://")):
                 result = self._load_from_url(source)
             else:
                 result = self._load_from_file(source)
-            logger.info(f"PDF source loaded successfully: {result}")
+            logger.info(f"PDF source loaded successfully: {source}")
             return result
         except Exception as e:
             logger.error(f"Error loading PDF source: {e}", exc_info=True)
             raise
 
-    def _load_from_url(self, url: str) -> str:
+    def _load_from_url(self, url: str) -> BinaryIO:
         try:
             logger.info(f"Downloading PDF from URL: {url}")
-            response = requests.get(url, timeout=10)
+            response = (self.http_client or get_http_client()).get(url)
             response.raise_for_status()
             logger.info(f"PDF downloaded successfully, size: {len(response.content)} bytes")
-
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-            temp_file.write(response.content)
-            temp_file.close()
-            logger.info(f"PDF saved to temporary file: {temp_file.name}")
-            return temp_file.name
-        except requests.RequestException as e:
+            return io.BytesIO(response.content)
+        except httpx.HTTPError as e:
             logger.error(f"Error downloading PDF from URL {url}: {e}", exc_info=True)
             raise
         except Exception as e:
             logger.error(f"Error processing downloaded PDF: {e}", exc_info=True)
             raise
 
-    def _load_from_file(self, path: str) -> str:
+    def _load_from_file(self, path: str) -> Union[str, BinaryIO]:
         try:
             if not os.path.exists(path):
                 logger.error("PDF file does not exist: %s", path)
@@ -49,6 +63,10 @@ class PDFSourceLoader(SourceLoader):
             
             file_size = os.path.getsize(path)
             logger.info(f"PDF file found: {path}, size: {file_size} bytes")
+            if self.use_mmap and file_size:
+                with open(path, "rb") as f:
+                    # The mapping stays valid after the descriptor is closed
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
             return path
         except FileNotFoundError:
             raise
@@ -1,40 +1,253 @@
+import gc
+import os
+import tempfile
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, TextIO, Tuple, Union
 import pdfplumber
+from pdfplumber.page import Page
+from pdfplumber.utils.exceptions import PdfminerException
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import resolve1
 from .interfaces import PDFExtractor
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+MEMORY_CHECK_INTERVAL = 25
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """
+    Current resident set size of this process, or None where /proc is not available and
+    the memory limit is not checked. (getrusage only reports the peak, which would keep
+    tripping the limit on every small document after one large one.)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
 
 class PDFTextExtractor(PDFExtractor):
+    """
+    Extracts text with pdfplumber.
+
+    In streaming mode pages are parsed one at a time and released right after their
+    text is extracted, and process RSS is checked against `memory_limit_mb` every
+    `memory_check_interval` pages. This bounds pdfminer's per-page objects, not the
+    text: extract_with_offsets still returns the whole text as one string. Callers
+    that can consume a file use extract_to_file, which writes the text to a file
+    and returns only the page offsets.
+    """
+
+    def __init__(
+        self,
+        streaming: Optional[bool] = None,
+        memory_limit_mb: Optional[int] = None,
+        spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE,
+        memory_check_interval: int = MEMORY_CHECK_INTERVAL,
+    ):
+        if streaming is None:
+            streaming = os.getenv("PDF_EXTRACTION_STREAMING", "false").lower() in ("1", "true", "yes")
+        if memory_limit_mb is None and os.getenv("PDF_EXTRACTION_MEMORY_LIMIT_MB"):
+            memory_limit_mb = int(os.getenv("PDF_EXTRACTION_MEMORY_LIMIT_MB"))
+        self.streaming = streaming
+        self.memory_limit_mb = memory_limit_mb
+        self.spool_max_size = spool_max_size
+        self.memory_check_interval = memory_check_interval
+
+    def extract(self, pdf_path: Union[str, BinaryIO], pages: Optional[List[int]] = None):
+        text, page_count, _ = self.extract_with_offsets(pdf_path, pages)
+        return text, page_count
+
+    def extract_with_offsets(self, pdf_path: Union[str, BinaryIO], pages: Optional[List[int]] = None):
+        if self.streaming:
+            return self._extract_streaming(pdf_path, pages)
 
-    def extract(self, pdf_path: str):
         try:
-            logger.info(f"Extracting text from PDF: {pdf_path}")
+            logger.info(f"Extracting text from PDF: {self._describe(pdf_path)}")
             extracted_text = []
+            spans = []
+            position = 0
 
             with pdfplumber.open(pdf_path) as pdf:
-                pages = len(pdf.pages)
-                logger.info(f"PDF opened successfully, pages: {pages}")
+                page_count = len(pdf.pages)
+                logger.info(f"PDF opened successfully, pages: {page_count}")
 
-                if pages == 0:
+                if page_count == 0:
                     logger.error("PDF has no pages")
                     raise ValueError("PDF has no pages.")
 
-                for page_num, page in enumerate(pdf.pages, start=1):
+                # Page content is parsed lazily, so unselected pages are never parsed
+                for page_num in self._select_pages(pages, page_count):
+                    page = pdf.pages[page_num - 1]
+                    start = position
                     try:
                         text = page.extract_text()
                         if text:
+                            if extracted_text:
+                                position += 1
+                                start = position
                             extracted_text.append(text)
+                            position += len(text)
                             logger.debug(f"Extracted text from page {page_num}: {len(text)} characters")
                     except Exception as e:
                         logger.warning(f"Error extracting text from page {page_num}: {e}")
+                    spans.append({"page": page_num, "start": start, "end": position})
+
+            raw_text = "\n".join(extracted_text)
+            full_text = raw_text.strip()
+            spans = self._shift_spans(spans, raw_text, full_text)
+            logger.info(f"Text extraction completed: {len(full_text)} characters from {len(spans)} of {page_count} pages")
+            return full_text, page_count, spans
+        except PdfminerException as e:
+            logger.error(f"PDF syntax error while extracting text: {e}", exc_info=True)
+            raise
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF: {e}", exc_info=True)
+            raise
+
+    def _extract_streaming(self, pdf_path: Union[str, BinaryIO], pages: Optional[List[int]] = None):
+        try:
+            logger.info(f"Extracting text from PDF in streaming mode: {self._describe(pdf_path)}")
+            with tempfile.SpooledTemporaryFile(max_size=self.spool_max_size, mode="w+", encoding="utf-8") as buffer:
+                page_count, spans = self.extract_to_file(pdf_path, buffer, pages)
+                buffer.seek(0)
+                raw_text = buffer.read()
 
-            full_text = "\n".join(extracted_text).strip()
-            logger.info(f"Text extraction completed: {len(full_text)} characters from {pages} pages")
-            return full_text, pages
-        except pdfplumber.exceptions.PDFSyntaxError as e:
+            full_text = raw_text.strip()
+            spans = self._shift_spans(spans, raw_text, full_text)
+            logger.info(
+                f"Streaming text extraction completed: {len(full_text)} characters from {len(spans)} of {page_count} pages"
+            )
+            return full_text, page_count, spans
+        except PdfminerException as e:
             logger.error(f"PDF syntax error while extracting text: {e}", exc_info=True)
             raise
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}", exc_info=True)
             raise
+
+    def extract_to_file(self, pdf_path: Union[str, BinaryIO], out: TextIO,
+                        pages: Optional[List[int]] = None) -> Tuple[int, List[Dict[str, int]]]:
+        """
+        Stream the text of the selected pages into `out`, one page at a time, and return
+        (page_count, spans). Pages are separated by a newline; span offsets index into
+        the written text, which is not stripped. Memory stays flat however long the text.
+        """
+        processed = 0
+        position = 0
+        wrote_text = False
+        spans = []
+
+        # not a `with` block: PDF.close() rebuilds `pdf.pages`, creating a Page for every
+        # page of the document; the pages created here are closed one by one instead
+        pdf = pdfplumber.open(pdf_path)
+        try:
+            page_count = self._page_count(pdf)
+            if page_count == 0:
+                logger.error("PDF has no pages")
+                raise ValueError("PDF has no pages.")
+            selected = set(self._select_pages(pages, page_count)) if pages else None
+
+            for page_num, page in self._iter_pages(pdf, selected):
+                processed += 1
+                start = position
+                try:
+                    text = page.extract_text()
+                    if text:
+                        if wrote_text:
+                            out.write("\n")
+                            position += 1
+                            start = position
+                        out.write(text)
+                        position += len(text)
+                        wrote_text = True
+                        logger.debug(f"Extracted text from page {page_num}: {len(text)} characters")
+                except Exception as e:
+                    logger.warning(f"Error extracting text from page {page_num}: {e}")
+                finally:
+                    # Drop the page's parsed objects and char lists before moving on
+                    page.close()
+                spans.append({"page": page_num, "start": start, "end": position})
+
+                if processed % self.memory_check_interval == 0:
+                    self._enforce_memory_limit(processed)
+        finally:
+            if not pdf.stream_is_external:
+                pdf.stream.close()
+
+        return page_count, spans
+
+    @staticmethod
+    def _describe(pdf_path: Union[str, BinaryIO]) -> str:
+        return pdf_path if isinstance(pdf_path, str) else "<in-memory stream>"
+
+    @staticmethod
+    def _page_count(pdf: pdfplumber.PDF) -> int:
+        """Page count from the document's page tree, without creating a Page per page."""
+        try:
+            count = resolve1(resolve1(pdf.doc.catalog["Pages"])["Count"])
+            if isinstance(count, int):
+                return count
+        except Exception as e:
+            logger.debug(f"No usable page count in the page tree ({e}), counting pages")
+        return sum(1 for _ in PDFPage.create_pages(pdf.doc))
+
+    @staticmethod
+    def _iter_pages(pdf: pdfplumber.PDF, selected: Optional[Set[int]] = None) -> Iterator[Tuple[int, Page]]:
+        """Yield (page_number, page) one at a time without pdfplumber keeping every Page on
+        `pdf.pages`. Pages outside `selected` are never parsed, and the walk stops after
+        the last selected page."""
+        last = max(selected) if selected else None
+        doctop = 0
+        for page_number, pdfminer_page in enumerate(PDFPage.create_pages(pdf.doc), start=1):
+            if last is not None and page_number > last:
+                break
+            if selected is not None and page_number not in selected:
+                continue
+            page = Page(pdf, pdfminer_page, page_number=page_number, initial_doctop=doctop)
+            doctop += page.height
+            yield page_number, page
+
+    @staticmethod
+    def _select_pages(pages: Optional[List[int]], page_count: int) -> List[int]:
+        if not pages:
+            return list(range(1, page_count + 1))
+        selected = [page for page in pages if page <= page_count]
+        if not selected:
+            raise ValueError(f"Requested pages are out of range: the PDF has {page_count} pages")
+        if len(selected) < len(pages):
+            logger.warning(f"Ignoring requested pages beyond page {page_count}")
+        return selected
+
+    @staticmethod
+    def _shift_spans(spans: List[Dict[str, int]], raw_text: str, full_text: str) -> List[Dict[str, int]]:
+        """Re-base page spans onto the stripped text."""
+        lead = len(raw_text) - len(raw_text.lstrip())
+        end = len(full_text)
+        return [
+            {
+                "page": span["page"],
+                "start": min(max(span["start"] - lead, 0), end),
+                "end": min(max(span["end"] - lead, 0), end),
+            }
+            for span in spans
+        ]
+
+    def _enforce_memory_limit(self, pages: int) -> None:
+        if not self.memory_limit_mb:
+            return
+        limit = self.memory_limit_mb * 1024 * 1024
+        rss = _current_rss_bytes()
+        if rss is None or rss <= limit:
+            return
+
+        gc.collect()
+        rss = _current_rss_bytes()
+        if rss > limit:
+            logger.error(f"Memory limit exceeded after {pages} pages: {rss / 2**20:.1f} MB > {self.memory_limit_mb} MB")
+            raise MemoryError(
+                f"PDF extraction exceeded the memory limit of {self.memory_limit_mb} MB after {pages} pages"
+            )
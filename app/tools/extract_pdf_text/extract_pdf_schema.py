@@ -7,6 +7,28 @@ EXTRACT_PDF_ARGS_SCHEMA = {
         "source": {
             "type": "string",
             "description": "Local file path or HTTP URL to the PDF file"
+        },
+        "pages": {
+            "type": "string",
+            "description": "Optional 1-based page selection, e.g. '1-3,7'. All pages when omitted"
+        },
+        "by_reference": {
+            "type": "boolean",
+            "description": "Store the text server-side and return a text_uri instead of the text itself"
         }
     }
-}
\ No newline at end of file
+}
+
+
+EXTRACT_PDF_BASE64_ARGS_SCHEMA = {
+    "type": "object",
+    "required": ["pdf_base64"],
+    "properties": {
+        "pdf_base64": {
+            "type": "string",
+            "description": "Base64-encoded bytes of the PDF file"
+        },
+        "pages": EXTRACT_PDF_ARGS_SCHEMA["properties"]["pages"],
+        "by_reference": EXTRACT_PDF_ARGS_SCHEMA["properties"]["by_reference"]
+    }
+}
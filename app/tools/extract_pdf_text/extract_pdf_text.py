@@ -1,6 +1,15 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import base64
+import binascii
+from typing import List, Optional, Union
 from .PDF_extraction_service import PDFExtractionService
 from .PDF_source_loader import PDFSourceLoader
 from .PDF_text_extractor import PDFTextExtractor
+from .page_ranges import parse_page_ranges
+from app.utils import get_text_store
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,7 +18,8 @@ class ExtractPDFTextTool:
     name = "extract_pdf_text"
     description = (
         "Extracts text from a PDF file given a local path or HTTP URL. "
-        "Returns extracted text and number of pages."
+        "Returns extracted text, number of pages and per-page character offsets, "
+        "optionally for a page range only or as a server-side text reference."
     )
 
     def __init__(self):
@@ -19,15 +29,49 @@ class ExtractPDFTextTool:
         )
         logger.info("ExtractPDFTextTool initialized")
 
-    def run(self, source: str):
+    def run(self, source: Union[str, bytes], pages: Optional[Union[str, List[int]]] = None, by_reference: bool = False):
+        """
+        Args:
+            source: Local file path, HTTP URL, or the raw bytes of the PDF file
+            pages: Optional page selection such as "1-3,7"; all pages when omitted
+            by_reference: Store the text server-side and return a `text_uri` instead of inline text
+        """
         try:
-            logger.info(f"Extracting text from PDF source: {source}")
-            result = self.service.extract(source)
+            if isinstance(source, (bytes, bytearray)):
+                logger.info(f"Extracting text from in-memory PDF ({len(source)} bytes)")
+            else:
+                logger.info(f"Extracting text from PDF source: {source}")
+            result = self.service.extract(source, parse_page_ranges(pages))
             if result.get("success"):
                 logger.info(f"PDF extraction successful: {result.get('pages', 0)} pages extracted")
+                if by_reference:
+                    result = self.store_by_reference(result)
             else:
                 logger.warning(f"PDF extraction failed: {result.get('error')}")
             return result
         except Exception as e:
             logger.error(f"Error extracting PDF text: {e}", exc_info=True)
             raise
+
+    @staticmethod
+    def store_by_reference(result: dict) -> dict:
+        """
+        Move a successful result's text into this process's text store and return the
+        result with a `text_uri` instead. Used by `run`, and by servers that extract in a
+        worker process, where the store would not be visible to other tools.
+        """
+        result = dict(result)
+        text = result.pop("text")
+        result["text_uri"] = get_text_store().put(text)
+        result["characters"] = len(text)
+        logger.info(f"Extracted text stored by reference: {result['text_uri']}")
+        return result
+
+    def run_base64(self, pdf_base64: str, pages: Optional[Union[str, List[int]]] = None, by_reference: bool = False):
+        """Extract text from base64-encoded PDF bytes, entirely in memory."""
+        try:
+            data = base64.b64decode(pdf_base64, validate=True)
+        except (binascii.Error, ValueError) as e:
+            logger.error(f"Invalid base64 PDF payload: {e}")
+            raise ValueError(f"Invalid base64 PDF payload: {e}")
+        return self.run(data, pages=pages, by_reference=by_reference)
@@ -1,8 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 
 class PDFExtractor(ABC):
     @abstractmethod
-    def extract(self, pdf_path: str) -> Tuple[str, int]:
-        """Returns (text, number_of_pages)"""
-        pass
\ No newline at end of file
+    def extract(self, pdf_path: Union[str, BinaryIO], pages: Optional[List[int]] = None) -> Tuple[str, int]:
+        """Reads a PDF path or binary stream. Returns (text, number_of_pages); `pages` limits extraction to those 1-based page numbers"""
+        pass
+
+    def extract_with_offsets(
+        self, pdf_path: Union[str, BinaryIO], pages: Optional[List[int]] = None
+    ) -> Tuple[str, int, List[Dict[str, int]]]:
+        """Returns (text, number_of_pages, page_spans) where each span is {"page", "start", "end"}
+        into text. Extractors that cannot locate pages return no spans."""
+        text, number_of_pages = self.extract(pdf_path, pages)
+        return text, number_of_pages, []
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
+from typing import BinaryIO, Union
 
 class SourceLoader(ABC):
     @abstractmethod
-    def load(self, source: str) -> str:
-        """Returns local PDF path"""
-        pass
\ No newline at end of file
+    def load(self, source: Union[str, bytes]) -> Union[str, BinaryIO]:
+        """Returns a local PDF path or a readable, seekable binary stream"""
+        pass
@@ -0,0 +1,47 @@
+import os
+from typing import List, Optional, Union
+
+# Page numbers above this are rejected, so a selection like "1-2000000000" cannot
+# expand into billions of page numbers
+DEFAULT_MAX_PAGE_NUMBER = 10000
+
+
+def max_page_number() -> int:
+    return int(os.getenv("PDF_MAX_PAGE_NUMBER", str(DEFAULT_MAX_PAGE_NUMBER)))
+
+
+def parse_page_ranges(spec: Optional[Union[str, List[int]]]) -> Optional[List[int]]:
+    """
+    Parse a page selection such as "1-3,7" or [1, 2, 3, 7] into sorted, unique
+    1-based page numbers. Returns None (all pages) for an empty selection. Raises
+    ValueError for pages beyond PDF_MAX_PAGE_NUMBER (default 10000).
+    """
+    if spec is None:
+        return None
+    limit = max_page_number()
+    if isinstance(spec, str):
+        if not spec.strip():
+            return None
+        pages = set()
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            start, sep, end = part.partition("-")
+            try:
+                first = int(start)
+                last = int(end) if sep else first
+            except ValueError:
+                raise ValueError(f"Invalid page range: {part!r}")
+            if first < 1 or last < first:
+                raise ValueError(f"Invalid page range: {part!r}")
+            if last > limit:
+                raise ValueError(f"Page range {part!r} exceeds the maximum page number {limit}")
+            pages.update(range(first, last + 1))
+    else:
+        pages = set(spec)
+        if any(not isinstance(page, int) or page < 1 for page in pages):
+            raise ValueError("Page numbers must be positive integers")
+        if pages and max(pages) > limit:
+            raise ValueError(f"Page {max(pages)} exceeds the maximum page number {limit}")
+    return sorted(pages) or None
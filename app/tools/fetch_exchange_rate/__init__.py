@@ -1,4 +1,5 @@
 from .fetch_exchange_rate import FetchExchangeRateTool
-from .fetch_exchange_rate_schema import FETCH_EXCHANGE_RATE_ARGS_SCHEMA
+from .convert_amounts import ConvertAmountsTool
+from .fetch_exchange_rate_schema import FETCH_EXCHANGE_RATE_ARGS_SCHEMA, CONVERT_AMOUNTS_ARGS_SCHEMA
 
-__all__ = ["FetchExchangeRateTool", "FETCH_EXCHANGE_RATE_ARGS_SCHEMA"]
\ No newline at end of file
+__all__ = ["FetchExchangeRateTool", "ConvertAmountsTool", "FETCH_EXCHANGE_RATE_ARGS_SCHEMA", "CONVERT_AMOUNTS_ARGS_SCHEMA"]
\ No newline at end of file
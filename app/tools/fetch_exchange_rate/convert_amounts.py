@@ -0,0 +1,73 @@
+from .fetch_exchange_rate_service import ExchangeRateService
+from .fetch_exchange_rate_schema import (
+    CONVERT_AMOUNTS_ARGS_SCHEMA,
+    CONVERT_AMOUNTS_OUTPUT_SCHEMA,
+)
+from app.utils import compile_schema
+import logging
+
+logger = logging.getLogger(__name__)
+
+_input_validator = compile_schema("convert_amounts.input", CONVERT_AMOUNTS_ARGS_SCHEMA)
+_output_validator = compile_schema("convert_amounts.output", CONVERT_AMOUNTS_OUTPUT_SCHEMA)
+
+
+class ConvertAmountsTool:
+    name = "convert_amounts"
+    description = (
+        "Converts a list of amounts between currencies in one call. "
+        "Returns each converted amount with the rate used, plus provider and timestamp metadata."
+    )
+
+    def __init__(self):
+        self.service = ExchangeRateService()
+        logger.info("ConvertAmountsTool initialized")
+
+    def run(self, input_data: dict) -> dict:
+        try:
+            conversions = self._conversions(input_data)
+            results, metadata = self.service.convert_amounts(*self._columns(conversions))
+            return self._response(results, metadata)
+        except Exception as e:
+            logger.error(f"Error converting amounts: {e}", exc_info=True)
+            raise
+
+    async def run_async(self, input_data: dict) -> dict:
+        """run() on the pooled async HTTP client, for async MCP handlers."""
+        try:
+            conversions = self._conversions(input_data)
+            results, metadata = await self.service.convert_amounts_async(*self._columns(conversions))
+            return self._response(results, metadata)
+        except Exception as e:
+            logger.error(f"Error converting amounts: {e}", exc_info=True)
+            raise
+
+    @staticmethod
+    def _conversions(input_data: dict) -> list:
+        _input_validator.validate_input(input_data)
+        conversions = input_data["conversions"]
+        logger.info(f"Converting {len(conversions)} amounts")
+        return conversions
+
+    @staticmethod
+    def _columns(conversions: list) -> tuple:
+        return (
+            [item["amount"] for item in conversions],
+            [item["from_currency"] for item in conversions],
+            [item["to_currency"] for item in conversions],
+        )
+
+    @staticmethod
+    def _response(results: list, metadata: dict) -> dict:
+        response = {
+            "data": {
+                "conversions": results,
+            },
+            "metadata": metadata,
+        }
+
+        _output_validator.validate_output(response)
+
+        failed = sum(1 for item in results if "error" in item)
+        logger.info(f"Converted {len(results) - failed} of {len(results)} amounts successfully")
+        return response
@@ -23,25 +23,39 @@ class FetchExchangeRateTool:
         try:
             logger.info(f"Fetching exchange rate: {base_currency} to {target_currency}")
             result = self.service.fetch_rate(base_currency, target_currency)
-            
-            if not result:
-                logger.error("Failed to fetch exchange rate: empty result")
-                raise ValueError("Failed to fetch exchange rate")
-
-            response = {
-                "data": {
-                    "base_currency": base_currency,
-                    "target_currency": target_currency,
-                    "exchange_rate": result["rate"],
-                },
-                "metadata": {
-                    "provider": result["provider"],
-                    "endpoint": result["endpoint"],
-                    "timestamp": result["timestamp"],
-                },
-            }
-            logger.info(f"Exchange rate fetched successfully: {result['rate']}")
-            return response
+            return self._response(base_currency, target_currency, result)
         except Exception as e:
             logger.error(f"Error fetching exchange rate: {e}", exc_info=True)
             raise
+
+    async def run_async(self, base_currency: str, target_currency: str) -> dict:
+        """run() on the pooled async HTTP client, for async MCP handlers."""
+        try:
+            logger.info(f"Fetching exchange rate: {base_currency} to {target_currency}")
+            result = await self.service.fetch_rate_async(base_currency, target_currency)
+            return self._response(base_currency, target_currency, result)
+        except Exception as e:
+            logger.error(f"Error fetching exchange rate: {e}", exc_info=True)
+            raise
+
+    @staticmethod
+    def _response(base_currency: str, target_currency: str, result: dict) -> dict:
+        if not result:
+            logger.error("Failed to fetch exchange rate: empty result")
+            raise ValueError("Failed to fetch exchange rate")
+
+        response = {
+            "data": {
+                "base_currency": base_currency,
+                "target_currency": target_currency,
+                "exchange_rate": result["rate"],
+            },
+            "metadata": {
+                "provider": result["provider"],
+                "endpoint": result["endpoint"],
+                "timestamp": result["timestamp"],
+                "cache": result["cache"],
+            },
+        }
+        logger.info(f"Exchange rate fetched successfully: {result['rate']}")
+        return response
@@ -43,6 +43,24 @@ EXCHANGE_RATE_METADATA_SCHEMA = {
         },
         "timestamp": {
             "type": "string"
+        },
+        "cache": {
+            "type": "object",
+            "properties": {
+                "status": {
+                    "type": "string",
+                    "enum": ["hit", "stale", "miss", "fallback"]
+                },
+                "stale": {
+                    "type": "boolean"
+                },
+                "age_seconds": {
+                    "type": "number"
+                },
+                "hit_ratio": {
+                    "type": "number"
+                }
+            }
         }
     }
 }
@@ -55,3 +73,73 @@ FETCH_EXCHANGE_RATE_OUTPUT_SCHEMA = {
         "metadata": EXCHANGE_RATE_METADATA_SCHEMA
     }
 }
+
+CONVERT_AMOUNTS_ARGS_SCHEMA = {
+    "type": "object",
+    "required": ["conversions"],
+    "properties": {
+        "conversions": {
+            "type": "array",
+            "minItems": 1,
+            "description": "Amounts to convert, each with its source and target currency codes",
+            "items": {
+                "type": "object",
+                "required": ["amount", "from_currency", "to_currency"],
+                "properties": {
+                    "amount": {
+                        "type": "number"
+                    },
+                    "from_currency": {
+                        "type": "string"
+                    },
+                    "to_currency": {
+                        "type": "string"
+                    }
+                }
+            }
+        }
+    }
+}
+
+CONVERSION_RESULT_SCHEMA = {
+    "type": "object",
+    "required": ["amount", "from_currency", "to_currency"],
+    "properties": {
+        "amount": {
+            "type": "number"
+        },
+        "from_currency": {
+            "type": "string"
+        },
+        "to_currency": {
+            "type": "string"
+        },
+        "rate": {
+            "type": "number"
+        },
+        "converted_amount": {
+            "type": "number"
+        },
+        "error": {
+            "type": "string"
+        }
+    }
+}
+
+CONVERT_AMOUNTS_OUTPUT_SCHEMA = {
+    "type": "object",
+    "required": ["data", "metadata"],
+    "properties": {
+        "data": {
+            "type": "object",
+            "required": ["conversions"],
+            "properties": {
+                "conversions": {
+                    "type": "array",
+                    "items": CONVERSION_RESULT_SCHEMA
+                }
+            }
+        },
+        "metadata": EXCHANGE_RATE_METADATA_SCHEMA
+    }
+}
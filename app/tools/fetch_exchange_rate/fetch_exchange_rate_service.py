@@ -1,63 +1,231 @@
-import requests
+import httpx
+import numpy as np
+import time
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 import os
 import logging
+from typing import Dict, List, Optional, Tuple
+from app.utils import TTLCache, CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from app.utils import get_http_client, get_async_client, host_semaphore
+from app.utils.circuit_breaker import is_upstream_failure
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PIVOT_CURRENCY = "USD"
+# Upper bound; each table expires earlier when the provider announces its next update
+DEFAULT_CACHE_TTL_SECONDS = 3600
+DEFAULT_CACHE_STALE_SECONDS = 3600
+MIN_CACHE_TTL_SECONDS = 60
+
+
+def _seconds_until_next_update(table: dict) -> Optional[float]:
+    next_update = table.get("time_next_update_unix")
+    if next_update is None:
+        return None
+    return max(MIN_CACHE_TTL_SECONDS, next_update - time.time())
+
+
+# Shared by every ExchangeRateService; tools are created per request
+_rate_table_cache = TTLCache(
+    name="exchange_rates",
+    ttl=float(os.getenv("EXCHANGE_RATE_CACHE_TTL_SECONDS", str(DEFAULT_CACHE_TTL_SECONDS))),
+    stale_ttl=float(os.getenv("EXCHANGE_RATE_CACHE_STALE_SECONDS", str(DEFAULT_CACHE_STALE_SECONDS))),
+    max_entries=16,
+    ttl_of=_seconds_until_next_update,
+    # Upstream down or circuit open: answer from the last known table, flagged stale
+    fallback_if=is_upstream_failure,
+)
+
+
 class ExchangeRateService:
     """
     Fetches live currency exchange rates.
+
+    One full rate table for the pivot currency (EXCHANGE_RATE_PIVOT_CURRENCY, default USD)
+    is fetched from `/latest/{pivot}` and cached until the provider's next update; every
+    pair, including cross rates, is derived from it locally.
     """
 
-    ENDPOINT = "https://v6.exchangerate-api.com/v6"
+    BASE_URL = "https://v6.exchangerate-api.com"
+    PATH = "/v6"
 
-    def __init__(self):
+    def __init__(self, cache: Optional[TTLCache] = None, pivot: Optional[str] = None,
+                 http_client: Optional[httpx.Client] = None, async_client: Optional[httpx.AsyncClient] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        # EXCHANGE_RATE_API_BASE_URL points the service at another host, e.g. a local mock
+        self.endpoint = os.getenv("EXCHANGE_RATE_API_BASE_URL", self.BASE_URL).rstrip("/") + self.PATH
+        self.cache = cache or _rate_table_cache
+        self.breaker = breaker or get_circuit_breaker("exchangerate-api")
+        # Shared pooled clients by default (app/utils/http_client.py)
+        self.http_client = http_client
+        self.async_client = async_client
+        self.pivot = (pivot or os.getenv("EXCHANGE_RATE_PIVOT_CURRENCY", DEFAULT_PIVOT_CURRENCY)).strip().upper()
         logger.info("ExchangeRateService initialized")
 
     def fetch_rate(self, base: str, target: str) -> dict:
+        table, cache_info = self.rate_table()
+        return self._rate_result(table, cache_info, base, target)
+
+    async def fetch_rate_async(self, base: str, target: str) -> dict:
+        """fetch_rate without blocking the event loop; shares the same cache."""
+        table, cache_info = await self.rate_table_async()
+        return self._rate_result(table, cache_info, base, target)
+
+    def rate_table(self) -> Tuple[dict, dict]:
+        """(pivot rate table, cache info); the table holds "base", "rates", "timestamp" and lookup arrays."""
+        return self.cache.get_or_load(self.pivot, self._fetch_table)
+
+    async def rate_table_async(self) -> Tuple[dict, dict]:
+        return await self.cache.get_or_load_async(self.pivot, self._fetch_table_async)
+
+    async def warm_async(self) -> None:
+        """Reload the cached pivot rate table before it expires (cache warmer)."""
+        await self.cache.refresh_async(self.pivot, self._fetch_table_async)
+
+    def _rate_result(self, table: dict, cache_info: dict, base: str, target: str) -> dict:
+        rate = self.cross_rate(table, base, target)
+        logger.info(f"Exchange rate {base}/{target} = {rate} (rate table cache {cache_info['status']})")
+        return {
+            "base": base,
+            "target": target,
+            "rate": rate,
+            "timestamp": table["timestamp"],
+            "provider": "exchangerate-api.com",
+            "endpoint": self.endpoint,
+            "cache": cache_info,
+        }
+
+    @staticmethod
+    def cross_rate(table: dict, base: str, target: str) -> float:
+        """Units of `target` per unit of `base`, derived through the table's pivot currency."""
+        rates: Dict[str, float] = table["rates"]
+        base_code, target_code = base.strip().upper(), target.strip().upper()
+        for code in (base_code, target_code):
+            if code not in rates:
+                logger.error(f"Unsupported currency code: {code}")
+                raise ValueError(f"Unsupported currency code: {code}")
+        if base_code == target_code:
+            return 1.0
+        return rates[target_code] / rates[base_code]
+
+    def convert_amounts(self, amounts: List[float], from_codes: List[str], to_codes: List[str]) -> Tuple[List[dict], dict]:
+        """
+        Convert many amounts at once: every rate comes from the one cached pivot table
+        (at most one upstream call), and all conversions are computed as a single NumPy
+        expression. Items with an unsupported currency get an "error" instead of a result.
+        Returns (per-item results in input order, table metadata).
+        """
+        table, cache_info = self.rate_table()
+        return self._convert(table, cache_info, amounts, from_codes, to_codes)
+
+    async def convert_amounts_async(self, amounts: List[float], from_codes: List[str],
+                                    to_codes: List[str]) -> Tuple[List[dict], dict]:
+        table, cache_info = await self.rate_table_async()
+        return self._convert(table, cache_info, amounts, from_codes, to_codes)
+
+    def _convert(self, table: dict, cache_info: dict, amounts: List[float], from_codes: List[str],
+                 to_codes: List[str]) -> Tuple[List[dict], dict]:
+        index, vector = table["index"], table["vector"]
+        unknown = len(index)
+
+        from_norm = [code.strip().upper() for code in from_codes]
+        to_norm = [code.strip().upper() for code in to_codes]
+        from_idx = np.fromiter((index.get(code, unknown) for code in from_norm), dtype=np.intp, count=len(from_norm))
+        to_idx = np.fromiter((index.get(code, unknown) for code in to_norm), dtype=np.intp, count=len(to_norm))
+        rates = vector[to_idx] / vector[from_idx]
+        rates[(from_idx == to_idx) & (from_idx != unknown)] = 1.0
+        converted = np.asarray(amounts, dtype=np.float64) * rates
+
+        results = []
+        for i, (amount, base, target) in enumerate(zip(amounts, from_norm, to_norm)):
+            item = {"amount": amount, "from_currency": base, "to_currency": target}
+            if np.isnan(rates[i]):
+                unsupported = base if base not in index else target
+                item["error"] = f"Unsupported currency code: {unsupported}"
+            else:
+                item["rate"] = float(rates[i])
+                item["converted_amount"] = float(converted[i])
+            results.append(item)
+        logger.info(f"Converted {len(results)} amounts (rate table cache {cache_info['status']})")
+        return results, {
+            "timestamp": table["timestamp"],
+            "provider": "exchangerate-api.com",
+            "endpoint": self.endpoint,
+            "cache": cache_info,
+        }
+
+    def _fetch_table(self) -> dict:
         try:
-            logger.info(f"Fetching exchange rate from API: {base}/{target}")
-            self.api_key = os.getenv("EXCHANGE_RATE_API_KEY")
-            
-            if not self.api_key:
-                logger.error("EXCHANGE_RATE_API_KEY is not set")
-                raise ValueError("EXCHANGE_RATE_API_KEY is not set")
-            
-            response = requests.get(
-                self.ENDPOINT+f"/{self.api_key}/pair/{base}/{target}",
-                timeout=10,
-            )
-            response.raise_for_status()
+            logger.info(f"Fetching exchange rate table from API: {self.pivot}")
+            url = self._table_url()
+
+            def request():
+                response = (self.http_client or get_http_client()).get(url)
+                response.raise_for_status()
+                return response
+
+            response = self.breaker.call(request)
             logger.info("Exchange rate API request successful")
+        except CircuitOpenError as e:
+            logger.warning(f"Not fetching exchange rate table: {e}")
+            raise
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching exchange rate table from API: {e}", exc_info=True)
+            raise
+        return self._parse_table(response)
 
-        except requests.RequestException as e:
-            logger.error(f"Error fetching exchange rate from API: {e}", exc_info=True)
-            if self.api_key is None:
-                logger.error("EXCHANGE_RATE_API_KEY is not set")
+    async def _fetch_table_async(self) -> dict:
+        try:
+            logger.info(f"Fetching exchange rate table from API: {self.pivot}")
+            url = self._table_url()
+
+            async def request():
+                response = await (self.async_client or get_async_client()).get(url)
+                response.raise_for_status()
+                return response
+
+            async with host_semaphore(url):
+                response = await self.breaker.call_async(request)
+            logger.info("Exchange rate API request successful")
+        except CircuitOpenError as e:
+            logger.warning(f"Not fetching exchange rate table: {e}")
+            raise
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching exchange rate table from API: {e}", exc_info=True)
             raise
+        return self._parse_table(response)
 
+    def _table_url(self) -> str:
+        self.api_key = os.getenv("EXCHANGE_RATE_API_KEY")
+        if not self.api_key:
+            logger.error("EXCHANGE_RATE_API_KEY is not set")
+            raise ValueError("EXCHANGE_RATE_API_KEY is not set")
+        return self.endpoint+f"/{self.api_key}/latest/{self.pivot}"
+
+    def _parse_table(self, response) -> dict:
         try:
             data = response.json()
-            logger.debug(f"API response received: {data}")
-            
-            if "conversion_rate" not in data:
-                logger.error(f"Invalid API response: missing conversion_rate. Response: {data}")
-                raise ValueError("Invalid API response: missing conversion_rate")
-
-            result = {
-                "base": base,
-                "target": target,
-                "rate": data["conversion_rate"],
+            logger.debug(f"API response received for {self.pivot} with {len(data.get('conversion_rates', {}))} rates")
+
+            if "conversion_rates" not in data:
+                logger.error(f"Invalid API response: missing conversion_rates. Response: {data}")
+                raise ValueError("Invalid API response: missing conversion_rates")
+
+            rates = {code.upper(): float(rate) for code, rate in data["conversion_rates"].items()}
+            table = {
+                "base": data.get("base_code", self.pivot),
+                "rates": rates,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
-                "provider": "exchangerate-api.com",
-                "endpoint": self.ENDPOINT
+                "time_next_update_unix": data.get("time_next_update_unix"),
+                # For convert_amounts: code -> position in `vector`, whose last slot is NaN for unknown codes
+                "index": {code: i for i, code in enumerate(rates)},
+                "vector": np.append(np.fromiter(rates.values(), dtype=np.float64, count=len(rates)), np.nan),
             }
-            logger.info(f"Exchange rate fetched successfully: {data['conversion_rate']}")
-            return result
-        except (KeyError, ValueError) as e:
+            logger.info(f"Exchange rate table fetched successfully: {len(table['rates'])} currencies")
+            return table
+        except (KeyError, ValueError, TypeError) as e:
             logger.error(f"Error parsing exchange rate API response: {e}", exc_info=True)
             raise
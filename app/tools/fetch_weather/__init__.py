@@ -1,4 +1,4 @@
 from .fetch_weather_tool import FetchWeatherTool
-from .fetch_weather_schema import FETCH_WEATHER_ARGS_SCHEMA
+from .fetch_weather_schema import FETCH_WEATHER_ARGS_SCHEMA, FETCH_WEATHER_MANY_ARGS_SCHEMA
 
-__all__ = ["FetchWeatherTool", "FETCH_WEATHER_ARGS_SCHEMA"]
\ No newline at end of file
+__all__ = ["FetchWeatherTool", "FETCH_WEATHER_ARGS_SCHEMA", "FETCH_WEATHER_MANY_ARGS_SCHEMA"]
\ No newline at end of file
@@ -42,6 +42,24 @@ WEATHER_API_METADATA_SCHEMA = {
         },
         "timestamp": {
             "type": "string"
+        },
+        "cache": {
+            "type": "object",
+            "properties": {
+                "status": {
+                    "type": "string",
+                    "enum": ["hit", "stale", "miss", "fallback"]
+                },
+                "stale": {
+                    "type": "boolean"
+                },
+                "age_seconds": {
+                    "type": "number"
+                },
+                "hit_ratio": {
+                    "type": "number"
+                }
+            }
         }
     }
 }
@@ -54,3 +72,86 @@ FETCH_WEATHER_OUTPUT_SCHEMA = {
         "metadata": WEATHER_API_METADATA_SCHEMA
     }
 }
+
+FETCH_WEATHER_MANY_ARGS_SCHEMA = {
+    "type": "object",
+    "required": ["cities"],
+    "properties": {
+        "cities": {
+            "type": "array",
+            "minItems": 1,
+            "maxItems": 50,
+            "items": {
+                "type": "string"
+            },
+            "description": "The city names to fetch weather for"
+        }
+    }
+}
+
+WEATHER_MANY_RESULT_SCHEMA = {
+    "type": "object",
+    "required": ["city"],
+    "properties": {
+        "city": {
+            "type": "string"
+        },
+        "temperature_celsius": {
+            "type": "number"
+        },
+        "wind_speed_kmh": {
+            "type": "number"
+        },
+        "condition": {
+            "type": "string"
+        },
+        "timestamp": {
+            "type": "string"
+        },
+        "cache": WEATHER_API_METADATA_SCHEMA["properties"]["cache"],
+        "error": {
+            "type": "string"
+        }
+    }
+}
+
+FETCH_WEATHER_MANY_OUTPUT_SCHEMA = {
+    "type": "object",
+    "required": ["data", "metadata"],
+    "properties": {
+        "data": {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": WEATHER_MANY_RESULT_SCHEMA
+                }
+            }
+        },
+        "metadata": {
+            "type": "object",
+            "required": ["provider", "endpoint", "timestamp", "cities", "failed"],
+            "properties": {
+                "provider": {
+                    "type": "string"
+                },
+                "endpoint": {
+                    "type": "string"
+                },
+                "timestamp": {
+                    "type": "string"
+                },
+                "cities": {
+                    "type": "integer"
+                },
+                "failed": {
+                    "type": "integer"
+                },
+                "cache_hit_ratio": {
+                    "type": "number"
+                }
+            }
+        }
+    }
+}
@@ -1,18 +1,68 @@
-import requests
+import asyncio
+import httpx
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 import os
+import re
 import logging
+from typing import List, Optional
+from app.utils import TTLCache, CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from app.utils import get_http_client, get_async_client, host_semaphore
+from app.utils.circuit_breaker import is_upstream_failure
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# OpenWeatherMap refreshes current weather about every 10 minutes
+DEFAULT_CACHE_TTL_SECONDS = 600
+DEFAULT_CACHE_STALE_SECONDS = 600
+DEFAULT_CACHE_NEGATIVE_TTL_SECONDS = 300
+DEFAULT_CACHE_MAX_ENTRIES = 1024
+# Common non-ISO country codes agents use; OpenWeatherMap expects ISO 3166
+COUNTRY_ALIASES = {"uk": "gb", "usa": "us"}
+
+
+def normalize_city(city: str) -> str:
+    """Cache key for a city query: "  London , UK" and "london,gb" are the same city."""
+    parts = [re.sub(r"\s+", " ", part).strip().casefold() for part in city.split(",")]
+    parts = [part for part in parts if part]
+    if len(parts) > 1:
+        parts[-1] = COUNTRY_ALIASES.get(parts[-1], parts[-1])
+    return ",".join(parts)
+
+
+def _is_unknown_city(error: BaseException) -> bool:
+    response = getattr(error, "response", None)
+    return isinstance(error, httpx.HTTPStatusError) and response is not None and response.status_code == 404
+
+
+# Shared by every WeatherService; tools are created per request
+_weather_cache = TTLCache(
+    name="weather",
+    ttl=float(os.getenv("WEATHER_CACHE_TTL_SECONDS", str(DEFAULT_CACHE_TTL_SECONDS))),
+    stale_ttl=float(os.getenv("WEATHER_CACHE_STALE_SECONDS", str(DEFAULT_CACHE_STALE_SECONDS))),
+    negative_ttl=float(os.getenv("WEATHER_CACHE_NEGATIVE_TTL_SECONDS", str(DEFAULT_CACHE_NEGATIVE_TTL_SECONDS))),
+    max_entries=int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", str(DEFAULT_CACHE_MAX_ENTRIES))),
+    negative_if=_is_unknown_city,
+    # Upstream down or circuit open: answer with the last known weather, flagged stale
+    fallback_if=is_upstream_failure,
+)
+
 
 class WeatherService:
-    ENDPOINT = "https://api.openweathermap.org/data/2.5/weather"
+    BASE_URL = "https://api.openweathermap.org"
+    PATH = "/data/2.5/weather"
 
-    def __init__(self):
+    def __init__(self, cache: Optional[TTLCache] = None, http_client: Optional[httpx.Client] = None,
+                 async_client: Optional[httpx.AsyncClient] = None, breaker: Optional[CircuitBreaker] = None):
+        self.cache = cache or _weather_cache
+        self.breaker = breaker or get_circuit_breaker("openweathermap")
+        # Shared pooled clients by default (app/utils/http_client.py)
+        self.http_client = http_client
+        self.async_client = async_client
+        # OPEN_WEATHER_MAP_BASE_URL points the service at another host, e.g. a local mock
+        self.endpoint = os.getenv("OPEN_WEATHER_MAP_BASE_URL", self.BASE_URL).rstrip("/") + self.PATH
         self.api_key = os.getenv("OPEN_WEATHER_MAP_API_KEY")
         if not self.api_key:
             logger.error("OPEN_WEATHER_MAP_API_KEY is not set")
@@ -21,6 +71,17 @@ class WeatherService:
             logger.info("WeatherService initialized")
 
     def fetch_weather(self, city: str) -> dict:
+        """
+        Current weather for `city`, served from the shared cache when possible. The
+        result's "cache" entry reports whether it was a hit, a stale value being
+        refreshed in the background, a miss, or a fallback to the last known value while
+        the upstream fails, plus the data's age and the hit ratio.
+        """
+        result, cache_info = self.cache.get_or_load(normalize_city(city), lambda: self._fetch_from_api(city))
+        logger.info(f"Weather for {city}: cache {cache_info['status']}, age {cache_info['age_seconds']}s")
+        return dict(result, city=city, cache=cache_info)
+
+    def _fetch_from_api(self, city: str) -> dict:
         try:
             logger.info(f"Fetching weather from API for city: {city}")
             
@@ -28,22 +89,99 @@ class WeatherService:
                 logger.error("OPEN_WEATHER_MAP_API_KEY is not set")
                 raise ValueError("OPEN_WEATHER_MAP_API_KEY is not set")
             
-            response = requests.get(
-                self.ENDPOINT,
-                params={
-                    "appid": self.api_key,
-                    "q": city,
-                    "units": "metric"
-                },
-                timeout=10
-            )
-            response.raise_for_status()
+            def request():
+                response = (self.http_client or get_http_client()).get(
+                    self.endpoint,
+                    params={
+                        "appid": self.api_key,
+                        "q": city,
+                        "units": "metric"
+                    },
+                )
+                response.raise_for_status()
+                return response
+
+            response = self.breaker.call(request)
             logger.info("Weather API request successful")
 
-        except requests.RequestException as e:
+        except CircuitOpenError as e:
+            logger.warning(f"Not fetching weather: {e}")
+            raise
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching weather from API: {e}", exc_info=True)
             raise
 
+        return self._parse(city, response)
+
+    async def fetch_weather_async(self, city: str) -> dict:
+        """fetch_weather without blocking the event loop; shares the same cache."""
+        key = normalize_city(city)
+        result, cache_info = await self.cache.get_or_load_async(key, lambda: self._fetch_from_api_async(city))
+        logger.info(f"Weather for {city}: cache {cache_info['status']}, age {cache_info['age_seconds']}s")
+        return dict(result, city=city, cache=cache_info)
+
+    async def warm_async(self, key: str) -> None:
+        """Reload the cached weather for a normalized city key before it expires (cache warmer)."""
+        await self.cache.refresh_async(key, lambda: self._fetch_from_api_async(key))
+
+    async def fetch_weather_many(self, cities: List[str]) -> List[dict]:
+        """
+        Weather for many cities concurrently, in input order. Requests share the pooled
+        async HTTP client and the per-host concurrency cap; cities that normalize to the
+        same key are fetched once. A failed city gets {"city", "error"} instead of data.
+        """
+        lookups = {}
+        for city in cities:
+            key = normalize_city(city)
+            if key not in lookups:
+                lookups[key] = asyncio.ensure_future(self.fetch_weather_async(city))
+        await asyncio.gather(*lookups.values(), return_exceptions=True)
+
+        results = []
+        for city in cities:
+            task = lookups[normalize_city(city)]
+            if task.exception() is not None:
+                results.append({"city": city, "error": self._describe_error(task.exception())})
+            else:
+                results.append(dict(task.result(), city=city))
+        logger.info(f"Fetched weather for {len(cities)} cities ({len(lookups)} distinct)")
+        return results
+
+    async def _fetch_from_api_async(self, city: str) -> dict:
+        try:
+            logger.info(f"Fetching weather from API for city: {city}")
+
+            async def request():
+                response = await (self.async_client or get_async_client()).get(
+                    self.endpoint,
+                    params={
+                        "appid": self.api_key,
+                        "q": city,
+                        "units": "metric"
+                    },
+                )
+                response.raise_for_status()
+                return response
+
+            async with host_semaphore(self.endpoint):
+                response = await self.breaker.call_async(request)
+            logger.info("Weather API request successful")
+        except CircuitOpenError as e:
+            logger.warning(f"Not fetching weather: {e}")
+            raise
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching weather from API: {e}", exc_info=True)
+            raise
+        return self._parse(city, response)
+
+    @staticmethod
+    def _describe_error(error: BaseException) -> str:
+        if _is_unknown_city(error):
+            return "City not found"
+        return str(error) or type(error).__name__
+
+    @staticmethod
+    def _parse(city: str, response) -> dict:
         try:
             data = response.json()
             logger.debug(f"Weather API response received for {city}")
@@ -1,9 +1,19 @@
 from .fetch_weather_service import WeatherService
-from .fetch_weather_schema import FETCH_WEATHER_OUTPUT_SCHEMA
+from .fetch_weather_schema import (
+    FETCH_WEATHER_OUTPUT_SCHEMA,
+    FETCH_WEATHER_MANY_ARGS_SCHEMA,
+    FETCH_WEATHER_MANY_OUTPUT_SCHEMA,
+)
+from app.utils import compile_schema
+from datetime import datetime, timezone
+from typing import List
 import logging
 
 logger = logging.getLogger(__name__)
 
+_many_input_validator = compile_schema("fetch_weather_many.input", FETCH_WEATHER_MANY_ARGS_SCHEMA)
+_many_output_validator = compile_schema("fetch_weather_many.output", FETCH_WEATHER_MANY_OUTPUT_SCHEMA)
+
 
 class FetchWeatherTool:
     name = "fetch_weather"
@@ -19,23 +29,63 @@ class FetchWeatherTool:
     def run(self, city: str) -> dict:
         try:
             logger.info(f"Fetching weather for city: {city}")
-            result = self.service.fetch_weather(city)
+            return self._response(city, self.service.fetch_weather(city))
+        except Exception as e:
+            logger.error(f"Error fetching weather for {city}: {e}", exc_info=True)
+            raise
+
+    async def run_async(self, city: str) -> dict:
+        """run() on the pooled async HTTP client, for async MCP handlers."""
+        try:
+            logger.info(f"Fetching weather for city: {city}")
+            return self._response(city, await self.service.fetch_weather_async(city))
+        except Exception as e:
+            logger.error(f"Error fetching weather for {city}: {e}", exc_info=True)
+            raise
+
+    @staticmethod
+    def _response(city: str, result: dict) -> dict:
+        response = {
+            "data":{
+                "city": city,
+                "temperature_celsius": result["temperature_celsius"],
+                "wind_speed_kmh": result["wind_speed_kmh"],
+                "condition": result["condition"],
+            },
+            "metadata":{
+                "provider": "OpenWeatherMap",
+                "endpoint": "current_weather",
+                "timestamp": result["timestamp"],
+                "cache": result["cache"],
+            },
+        }
+        logger.info(f"Weather fetched successfully for {city}: {result['temperature_celsius']}°C, {result['condition']}")
+        return response
+
+    async def run_many(self, cities: List[str]) -> dict:
+        """Weather for several cities fetched concurrently; failed cities carry an "error"."""
+        try:
+            _many_input_validator.validate_input({"cities": cities})
+            logger.info(f"Fetching weather for {len(cities)} cities")
+            results = await self.service.fetch_weather_many(cities)
 
             response = {
-                "data":{
-                    "city": city,
-                    "temperature_celsius": result["temperature_celsius"],
-                    "wind_speed_kmh": result["wind_speed_kmh"],
-                    "condition": result["condition"],
+                "data": {
+                    "results": results,
                 },
-                "metadata":{
+                "metadata": {
                     "provider": "OpenWeatherMap",
                     "endpoint": "current_weather",
-                    "timestamp": result["timestamp"],
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "cities": len(results),
+                    "failed": sum(1 for item in results if "error" in item),
+                    "cache_hit_ratio": self.service.cache.hit_ratio(),
                 },
             }
-            logger.info(f"Weather fetched successfully for {city}: {result['temperature_celsius']}°C, {result['condition']}")
+            _many_output_validator.validate_output(response)
+
+            logger.info(f"Weather fetched for {len(results) - response['metadata']['failed']} of {len(results)} cities")
             return response
         except Exception as e:
-            logger.error(f"Error fetching weather for {city}: {e}", exc_info=True)
+            logger.error(f"Error fetching weather for {len(cities)} cities: {e}", exc_info=True)
             raise
@@ -1,4 +1,13 @@
 from .hallucination_checker import HallucinationCheckerTool
 from .hallucination_checker_schema import HALLUCINATION_CHECKER_ARGS_SCHEMA
+from .support_filter import SupportFilter, get_prefilter_stats
+from .passage_index import PassageRetriever, get_passage_index
 
-__all__ = ["HallucinationCheckerTool", "HALLUCINATION_CHECKER_ARGS_SCHEMA"]
\ No newline at end of file
+__all__ = [
+    "HallucinationCheckerTool",
+    "HALLUCINATION_CHECKER_ARGS_SCHEMA",
+    "SupportFilter",
+    "get_prefilter_stats",
+    "PassageRetriever",
+    "get_passage_index",
+]
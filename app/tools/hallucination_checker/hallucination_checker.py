@@ -6,15 +6,22 @@ from datetime import datetime, timezone
 from .hallucination_checker_schema import (
     HALLUCINATION_CHECKER_ARGS_SCHEMA,
     HALLUCINATION_OUTPUT_SCHEMA,
+    HALLUCINATION_CHECKER_BATCH_ARGS_SCHEMA,
+    HALLUCINATION_BATCH_OUTPUT_SCHEMA,
 )
 from .hallucination_checker_service import HallucinationCheckerService
-from app.llm.gemini_client import GeminiClient
-from .hallucination_checker_prompt import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from app.llm import LLMClient, ModelRouter
+from .hallucination_checker_prompt import SYSTEM_PROMPT
+from app.utils import compile_schema
 import logging
-import jsonschema
 
 logger = logging.getLogger(__name__)
 
+_input_validator = compile_schema("hallucination_checker.input", HALLUCINATION_CHECKER_ARGS_SCHEMA)
+_output_validator = compile_schema("hallucination_checker.output", HALLUCINATION_OUTPUT_SCHEMA)
+_batch_input_validator = compile_schema("hallucination_checker_batch.input", HALLUCINATION_CHECKER_BATCH_ARGS_SCHEMA)
+_batch_output_validator = compile_schema("hallucination_checker_batch.output", HALLUCINATION_BATCH_OUTPUT_SCHEMA)
+
 
 class HallucinationCheckerTool:
     name = "hallucination_checker"
@@ -23,8 +30,8 @@ class HallucinationCheckerTool:
         "not supported by the given ground truth."
     )
 
-    def __init__(self):
-        llm = GeminiClient()
+    def __init__(self, llm: LLMClient = None):
+        llm = llm or ModelRouter(task="hallucination_check")
         self.service = HallucinationCheckerService(llm)
         logger.info("HallucinationCheckerTool initialized")
 
@@ -33,22 +40,13 @@ class HallucinationCheckerTool:
             logger.info("Starting hallucination check")
             
             # Validate input against JSON schema
-            try:
-                jsonschema.validate(instance=input_data, schema=HALLUCINATION_CHECKER_ARGS_SCHEMA)
-            except jsonschema.ValidationError as e:
-                logger.error(f"Input validation failed: {e.message}")
-                raise ValueError(f"Invalid input data: {e.message}")
+            _input_validator.validate_input(input_data)
             
             ground_truth = input_data["ground_truth"]
             response = input_data["response"]
             
-            # Generate user prompt for metadata
-            user_prompt = USER_PROMPT_TEMPLATE.format(
-                ground_truth=ground_truth,
-                response=response
-            )
-            
-            output = self.service.check(
+            # The prompt actually sent: filtered claims and narrowed reference, None if no LLM call was needed
+            output, user_prompt, model = self.service.check_with_prompt(
                 ground_truth=ground_truth,
                 response=response
             )
@@ -61,16 +59,13 @@ class HallucinationCheckerTool:
                 },
                 "metadata": {
                     "checked_at": datetime.now(timezone.utc).isoformat(),
-                    "model": "gemini",
+                    # None when the local pre-filter answered without an LLM call
+                    "model": model,
                 }
             }
             
             # Validate output against JSON schema
-            try:
-                jsonschema.validate(instance=result, schema=HALLUCINATION_OUTPUT_SCHEMA)
-            except jsonschema.ValidationError as e:
-                logger.error(f"Output validation failed: {e.message}")
-                raise ValueError(f"Invalid output data: {e.message}")
+            _output_validator.validate_output(result)
             
             logger.info("Hallucination check completed successfully")
             return result
@@ -80,3 +75,33 @@ class HallucinationCheckerTool:
         except Exception as e:
             logger.error(f"Error checking hallucination: {e}", exc_info=True)
             raise
+
+    def run_batch(self, input_data: dict) -> dict:
+        """Check many responses against one ground truth, packing them into few LLM calls."""
+        try:
+            logger.info("Starting batch hallucination check")
+
+            _batch_input_validator.validate_input(input_data)
+
+            models = set()
+            results = self.service.check_batch(input_data["ground_truth"], input_data["responses"], models)
+
+            result = {
+                "results": results,
+                "metadata": {
+                    "checked_at": datetime.now(timezone.utc).isoformat(),
+                    "model": ", ".join(sorted(models)) or None,
+                    "responses": len(results),
+                }
+            }
+
+            _batch_output_validator.validate_output(result)
+
+            logger.info(f"Batch hallucination check completed: {len(results)} responses")
+            return result
+        except (ValueError, KeyError) as e:
+            logger.error(f"Error checking hallucination batch: {e}", exc_info=True)
+            raise
+        except Exception as e:
+            logger.error(f"Error checking hallucination batch: {e}", exc_info=True)
+            raise
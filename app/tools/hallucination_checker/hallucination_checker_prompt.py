@@ -6,6 +6,7 @@ Your task:
 - Identify any statements in the RESPONSE that are NOT supported by the GROUND TRUTH.
 - Do NOT infer or assume facts.
 - If all information is supported, return has_hallucination = false.
+- Set confidence to how certain you are of the verdict (0.0 to 1.0).
 
 Return ONLY valid JSON.
 """
@@ -21,6 +22,29 @@ Return JSON in the following format:
 {{
   "has_hallucination": true | false,
   "hallucinated_statements": ["..."],
-  "explanation": "..."
+  "explanation": "...",
+  "confidence": 0.0 - 1.0
+}}
+"""
+
+BATCH_USER_PROMPT_TEMPLATE = """
+GROUND TRUTH:
+{ground_truth}
+
+RESPONSES:
+{responses}
+
+Check each response independently against the GROUND TRUTH.
+Return JSON in the following format, with exactly one entry per response index:
+{{
+  "results": [
+    {{
+      "index": 0,
+      "has_hallucination": true | false,
+      "hallucinated_statements": ["..."],
+      "explanation": "...",
+      "confidence": 0.0 - 1.0
+    }}
+  ]
 }}
 """
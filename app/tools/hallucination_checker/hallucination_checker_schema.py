@@ -50,6 +50,11 @@ HALLUCINATION_RESULT_SCHEMA = {
         },
         "explanation": {
             "type": "string"
+        },
+        "confidence": {
+            "type": "number",
+            "minimum": 0,
+            "maximum": 1
         }
     }
 }
@@ -67,3 +72,57 @@ HALLUCINATION_OUTPUT_SCHEMA = {
         }
     }
 }
+
+HALLUCINATION_CHECKER_BATCH_ARGS_SCHEMA = {
+    "type": "object",
+    "required": ["ground_truth", "responses"],
+    "properties": {
+        "ground_truth": {
+            "type": "string",
+            "minLength": 1
+        },
+        "responses": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "string",
+                "minLength": 1
+            }
+        }
+    }
+}
+
+# What the LLM returns for a packed batch: one indexed HALLUCINATION_RESULT_SCHEMA per response
+HALLUCINATION_BATCH_RESULT_SCHEMA = {
+    "type": "object",
+    "required": ["results"],
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["index"] + HALLUCINATION_RESULT_SCHEMA["required"],
+                "properties": {
+                    "index": {
+                        "type": "integer"
+                    },
+                    **HALLUCINATION_RESULT_SCHEMA["properties"]
+                }
+            }
+        }
+    }
+}
+
+HALLUCINATION_BATCH_OUTPUT_SCHEMA = {
+    "type": "object",
+    "required": ["results", "metadata"],
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": HALLUCINATION_RESULT_SCHEMA
+        },
+        "metadata": {
+            "type": "object"
+        }
+    }
+}
@@ -3,57 +3,229 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.llm import LLMClient
-from .hallucination_checker_prompt import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
-from .hallucination_checker_schema import HALLUCINATION_RESULT_SCHEMA
+from app.utils import compile_schema
+from .hallucination_checker_prompt import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE, BATCH_USER_PROMPT_TEMPLATE
+from .hallucination_checker_schema import HALLUCINATION_RESULT_SCHEMA, HALLUCINATION_BATCH_RESULT_SCHEMA
+from .support_filter import SupportFilter
+from .passage_index import PassageRetriever
+from typing import List, Optional
+import jsonschema
 import logging
 import inspect
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_TOKEN_BUDGET = 8000
+DEFAULT_BATCH_MAX_ITEMS = 25
+# Rough prompt-size estimate; good enough to keep batches under the budget
+CHARS_PER_TOKEN = 4
+
+_batch_result_validator = compile_schema("hallucination_checker.batch_result", HALLUCINATION_BATCH_RESULT_SCHEMA)
+
+
+def _supported_result() -> dict:
+    return {
+        "has_hallucination": False,
+        "hallucinated_statements": [],
+        "explanation": "Every statement in the response appears near-verbatim in the ground truth.",
+    }
+
 
 class HallucinationCheckerService:
-    def __init__(self, llm: LLMClient):
+    def __init__(
+        self,
+        llm: LLMClient,
+        prefilter: Optional[SupportFilter] = None,
+        retriever: Optional[PassageRetriever] = None,
+        batch_token_budget: Optional[int] = None,
+        batch_max_items: Optional[int] = None,
+    ):
         self.llm = llm
+        self.prefilter = prefilter or SupportFilter()
+        self.retriever = retriever or PassageRetriever()
+        self.batch_token_budget = batch_token_budget or int(
+            os.getenv("HALLUCINATION_BATCH_TOKEN_BUDGET", str(DEFAULT_BATCH_TOKEN_BUDGET))
+        )
+        self.batch_max_items = batch_max_items or int(
+            os.getenv("HALLUCINATION_BATCH_MAX_ITEMS", str(DEFAULT_BATCH_MAX_ITEMS))
+        )
         logger.info("HallucinationCheckerService initialized")
 
     def check(self, ground_truth: str, response: str) -> dict:
+        return self.check_with_prompt(ground_truth, response)[0]
+
+    def check_with_prompt(self, ground_truth: str, response: str) -> tuple:
+        """
+        (result, user prompt sent to the LLM, model that answered); prompt and model are
+        None when the pre-filter cleared the response.
+        """
         try:
             logger.info("Checking for hallucinations in response")
-            user_prompt = USER_PROMPT_TEMPLATE.format(
-                ground_truth=ground_truth,
-                response=response
-            )
-
-            # Check if the LLM client's generate method accepts response_schema parameter
-            # by inspecting its signature
-            generate_signature = inspect.signature(self.llm.generate)
-            params = list(generate_signature.parameters.keys())
-            
-            if 'response_schema' in params:
-                # Client supports schema parameter (e.g., GeminiClient)
-                logger.debug("Using LLM client with schema support")
-                raw_output = self.llm.generate(
-                    system_prompt=SYSTEM_PROMPT,
-                    user_prompt=user_prompt,
-                    response_schema=HALLUCINATION_RESULT_SCHEMA,
-                    response_type="application/json",
-                    temperature=0.0
-                )
-            else:
-                # Base interface - no schema support
-                logger.warning("LLM client doesn't support schema parameter, using base interface")
-                raw_output = self.llm.generate(
-                    system_prompt=SYSTEM_PROMPT,
-                    user_prompt=user_prompt
-                )
-
-            if "json" not in raw_output:
-                logger.error("Invalid response from LLM: missing 'json' key")
-                raise ValueError("Invalid response from LLM: missing 'json' key")
-
-            result = raw_output["json"]
-            logger.info(f"Hallucination check completed: has_hallucination={result.get('has_hallucination', False)}")
-            return result
+            claims = self._claims_to_check(ground_truth, response)
+            if claims is None:
+                return _supported_result(), None, None
+            user_prompt = self._claims_prompt(ground_truth, claims)
+            models = set()
+            result = self._check_prompt(user_prompt, models)
+            return result, user_prompt, ", ".join(sorted(models)) or None
         except Exception as e:
             logger.error(f"Error checking for hallucinations: {e}", exc_info=True)
             raise
+
+    def check_batch(self, ground_truth: str, responses: List[str], models: Optional[set] = None) -> List[dict]:
+        """
+        Check many responses against one ground truth.
+
+        Responses the local pre-filter cannot clear are packed into as few LLM calls as
+        fit the token budget (HALLUCINATION_BATCH_TOKEN_BUDGET, at most
+        HALLUCINATION_BATCH_MAX_ITEMS each), so the reference is sent once per batch,
+        narrowed to the passages that batch's claims need.
+        A batch whose output fails validation is re-checked one response at a time.
+        The models that answered are added to `models` when given.
+        """
+        try:
+            logger.info(f"Checking {len(responses)} responses for hallucinations")
+            results: List[Optional[dict]] = [None] * len(responses)
+            pending = []
+            for i, response in enumerate(responses):
+                claims = self._claims_to_check(ground_truth, response)
+                if claims is None:
+                    results[i] = _supported_result()
+                else:
+                    pending.append((i, claims))
+            if not pending:
+                return results
+
+            for reference, batch in self._pack(ground_truth, pending):
+                try:
+                    batch_results = self._check_packed(reference, [claims[0] for _, claims in batch], models)
+                except (ValueError, jsonschema.ValidationError) as e:
+                    logger.warning(f"Batch of {len(batch)} failed ({e}), falling back to single checks")
+                    batch_results = [self._check_claims(ground_truth, claims, models) for _, claims in batch]
+                for (i, _), result in zip(batch, batch_results):
+                    results[i] = result
+            return results
+        except Exception as e:
+            logger.error(f"Error checking batch for hallucinations: {e}", exc_info=True)
+            raise
+
+    def _claims_to_check(self, ground_truth: str, response: str):
+        """None when the pre-filter supports every sentence, else (text for the LLM, unsupported sentences)."""
+        unsupported, total = self.prefilter.unsupported_sentences(ground_truth, response)
+        if not unsupported:
+            logger.info(f"All {total} response sentences supported by the ground truth, skipping LLM call")
+            return None
+        if len(unsupported) < total:
+            # Only the sentences the local check could not confirm go to the LLM
+            logger.info(f"Sending {len(unsupported)} of {total} response sentences to the LLM")
+            return " ".join(unsupported), unsupported
+        return response, unsupported
+
+    def _check_claims(self, ground_truth: str, claims, models: Optional[set] = None) -> dict:
+        return self._check_prompt(self._claims_prompt(ground_truth, claims), models)
+
+    def _claims_prompt(self, ground_truth: str, claims) -> str:
+        response, unsupported = claims
+        # Long references are cut down to the passages relevant to the claims being checked
+        available = self.batch_token_budget - (len(USER_PROMPT_TEMPLATE) + len(SYSTEM_PROMPT) + len(response)) // CHARS_PER_TOKEN
+        return USER_PROMPT_TEMPLATE.format(
+            ground_truth=self._fit_reference(ground_truth, unsupported, available)[1],
+            response=response
+        )
+
+    def _check_prompt(self, user_prompt: str, models: Optional[set] = None) -> dict:
+        result = self._generate(user_prompt, HALLUCINATION_RESULT_SCHEMA, models)
+        logger.info(f"Hallucination check completed: has_hallucination={result.get('has_hallucination', False)}")
+        return result
+
+    def _pack(self, ground_truth: str, pending: list) -> List[tuple]:
+        """
+        Greedily group pending responses into (reference, batch) pairs. Each batch gets the
+        ground truth narrowed to its own claims, and the whole prompt, reference included,
+        stays within the token budget.
+        """
+        overhead = (len(BATCH_USER_PROMPT_TEMPLATE) + len(SYSTEM_PROMPT)) // CHARS_PER_TOKEN
+        batches, current, selected, reference, used = [], [], None, "", 0
+        for item in pending:
+            item_tokens = len(item[1][0]) // CHARS_PER_TOKEN + 10
+            if current and len(current) < self.batch_max_items:
+                item_selected = self.retriever.select(ground_truth, item[1][1])
+                merged = None if selected is None else selected | item_selected
+                merged_reference = self.retriever.render(ground_truth, merged)
+                if overhead + len(merged_reference) // CHARS_PER_TOKEN + used + item_tokens <= self.batch_token_budget:
+                    current.append(item)
+                    selected, reference, used = merged, merged_reference, used + item_tokens
+                    continue
+            if current:
+                batches.append((reference, current))
+            current, used = [item], item_tokens
+            selected, reference = self._fit_reference(ground_truth, item[1][1], self.batch_token_budget - overhead - used)
+        if current:
+            batches.append((reference, current))
+        logger.info(f"Packed {len(pending)} responses into {len(batches)} LLM call(s)")
+        return batches
+
+    def _fit_reference(self, ground_truth: str, claims: List[str], available_tokens: int) -> tuple:
+        """
+        (selected passages, reference) for `claims`, keeping fewer passages per claim when
+        the reference alone would not fit in `available_tokens`.
+        """
+        top_k = self.retriever.top_k
+        while True:
+            selected = self.retriever.select(ground_truth, claims, top_k)
+            reference = self.retriever.render(ground_truth, selected)
+            if len(reference) // CHARS_PER_TOKEN <= available_tokens or selected is None or top_k == 1:
+                break
+            top_k -= 1
+        if len(reference) // CHARS_PER_TOKEN > available_tokens:
+            logger.warning(f"Reference of {len(reference)} characters exceeds the token budget "
+                           f"({available_tokens} tokens left); sending it anyway")
+        elif top_k < self.retriever.top_k:
+            logger.info(f"Kept {top_k} passages per claim to fit the reference in the token budget")
+        return selected, reference
+
+    def _check_packed(self, reference: str, responses: List[str], models: Optional[set] = None) -> List[dict]:
+        user_prompt = BATCH_USER_PROMPT_TEMPLATE.format(
+            ground_truth=reference,
+            responses="\n\n".join(f"[{i}] {response}" for i, response in enumerate(responses)),
+        )
+        output = self._generate(user_prompt, HALLUCINATION_BATCH_RESULT_SCHEMA, models)
+        _batch_result_validator.validate(output)
+        by_index = {item["index"]: item for item in output["results"]}
+        if sorted(by_index) != list(range(len(responses))):
+            raise ValueError(f"Batch output has indices {sorted(by_index)}, expected 0..{len(responses) - 1}")
+        return [
+            {key: value for key, value in by_index[i].items() if key != "index"}
+            for i in range(len(responses))
+        ]
+
+    def _generate(self, user_prompt: str, response_schema: dict, models: Optional[set] = None) -> dict:
+        # Check if the LLM client's generate method accepts response_schema parameter
+        # by inspecting its signature
+        generate_signature = inspect.signature(self.llm.generate)
+        params = list(generate_signature.parameters.keys())
+
+        if 'response_schema' in params:
+            # Client supports schema parameter (e.g., GeminiClient)
+            logger.debug("Using LLM client with schema support")
+            raw_output = self.llm.generate(
+                system_prompt=SYSTEM_PROMPT,
+                user_prompt=user_prompt,
+                response_schema=response_schema,
+                response_type="application/json",
+                temperature=0.0
+            )
+        else:
+            # Base interface - no schema support
+            logger.warning("LLM client doesn't support schema parameter, using base interface")
+            raw_output = self.llm.generate(
+                system_prompt=SYSTEM_PROMPT,
+                user_prompt=user_prompt
+            )
+
+        if "json" not in raw_output:
+            logger.error("Invalid response from LLM: missing 'json' key")
+            raise ValueError("Invalid response from LLM: missing 'json' key")
+        if models is not None and raw_output.get("model"):
+            models.add(raw_output["model"])
+        return raw_output["json"]
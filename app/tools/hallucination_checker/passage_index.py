@@ -0,0 +1,131 @@
+import hashlib
+import math
+import os
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from .support_filter import split_sentences, word_tokens
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_SENTENCES = 3
+DEFAULT_WINDOW_STRIDE = 2
+DEFAULT_TOP_K = 3
+DEFAULT_MIN_CHARS = 4000
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_index_cache: "OrderedDict[str, PassageIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+class PassageIndex:
+    """BM25 index over overlapping windows of consecutive ground-truth sentences."""
+
+    def __init__(self, text: str, window: int = DEFAULT_WINDOW_SENTENCES, stride: int = DEFAULT_WINDOW_STRIDE):
+        self.sentences = split_sentences(text)
+        starts = list(range(0, max(len(self.sentences) - window, 0) + 1, stride))
+        if starts[-1] + window < len(self.sentences):
+            starts.append(len(self.sentences) - window)
+        self.spans: List[Tuple[int, int]] = [(i, min(i + window, len(self.sentences))) for i in starts]
+        self.passages: List[str] = [" ".join(self.sentences[i:j]) for i, j in self.spans]
+
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = []
+        for passage_id, passage in enumerate(self.passages):
+            counts = Counter(word_tokens(passage))
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self._postings.setdefault(term, []).append((passage_id, tf))
+        self._lengths = lengths
+        self._avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        n = len(self.passages)
+        self._idf = {
+            term: math.log((n - len(postings) + 0.5) / (len(postings) + 0.5) + 1.0)
+            for term, postings in self._postings.items()
+        }
+
+    def search(self, query: str, top_k: int) -> List[int]:
+        """Ids of the `top_k` highest-scoring passages with any term in common with `query`."""
+        scores: Dict[int, float] = {}
+        for term in set(word_tokens(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for passage_id, tf in self._postings[term]:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[passage_id] / self._avg_length)
+                scores[passage_id] = scores.get(passage_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return sorted(scores, key=scores.get, reverse=True)[:top_k]
+
+
+def get_passage_index(ground_truth: str) -> PassageIndex:
+    """Build (or reuse) the index for a ground truth, cached by its SHA-256 (HALLUCINATION_PASSAGE_CACHE_SIZE)."""
+    key = hashlib.sha256(ground_truth.encode("utf-8")).hexdigest()
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+    index = PassageIndex(ground_truth)
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > int(os.getenv("HALLUCINATION_PASSAGE_CACHE_SIZE", "64")):
+            _index_cache.popitem(last=False)
+    logger.debug(f"Indexed ground truth into {len(index.passages)} passages")
+    return index
+
+
+class PassageRetriever:
+    """
+    Narrows long ground truths to the passages relevant to the response.
+
+    Ground truths shorter than `min_chars` (HALLUCINATION_RETRIEVAL_MIN_CHARS) are used
+    as-is. Longer ones are indexed once, and for every response claim the `top_k`
+    (HALLUCINATION_RETRIEVAL_TOP_K) best BM25 passages are kept, in document order.
+    """
+
+    def __init__(self, top_k: Optional[int] = None, min_chars: Optional[int] = None):
+        self.top_k = top_k or int(os.getenv("HALLUCINATION_RETRIEVAL_TOP_K", str(DEFAULT_TOP_K)))
+        if min_chars is None:
+            min_chars = int(os.getenv("HALLUCINATION_RETRIEVAL_MIN_CHARS", str(DEFAULT_MIN_CHARS)))
+        self.min_chars = min_chars
+
+    def narrow(self, ground_truth: str, claims: List[str], top_k: Optional[int] = None) -> str:
+        selected = self.select(ground_truth, claims, top_k)
+        narrowed = self.render(ground_truth, selected)
+        if selected is not None:
+            logger.info(
+                f"Narrowed ground truth from {len(ground_truth)} to {len(narrowed)} characters "
+                f"({len(selected)} of {len(get_passage_index(ground_truth).passages)} passages)"
+            )
+        return narrowed
+
+    def select(self, ground_truth: str, claims: List[str], top_k: Optional[int] = None) -> Optional[Set[int]]:
+        """Ids of the passages kept for `claims`; None when the ground truth is short enough to use whole."""
+        if len(ground_truth) < self.min_chars:
+            return None
+        top_k = top_k or self.top_k
+        index = get_passage_index(ground_truth)
+        selected = set()
+        for claim in claims:
+            selected.update(index.search(claim, top_k))
+        if not selected:
+            # Nothing in the reference matches any claim; still give the LLM some context
+            selected = set(range(min(top_k, len(index.passages))))
+        return selected
+
+    def render(self, ground_truth: str, selected: Optional[Set[int]]) -> str:
+        """The reference text for passages chosen by `select`, in document order."""
+        if selected is None:
+            return ground_truth
+        index = get_passage_index(ground_truth)
+        # Overlapping windows are merged back into runs of consecutive sentences
+        sentence_ids = sorted({i for p in selected for i in range(*index.spans[p])})
+        runs: List[List[str]] = []
+        for position, sentence_id in enumerate(sentence_ids):
+            if position == 0 or sentence_id != sentence_ids[position - 1] + 1:
+                runs.append([])
+            runs[-1].append(index.sentences[sentence_id])
+        return "\n...\n".join(" ".join(run) for run in runs)
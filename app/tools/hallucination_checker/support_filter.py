@@ -0,0 +1,110 @@
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUPPORT_THRESHOLD = 0.9
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"\w+")
+
+_stats = {"checks": 0, "llm_calls_avoided": 0, "sentences": 0, "sentences_sent_to_llm": 0}
+_stats_lock = threading.Lock()
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+def word_tokens(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+class _ReferenceIndex:
+    """Ground-truth sentences as word lists, with the positions of every word bigram in them."""
+
+    def __init__(self, ground_truth: str):
+        self.sentences = [word_tokens(sentence) for sentence in split_sentences(ground_truth)]
+        self.words = {word for words in self.sentences for word in words}
+        self.bigrams: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        for sentence_id, words in enumerate(self.sentences):
+            for position, bigram in enumerate(zip(words, words[1:])):
+                self.bigrams.setdefault(bigram, []).append((sentence_id, position))
+
+    def longest_run(self, words: List[str]) -> int:
+        """Length of the longest run of `words` found contiguously in one ground-truth sentence."""
+        if len(words) == 1:
+            return 1 if words[0] in self.words else 0
+        best = 0
+        for i in range(len(words) - 1):
+            if len(words) - i <= best:
+                break
+            for sentence_id, position in self.bigrams.get((words[i], words[i + 1]), ()):
+                reference = self.sentences[sentence_id]
+                run = 2
+                while (i + run < len(words) and position + run < len(reference)
+                       and words[i + run] == reference[position + run]):
+                    run += 1
+                best = max(best, run)
+        return best
+
+
+@lru_cache(maxsize=256)
+def _reference_index(ground_truth: str) -> _ReferenceIndex:
+    return _ReferenceIndex(ground_truth)
+
+
+def support_score(sentence: str, ground_truth: str) -> float:
+    """
+    Share of the sentence's words covered by its longest run found verbatim in a single
+    ground-truth sentence. Changed numbers, names or negations break the run, and so
+    does stitching true pieces of different sentences together ("Paris is the capital
+    of Germany"), so only near-verbatim sentences score close to 1.0.
+    """
+    words = word_tokens(sentence)
+    if not words:
+        return 1.0
+    return _reference_index(ground_truth).longest_run(words) / len(words)
+
+
+class SupportFilter:
+    """
+    Local pre-check run before the LLM: response sentences whose support score reaches
+    `threshold` (HALLUCINATION_PREFILTER_THRESHOLD) are treated as supported, so only
+    the remaining sentences need to be checked by the LLM.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, enabled: Optional[bool] = None):
+        if threshold is None:
+            threshold = float(os.getenv("HALLUCINATION_PREFILTER_THRESHOLD", str(DEFAULT_SUPPORT_THRESHOLD)))
+        if enabled is None:
+            enabled = os.getenv("HALLUCINATION_PREFILTER", "true").lower() in ("1", "true", "yes")
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("HALLUCINATION_PREFILTER_THRESHOLD must be in (0, 1]")
+        self.threshold = threshold
+        self.enabled = enabled
+
+    def unsupported_sentences(self, ground_truth: str, response: str) -> Tuple[List[str], int]:
+        """Return (sentences that still need an LLM check, total number of sentences)."""
+        sentences = split_sentences(response)
+        if not self.enabled:
+            unsupported = sentences
+        else:
+            unsupported = [s for s in sentences if support_score(s, ground_truth) < self.threshold]
+        with _stats_lock:
+            _stats["checks"] += 1
+            _stats["sentences"] += len(sentences)
+            _stats["sentences_sent_to_llm"] += len(unsupported)
+            if not unsupported:
+                _stats["llm_calls_avoided"] += 1
+        logger.debug(f"Pre-filter: {len(sentences) - len(unsupported)}/{len(sentences)} sentences supported locally")
+        return unsupported, len(sentences)
+
+
+def get_prefilter_stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,98 @@
+"""
+Long-lived tool instances for the MCP servers.
+
+Each server builds its tools once, instead of per request, and warms them up in the
+background when it starts (see `start`). The server reports ready only when warm-up
+has finished. Tools must therefore be safe to share between concurrent requests:
+per-call state lives in locals, not on the instance.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ToolRegistry:
+    def __init__(self, server: str, factories: Dict[str, Callable[[], Any]],
+                 warmups: Optional[Dict[str, Callable[["ToolRegistry"], Any]]] = None):
+        """
+        `factories` maps a tool name to a callable creating the tool. `warmups` maps a step
+        name to a callable that receives the registry and loads whatever the tools would
+        otherwise load on their first request (models, language profiles, HTTP pools).
+        """
+        self.server = server
+        self.factories = factories
+        self.warmups = warmups or {}
+        self._tools: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._warmup_results: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, name: str) -> Any:
+        """The shared instance of tool `name`, created on first use. Creation errors are raised."""
+        tool = self._tools.get(name)
+        if tool is not None:
+            return tool
+        with self._lock:
+            if name not in self._tools:
+                try:
+                    self._tools[name] = self.factories[name]()
+                    self._errors.pop(name, None)
+                except Exception as e:
+                    # Not remembered: the next request tries again, e.g. once configuration is fixed
+                    self._errors[name] = str(e)
+                    logger.error(f"{self.server}: could not create tool {name}: {e}", exc_info=True)
+                    raise
+            return self._tools[name]
+
+    def build(self) -> None:
+        """Create every tool; tools that fail are reported in status() and retried on use."""
+        for name in self.factories:
+            try:
+                self.get(name)
+            except Exception:
+                pass
+
+    def warm(self) -> None:
+        """Build the tools, run every warm-up step and mark the registry ready."""
+        started = time.perf_counter()
+        self.build()
+        for name, warmup in self.warmups.items():
+            step_started = time.perf_counter()
+            result = {"seconds": 0.0, "error": None}
+            try:
+                warmup(self)
+            except Exception as e:
+                result["error"] = str(e)
+                logger.warning(f"{self.server}: warm-up step {name} failed: {e}")
+            result["seconds"] = round(time.perf_counter() - step_started, 3)
+            self._warmup_results[name] = result
+        self._ready.set()
+        logger.info(f"{self.server}: {len(self._tools)}/{len(self.factories)} tools built and warm "
+                    f"in {time.perf_counter() - started:.2f}s")
+
+    def start(self) -> asyncio.Task:
+        """Warm up in a worker thread so the event loop keeps serving (e.g. the readiness check)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(asyncio.to_thread(self.warm))
+        return self._task
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def status(self) -> dict:
+        with self._lock:
+            tools = {name: "ready" if name in self._tools else f"error: {self._errors[name]}"
+                     if name in self._errors else "pending" for name in self.factories}
+        return {
+            "server": self.server,
+            "ready": self.ready,
+            "tools": tools,
+            "warmups": dict(self._warmup_results),
+        }
@@ -16,16 +16,13 @@ class SummarizePDFService:
     """
     Orchestrates PDF extraction, chunking, and summarization.
     Yields streaming summary events for each chunk and a final summary event.
+    Safe to share between concurrent requests: per-document state is kept in locals.
     """
 
     def __init__(self):
         self.pdf_extractor = ExtractPDFTextTool()
         self.language_detector = DetectLanguageTool()
         self.summarizer = SummarizeTextTool()
-        self.chunker = None
-        self.document_length = 0
-        self.summary_length = 0
-        self.processing_time = 0
         logger.info("SummarizePDFService initialized")
         
 
@@ -62,16 +59,16 @@ class SummarizePDFService:
             lang = self.language_detector.run(extracted["text"])["language"]
             chunk_size = decide_chunk_size(lang)
             logger.info(f"Language detected: {lang}, chunk size: {chunk_size}")
-            self.chunker = Chunker(chunk_size=chunk_size)
+            chunker = Chunker(chunk_size=chunk_size)
 
             chunk_summaries: List[str] = []
-            self.document_length = 0
-            self.summary_length = 0
-            self.processing_time = 0
+            document_length = 0
+            summary_length = 0
+            processing_time = 0
 
             # Process chunks
             for index, chunk in enumerate(
-                self.chunker.chunk_text_with_overlap(text=extracted["text"], overlap=50), start=1
+                chunker.chunk_text_with_overlap(text=extracted["text"], overlap=50), start=1
             ):
                 try:
                     logger.info(f"Processing chunk {index}")
@@ -80,9 +77,9 @@ class SummarizePDFService:
                     chunk_summary = summary_result["summary"].strip()
                     chunk_summaries.append(chunk_summary)
                     metadata = summary_result.get("metadata", {})
-                    self.summary_length += metadata.get("summary_length", 0)
-                    self.document_length += metadata.get("document_length", 0)
-                    self.processing_time += metadata.get("processing_time", 0)
+                    summary_length += metadata.get("summary_length", 0)
+                    document_length += metadata.get("document_length", 0)
+                    processing_time += metadata.get("processing_time", 0)
 
                     logger.debug(f"Chunk {index} summarized: {len(chunk_summary)} characters")
                     # streaming chunk-level result
@@ -103,9 +100,9 @@ class SummarizePDFService:
                     "pages": extracted["pages"],
                     "chunks": len(chunk_summaries),
                     "language": lang,
-                    "document_length": self.document_length,
-                    "summary_length": self.summary_length,
-                    "processing_time": self.processing_time,
+                    "document_length": document_length,
+                    "summary_length": summary_length,
+                    "processing_time": processing_time,
                 },
             }
         except Exception as e:
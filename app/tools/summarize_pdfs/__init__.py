@@ -0,0 +1,4 @@
+from .summarize_pdfs import SummarizePDFsTool
+from .summarize_pdfs_schema import SUMMARIZE_PDFS_ARGS_SCHEMA
+
+__all__ = ["SummarizePDFsTool", "SUMMARIZE_PDFS_ARGS_SCHEMA"]
@@ -0,0 +1,30 @@
+from typing import Iterator, Dict, List
+from .summarize_pdfs_service import SummarizePDFsService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SummarizePDFsTool:
+    name = "summarize_pdfs"
+    description = (
+        "Summarizes a batch of PDF files from local paths or HTTP URLs. "
+        "Streams each document's summary as soon as it is ready, followed by aggregate throughput."
+    )
+
+    def __init__(self, service: SummarizePDFsService = None):
+        self.service = service or SummarizePDFsService()
+        logger.info("SummarizePDFsTool initialized")
+
+    def run(self, pdf_paths_or_urls: List[str]) -> Iterator[Dict]:
+        try:
+            logger.info(f"Starting batch PDF summarization for {len(pdf_paths_or_urls)} documents")
+            event_count = 0
+            for event in self.service.summarize(pdf_paths_or_urls):
+                event_count += 1
+                logger.debug(f"Yielding batch summarization event {event_count}")
+                yield event
+            logger.info(f"Batch PDF summarization completed: {event_count} events yielded")
+        except Exception as e:
+            logger.error(f"Error summarizing PDFs: {e}", exc_info=True)
+            raise
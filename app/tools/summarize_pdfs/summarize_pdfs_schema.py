@@ -0,0 +1,50 @@
+# JSON Schema definitions for summarize_pdfs tool
+
+SUMMARIZE_PDFS_ARGS_SCHEMA = {
+    "type": "object",
+    "required": ["file_paths"],
+    "properties": {
+        "file_paths": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "string"
+            },
+            "description": "Local file paths or HTTP URLs of the PDF files to summarize"
+        }
+    }
+}
+
+SUMMARIZE_PDFS_STREAM_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "document": {
+            "type": "integer",
+            "description": "Position of the document in the requested list"
+        },
+        "source": {
+            "type": "string",
+            "description": "Path or URL of the document"
+        },
+        "status": {
+            "type": "string",
+            "enum": ["completed", "failed"]
+        },
+        "final_summary": {
+            "type": "string",
+            "description": "Complete summary of the document"
+        },
+        "error": {
+            "type": "string",
+            "description": "Error message when the document could not be summarized"
+        },
+        "metadata": {
+            "type": "object",
+            "description": "Per-document metadata"
+        },
+        "throughput": {
+            "type": "object",
+            "description": "Aggregate statistics for the whole batch, sent as the last event"
+        }
+    }
+}
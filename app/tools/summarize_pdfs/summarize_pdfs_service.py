@@ -0,0 +1,233 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..extract_pdf_text import ExtractPDFTextTool
+from ..summarize_text import SummarizeTextTool
+from ..detect_language import DetectLanguageTool
+from app.utils import Chunker, decide_chunk_size
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_CONCURRENCY = 4
+
+# One extractor per worker process, created lazily on the first document it handles.
+_process_extractor: Optional[ExtractPDFTextTool] = None
+
+
+def _extract_document(source: str) -> dict:
+    """Process-pool entry point: extracts the text of one PDF."""
+    global _process_extractor
+    if _process_extractor is None:
+        _process_extractor = ExtractPDFTextTool()
+    return _process_extractor.run(source)
+
+
+class SummarizePDFsService:
+    """
+    Summarizes many PDFs with global scheduling across documents.
+
+    Text extraction for every document runs on one shared process pool, and every
+    chunk summarization runs on one shared, concurrency-limited LLM pool, so both
+    CPU and LLM quota stay busy regardless of how chunks are spread over documents.
+    Yields one event per document as soon as it completes, then a throughput event.
+
+    Both pools are started on first use and kept for the service's lifetime, shared by
+    concurrent calls, so the LLM concurrency limit holds across them too. Extraction
+    workers are spawned, not forked, because the servers run an event loop and
+    other threads that a forked child would inherit.
+    """
+
+    def __init__(
+        self,
+        max_extraction_workers: Optional[int] = None,
+        max_llm_concurrency: Optional[int] = None,
+        summarizer: Optional[SummarizeTextTool] = None,
+        language_detector: Optional[DetectLanguageTool] = None,
+    ):
+        self.max_extraction_workers = max_extraction_workers or int(
+            os.getenv("SUMMARIZE_PDFS_EXTRACTION_WORKERS", os.cpu_count() or 1)
+        )
+        self.max_llm_concurrency = max_llm_concurrency or int(
+            os.getenv("SUMMARIZE_PDFS_LLM_CONCURRENCY", DEFAULT_LLM_CONCURRENCY)
+        )
+        self.summarizer = summarizer or SummarizeTextTool()
+        self.language_detector = language_detector or DetectLanguageTool()
+        self._extraction_pool: Optional[ProcessPoolExecutor] = None
+        self._llm_pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        logger.info(
+            f"SummarizePDFsService initialized (extraction_workers={self.max_extraction_workers}, "
+            f"llm_concurrency={self.max_llm_concurrency})"
+        )
+
+    def summarize(self, sources: List[str]) -> Iterator[dict]:
+        if not sources:
+            logger.error("Cannot summarize: no PDF sources given")
+            raise ValueError("At least one PDF source is required")
+
+        logger.info(f"Starting batch PDF summarization for {len(sources)} documents")
+        started = time.perf_counter()
+        extraction_pool = self._extraction_workers()
+        llm_pool = self._llm_workers()
+
+        # future -> (document index, chunk index); chunk index is None for extraction futures
+        pending: Dict[Future, Tuple[int, Optional[int]]] = {}
+        documents: Dict[int, dict] = {}
+        totals = {"completed": 0, "failed": 0, "pages": 0, "chunks": 0}
+
+        try:
+            for index, source in enumerate(sources):
+                documents[index] = {"source": source, "failed": False}
+                pending[extraction_pool.submit(_extract_document, source)] = (index, None)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, chunk_index = pending.pop(future)
+                    document = documents[index]
+                    if document["failed"]:
+                        continue
+
+                    try:
+                        if chunk_index is None:
+                            event = self._on_extracted(index, document, future.result(), llm_pool, pending)
+                        else:
+                            event = self._on_chunk_summarized(index, chunk_index, document, future.result())
+                    except Exception as e:
+                        logger.error(f"Error summarizing document {index} ({document['source']}): {e}", exc_info=True)
+                        document["failed"] = True
+                        self._cancel_document(index, pending)
+                        event = {"document": index, "source": document["source"], "status": "failed", "error": str(e)}
+
+                    if event is None:
+                        continue
+                    if event["status"] == "completed":
+                        totals["completed"] += 1
+                        totals["pages"] += event["metadata"]["pages"]
+                        totals["chunks"] += event["metadata"]["chunks"]
+                    else:
+                        totals["failed"] += 1
+                    documents[index] = {"source": document["source"], "failed": document["failed"]}
+                    yield event
+        finally:
+            # Work this call no longer needs (e.g. the caller stopped early); the pools are shared
+            for future in pending:
+                future.cancel()
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Batch PDF summarization completed: {totals['completed']} succeeded, "
+            f"{totals['failed']} failed in {elapsed:.2f}s"
+        )
+        yield {
+            "throughput": {
+                "documents": len(sources),
+                "completed": totals["completed"],
+                "failed": totals["failed"],
+                "pages": totals["pages"],
+                "chunks": totals["chunks"],
+                "elapsed_seconds": elapsed,
+                "documents_per_second": len(sources) / elapsed if elapsed else 0.0,
+                "pages_per_second": totals["pages"] / elapsed if elapsed else 0.0,
+            }
+        }
+
+    def _extraction_workers(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._extraction_pool is None:
+                self._extraction_pool = ProcessPoolExecutor(
+                    max_workers=self.max_extraction_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info(f"Started {self.max_extraction_workers} PDF extraction worker processes")
+            return self._extraction_pool
+
+    def _llm_workers(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._llm_pool is None:
+                self._llm_pool = ThreadPoolExecutor(
+                    max_workers=self.max_llm_concurrency, thread_name_prefix="summarize-pdfs-llm"
+                )
+            return self._llm_pool
+
+    def shutdown(self) -> None:
+        """Stop the extraction worker processes and LLM threads, e.g. on server shutdown."""
+        with self._pool_lock:
+            if self._extraction_pool is not None:
+                self._extraction_pool.shutdown(wait=False, cancel_futures=True)
+                self._extraction_pool = None
+            if self._llm_pool is not None:
+                self._llm_pool.shutdown(wait=False, cancel_futures=True)
+                self._llm_pool = None
+
+    def _on_extracted(self, index: int, document: dict, extracted: dict, llm_pool, pending) -> Optional[dict]:
+        if not extracted.get("success"):
+            raise ValueError(f"PDF extraction failed: {extracted.get('error', 'Unknown error')}")
+
+        document["pages"] = extracted.get("pages", 0)
+        if not extracted.get("text"):
+            logger.warning(f"Document {index} contains no text to summarize")
+            return self._document_event(index, document, [], None)
+
+        lang = self.language_detector.run(extracted["text"])["language"]
+        chunker = Chunker(chunk_size=decide_chunk_size(lang))
+        chunks = list(chunker.chunk_text_with_overlap(text=extracted["text"], overlap=50))
+        logger.info(f"Document {index} extracted: {document['pages']} pages, {len(chunks)} chunks, language={lang}")
+
+        document.update(
+            language=lang,
+            summaries=[None] * len(chunks),
+            remaining=len(chunks),
+            document_length=0,
+            summary_length=0,
+            processing_time=0,
+        )
+        for chunk_index, chunk in enumerate(chunks):
+            pending[llm_pool.submit(self.summarizer.run, chunk)] = (index, chunk_index)
+        return None
+
+    def _on_chunk_summarized(self, index: int, chunk_index: int, document: dict, summary_result: dict) -> Optional[dict]:
+        if "error" in summary_result:
+            raise ValueError(f"Chunk {chunk_index + 1} summarization failed: {summary_result['error']}")
+
+        document["summaries"][chunk_index] = summary_result["summary"].strip()
+        metadata = summary_result.get("metadata", {})
+        document["summary_length"] += metadata.get("summary_length", 0)
+        document["document_length"] += metadata.get("document_length", 0)
+        document["processing_time"] += metadata.get("processing_time", 0)
+        document["remaining"] -= 1
+        logger.debug(f"Document {index} chunk {chunk_index + 1} summarized, {document['remaining']} remaining")
+
+        if document["remaining"]:
+            return None
+        return self._document_event(index, document, document["summaries"], document["language"])
+
+    @staticmethod
+    def _document_event(index: int, document: dict, summaries: List[str], lang: Optional[str]) -> dict:
+        return {
+            "document": index,
+            "source": document["source"],
+            "status": "completed",
+            "final_summary": "\n".join(summaries),
+            "metadata": {
+                "pages": document.get("pages", 0),
+                "chunks": len(summaries),
+                "language": lang,
+                "document_length": document.get("document_length", 0),
+                "summary_length": document.get("summary_length", 0),
+                "processing_time": document.get("processing_time", 0),
+            },
+        }
+
+    @staticmethod
+    def _cancel_document(index: int, pending: Dict[Future, Tuple[int, Optional[int]]]) -> None:
+        for future, (doc_index, _) in list(pending.items()):
+            if doc_index == index and future.cancel():
+                del pending[future]
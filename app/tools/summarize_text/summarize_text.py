@@ -4,27 +4,34 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from .summarize_text_service import SummarizationService
 from .summarize_text_schema import SUMMARIZE_TEXT_OUTPUT_SCHEMA
-from app.llm.gemini_client import GeminiClient
+from app.llm import LLMClient, ModelRouter
 from .summarize_text_prompt import SYSTEM_SUMMARIZATION_PROMPT
+from app.utils import get_text_store
+from app.utils import compile_schema
 import logging
-import jsonschema
 
 logger = logging.getLogger(__name__)
 
+_output_validator = compile_schema("summarize_text.output", SUMMARIZE_TEXT_OUTPUT_SCHEMA)
+
 class SummarizeTextTool:
     name = "summarize_text"
     description = (
         "Summarizes a given text using an LLM. "
-        "Returns a summary along with prompt and metadata information."
+        "Returns a summary along with prompt and metadata information. "
+        "Accepts the text inline or as a text_uri returned by extract_pdf_text."
     )
     
-    def __init__(self, system_prompt: str = SYSTEM_SUMMARIZATION_PROMPT):
-        llm_client = GeminiClient()
+    def __init__(self, system_prompt: str = SYSTEM_SUMMARIZATION_PROMPT, llm_client: LLMClient = None):
+        llm_client = llm_client or ModelRouter(task="summarize")
         self.service = SummarizationService(llm_client, system_prompt)
         logger.info("SummarizeTextTool initialized")
 
-    def run(self, text: str) -> dict:
+    def run(self, text: str = None, text_uri: str = None) -> dict:
         try:
+            if text_uri:
+                logger.info(f"Resolving text reference: {text_uri}")
+                text = get_text_store().get(text_uri)
             logger.info(f"Starting text summarization (text length: {len(text) if text else 0})")
             raw = self.service.summarize(text)
 
@@ -39,11 +46,7 @@ class SummarizeTextTool:
             result = raw["json"]
             
             # Validate output against JSON schema
-            try:
-                jsonschema.validate(instance=result, schema=SUMMARIZE_TEXT_OUTPUT_SCHEMA)
-            except jsonschema.ValidationError as e:
-                logger.error(f"Output validation failed: {e.message}")
-                raise ValueError(f"Invalid output data: {e.message}")
+            _output_validator.validate_output(result)
             
             logger.info(f"Text summarization completed: {len(result.get('summary', ''))} characters")
             return result
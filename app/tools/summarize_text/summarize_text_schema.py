@@ -2,11 +2,18 @@
 
 SUMMARIZE_TEXT_ARGS_SCHEMA = {
     "type": "object",
-    "required": ["text"],
+    "anyOf": [
+        {"required": ["text"]},
+        {"required": ["text_uri"]}
+    ],
     "properties": {
         "text": {
             "type": "string",
             "description": "The text to summarize"
+        },
+        "text_uri": {
+            "type": "string",
+            "description": "Reference (text://documents/...) to a text stored server-side, e.g. by extract_pdf_text"
         }
     }
 }
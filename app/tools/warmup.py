@@ -0,0 +1,40 @@
+"""
+Warm-up steps for ToolRegistry: load what tools would otherwise load on their first
+request, so the first call after a deploy is as fast as the rest.
+"""
+import os
+from app.llm import ModelRouter
+from app.tools.evaluate_llm.metrics import get_default_tfidf_model
+from app.utils import get_http_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TEXT = "The quick brown fox jumps over the lazy dog."
+
+
+def load_language_profiles(registry) -> None:
+    """langdetect reads its ~50 language profiles from disk on the first detection."""
+    registry.get("detect_language").run(WARMUP_TEXT)
+
+
+def run_tiny_evaluation(registry) -> None:
+    """Imports scikit-learn and SciPy and loads the TF-IDF model through one small evaluation."""
+    registry.get("evaluate_llm_responses").run({"ground_truth": WARMUP_TEXT, "response": WARMUP_TEXT})
+    if get_default_tfidf_model() is not None:
+        logger.info("Cosine similarity uses the corpus-fitted TF-IDF model")
+
+
+def open_http_pool(registry) -> None:
+    get_http_client()
+
+
+def ping_llm(registry) -> None:
+    """
+    One tiny LLM request, which creates the client and its connection ahead of the first
+    real call. Off unless WARMUP_LLM_PING is set, since it costs a request per start.
+    """
+    if os.getenv("WARMUP_LLM_PING", "false").lower() not in ("1", "true", "yes"):
+        return
+    ModelRouter(task="warmup").generate("Reply with the single word OK.", "ping")
+    logger.info("LLM ping succeeded")
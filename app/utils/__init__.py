@@ -1,4 +1,36 @@
 from .chunker import Chunker
 from .lang_chunking import decide_chunk_size
+from .text_store import TextStore, get_text_store, TEXT_URI_PREFIX
+from .schema_validation import SchemaValidator, compile_schema, get_validation_stats, merge_validation_stats
+from .ttl_cache import TTLCache, get_cache_stats
+from .single_flight import SingleFlight, AsyncSingleFlight, get_single_flight_stats
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker, get_circuit_breaker_stats
+from .count_min_sketch import DecayingCountMinSketch
+from .cache_warmer import CacheWarmer
+from .http_client import get_http_client, get_async_client, host_semaphore
 
-__all__ = ["Chunker", "decide_chunk_size"]
\ No newline at end of file
+__all__ = [
+    "Chunker",
+    "decide_chunk_size",
+    "TextStore",
+    "get_text_store",
+    "TEXT_URI_PREFIX",
+    "SchemaValidator",
+    "compile_schema",
+    "get_validation_stats",
+    "merge_validation_stats",
+    "TTLCache",
+    "get_cache_stats",
+    "SingleFlight",
+    "AsyncSingleFlight",
+    "get_single_flight_stats",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "get_circuit_breaker",
+    "get_circuit_breaker_stats",
+    "DecayingCountMinSketch",
+    "CacheWarmer",
+    "get_http_client",
+    "get_async_client",
+    "host_semaphore",
+]
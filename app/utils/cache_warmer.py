@@ -0,0 +1,155 @@
+"""
+Background refresh of popular cache entries before they expire.
+
+The warmer counts lookups per key of each watched TTLCache in a
+DecayingCountMinSketch. Every `interval_seconds` it takes the `top_n` most requested
+keys of each cache and reloads those whose value expires within `lead_seconds`, most
+requested first, so hot keys never reach a miss or a stale answer. Keys requested fewer
+than `min_count` times (decayed) are left alone, as are values that have already
+expired; the next lookup reloads those as usual. At most `max_calls_per_minute`
+reloads (upstream calls) are made across all caches.
+
+Configuration: CACHE_WARMER_INTERVAL_SECONDS, CACHE_WARMER_TOP_N,
+CACHE_WARMER_LEAD_SECONDS, CACHE_WARMER_MAX_CALLS_PER_MINUTE,
+CACHE_WARMER_HALF_LIFE_SECONDS and CACHE_WARMER_MIN_COUNT.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+from .count_min_sketch import DecayingCountMinSketch
+from .ttl_cache import TTLCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 30.0
+DEFAULT_TOP_N = 50
+DEFAULT_LEAD_SECONDS = 60.0
+DEFAULT_MAX_CALLS_PER_MINUTE = 30
+DEFAULT_HALF_LIFE_SECONDS = 600.0
+DEFAULT_MIN_COUNT = 2.0
+
+
+class _Target:
+    __slots__ = ("cache", "refresh", "sketch")
+
+    def __init__(self, cache: TTLCache, refresh: Callable[[Hashable], Awaitable[None]],
+                 sketch: DecayingCountMinSketch):
+        self.cache = cache
+        self.refresh = refresh
+        self.sketch = sketch
+
+
+class CacheWarmer:
+    def __init__(self, interval_seconds: Optional[float] = None, top_n: Optional[int] = None,
+                 lead_seconds: Optional[float] = None, max_calls_per_minute: Optional[int] = None,
+                 half_life_seconds: Optional[float] = None, min_count: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        def setting(value, env: str, default):
+            return value if value is not None else type(default)(os.getenv(env, str(default)))
+
+        self.interval_seconds = setting(interval_seconds, "CACHE_WARMER_INTERVAL_SECONDS", DEFAULT_INTERVAL_SECONDS)
+        self.top_n = setting(top_n, "CACHE_WARMER_TOP_N", DEFAULT_TOP_N)
+        self.lead_seconds = setting(lead_seconds, "CACHE_WARMER_LEAD_SECONDS", DEFAULT_LEAD_SECONDS)
+        self.max_calls_per_minute = setting(max_calls_per_minute, "CACHE_WARMER_MAX_CALLS_PER_MINUTE",
+                                            DEFAULT_MAX_CALLS_PER_MINUTE)
+        self.half_life_seconds = setting(half_life_seconds, "CACHE_WARMER_HALF_LIFE_SECONDS",
+                                         DEFAULT_HALF_LIFE_SECONDS)
+        self.min_count = setting(min_count, "CACHE_WARMER_MIN_COUNT", DEFAULT_MIN_COUNT)
+        self.clock = clock
+        self._targets: Dict[str, _Target] = {}
+        # Start times of upstream calls made in the last minute
+        self._calls: deque = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"runs": 0, "refreshes": 0, "errors": 0, "over_budget": 0}
+
+    def watch(self, cache: TTLCache, refresh: Callable[[Hashable], Awaitable[None]]) -> None:
+        """
+        Track lookups on `cache` and keep its popular keys warm. `refresh(key)` reloads
+        one key, normally through `cache.refresh_async`, with one upstream call.
+        """
+        sketch = DecayingCountMinSketch(half_life_seconds=self.half_life_seconds, capacity=max(256, 4 * self.top_n))
+        cache.on_access = sketch.add
+        self._targets[cache.name] = _Target(cache, refresh, sketch)
+        logger.info(f"Cache warmer watching {cache.name} cache")
+
+    def start(self) -> asyncio.Task:
+        """Run the warmer in a task on the running event loop until stop()."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"Cache warmer started: top {self.top_n} keys every {self.interval_seconds}s, "
+                        f"at most {self.max_calls_per_minute} upstream calls per minute")
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.warm_once()
+            except Exception as e:
+                logger.error(f"Cache warmer run failed: {e}", exc_info=True)
+
+    async def warm_once(self) -> int:
+        """Refresh the due popular keys of every watched cache; returns how many were refreshed."""
+        self._stats["runs"] += 1
+        due = []
+        for target in self._targets.values():
+            for key, count in target.sketch.top(self.top_n):
+                if count < self.min_count:
+                    break
+                expires_in = target.cache.expires_in(key)
+                if expires_in is not None and 0 <= expires_in <= self.lead_seconds:
+                    due.append((count, target, key))
+        # Most requested first across caches, so the budget goes to the hottest keys
+        due.sort(key=lambda item: item[0], reverse=True)
+
+        refreshed = 0
+        for _, target, key in due:
+            if not self._spend():
+                self._stats["over_budget"] += len(due) - refreshed
+                logger.info(f"Cache warmer budget spent; {len(due) - refreshed} keys left to expire normally")
+                break
+            try:
+                await target.refresh(key)
+                refreshed += 1
+                self._stats["refreshes"] += 1
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Cache warmer could not refresh {key!r} in {target.cache.name} cache: {e}")
+        if refreshed:
+            logger.info(f"Cache warmer refreshed {refreshed} of {len(due)} due keys")
+        return refreshed
+
+    def _spend(self) -> bool:
+        now = self.clock()
+        while self._calls and now - self._calls[0] >= 60.0:
+            self._calls.popleft()
+        if len(self._calls) >= self.max_calls_per_minute:
+            return False
+        self._calls.append(now)
+        return True
+
+    def top_keys(self, cache_name: str, n: Optional[int] = None) -> List[tuple]:
+        """The most requested keys of a watched cache with their decayed request counts."""
+        return self._targets[cache_name].sketch.top(n or self.top_n)
+
+    def stats(self) -> dict:
+        now = self.clock()
+        return dict(
+            self._stats,
+            running=self._task is not None and not self._task.done(),
+            calls_last_minute=sum(1 for started in self._calls if now - started < 60.0),
+            hot_keys={name: [[str(key), round(count, 2)] for key, count in target.sketch.top(10)]
+                      for name, target in self._targets.items()},
+        )
@@ -0,0 +1,195 @@
+"""
+Per-upstream circuit breakers.
+
+A breaker watches the outcome and latency of the last `window_size` calls to one
+upstream. Once at least `min_calls` are recorded and either the failure rate reaches
+`failure_rate_threshold` or the share of calls slower than `slow_call_seconds` reaches
+`slow_call_rate_threshold`, the breaker opens: calls fail immediately with
+CircuitOpenError instead of waiting for the upstream timeout. After `open_seconds` it
+lets `half_open_calls` probe calls through; if they succeed it closes again,
+otherwise it reopens.
+
+Defaults come from CIRCUIT_BREAKER_* environment variables.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+_breakers_lock = threading.RLock()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    Whether an error says the upstream is unhealthy. Client errors such as 404 (unknown
+    city) are answers, not failures; 429 and 5xx responses, timeouts and connection
+    errors are failures.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return True
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: Optional[float] = None,
+        slow_call_seconds: Optional[float] = None,
+        slow_call_rate_threshold: Optional[float] = None,
+        window_size: Optional[int] = None,
+        min_calls: Optional[int] = None,
+        open_seconds: Optional[float] = None,
+        half_open_calls: Optional[int] = None,
+        is_failure: Callable[[BaseException], bool] = is_upstream_failure,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        def setting(value, env: str, default):
+            return value if value is not None else type(default)(os.getenv(env, str(default)))
+
+        self.name = name
+        self.failure_rate_threshold = setting(failure_rate_threshold, "CIRCUIT_BREAKER_FAILURE_RATE", 0.5)
+        self.slow_call_seconds = setting(slow_call_seconds, "CIRCUIT_BREAKER_SLOW_CALL_SECONDS", 5.0)
+        self.slow_call_rate_threshold = setting(slow_call_rate_threshold, "CIRCUIT_BREAKER_SLOW_CALL_RATE", 0.8)
+        self.window_size = setting(window_size, "CIRCUIT_BREAKER_WINDOW", 20)
+        self.min_calls = setting(min_calls, "CIRCUIT_BREAKER_MIN_CALLS", 5)
+        self.open_seconds = setting(open_seconds, "CIRCUIT_BREAKER_OPEN_SECONDS", 30.0)
+        self.half_open_calls = setting(half_open_calls, "CIRCUIT_BREAKER_HALF_OPEN_CALLS", 1)
+        self.is_failure = is_failure
+        self.clock = clock
+
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        # (failed, slow) per recorded call
+        self._window: deque = deque(maxlen=self.window_size)
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+        with _breakers_lock:
+            _breakers[name] = self
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run `fn()` through the breaker; raises CircuitOpenError when open."""
+        self._before()
+        started = self.clock()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._after(self.clock() - started, e)
+            raise
+        self._after(self.clock() - started, None)
+        return result
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self._before()
+        started = self.clock()
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._after(self.clock() - started, e)
+            raise
+        self._after(self.clock() - started, None)
+        return result
+
+    def _current_state(self) -> str:
+        if self._state == STATE_OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._state = STATE_HALF_OPEN
+            self._probes = 0
+            logger.info(f"Circuit {self.name} half-open, probing upstream")
+        return self._state
+
+    def _before(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            if state == STATE_HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return
+            if state != STATE_CLOSED:
+                self._stats["rejected"] += 1
+                retry_in = max(0.0, self.open_seconds - (self.clock() - self._opened_at))
+                raise CircuitOpenError(
+                    f"Circuit for {self.name} is open after repeated upstream failures; retry in {retry_in:.0f}s"
+                )
+
+    def _after(self, seconds: float, error: Optional[BaseException]) -> None:
+        if error is not None and not isinstance(error, Exception):
+            # Cancelled or interrupted: says nothing about the upstream
+            with self._lock:
+                if self._state == STATE_HALF_OPEN:
+                    self._probes = max(0, self._probes - 1)
+            return
+        failed = error is not None and self.is_failure(error)
+        slow = seconds >= self.slow_call_seconds
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["failures"] += int(failed)
+            self._stats["slow_calls"] += int(slow)
+
+            if self._state == STATE_HALF_OPEN:
+                if failed or slow:
+                    self._open(f"probe {'failed' if failed else 'was slow'}")
+                elif self._probes >= self.half_open_calls:
+                    self._state = STATE_CLOSED
+                    self._window.clear()
+                    logger.info(f"Circuit {self.name} closed, upstream recovered")
+                return
+
+            self._window.append((failed, slow))
+            if self._state == STATE_CLOSED and len(self._window) >= self.min_calls:
+                failure_rate = sum(f for f, _ in self._window) / len(self._window)
+                slow_rate = sum(s for _, s in self._window) / len(self._window)
+                if failure_rate >= self.failure_rate_threshold:
+                    self._open(f"failure rate {failure_rate:.0%}")
+                elif slow_rate >= self.slow_call_rate_threshold:
+                    self._open(f"slow call rate {slow_rate:.0%}")
+
+    def _open(self, reason: str) -> None:
+        self._state = STATE_OPEN
+        self._opened_at = self.clock()
+        self._window.clear()
+        self._stats["opened"] += 1
+        logger.warning(f"Circuit {self.name} opened ({reason}); failing fast for {self.open_seconds}s")
+
+    def stats(self) -> dict:
+        with self._lock:
+            window = list(self._window)
+            return dict(
+                self._stats,
+                state=self._current_state(),
+                window_calls=len(window),
+                window_failure_rate=sum(f for f, _ in window) / len(window) if window else 0.0,
+                window_slow_rate=sum(s for _, s in window) / len(window) if window else 0.0,
+            )
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """The process-wide breaker for an upstream, created with env defaults on first use."""
+    with _breakers_lock:
+        return _breakers.get(name) or CircuitBreaker(name)
+
+
+def get_circuit_breaker_stats() -> Dict[str, dict]:
+    """State and counters of every circuit breaker, by upstream name."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
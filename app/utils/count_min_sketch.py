@@ -0,0 +1,68 @@
+"""
+Decaying count-min sketch for tracking which keys are requested most.
+
+Counts are kept in a `depth` x `width` array; a key's estimate is the minimum over its
+`depth` counters, which never undercounts and overcounts only on hash collisions.
+Counts decay exponentially with `half_life_seconds`, so the ranking follows current
+traffic rather than all-time totals. Up to `capacity` keys with the highest estimates
+are remembered so the top keys can be listed.
+"""
+import math
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Tuple
+import numpy as np
+
+
+class DecayingCountMinSketch:
+    def __init__(self, width: int = 1024, depth: int = 4, half_life_seconds: float = 600.0,
+                 capacity: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.width = width
+        self.depth = depth
+        self.half_life_seconds = half_life_seconds
+        self.capacity = capacity
+        self.clock = clock
+        self._counts = np.zeros((depth, width), dtype=np.float64)
+        # Counts are stored scaled by 2**(elapsed / half_life) since `_epoch` (forward
+        # decay), so adding is O(depth) and nothing has to be rescaled on every tick
+        self._epoch = clock()
+        self._candidates: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable, count: float = 1.0) -> None:
+        with self._lock:
+            weight = self._weight(self.clock())
+            if weight > 1e12:
+                self._rebase()
+                weight = self._weight(self.clock())
+            cells = self._cells(key)
+            self._counts[cells] += count * weight
+            self._candidates[key] = float(self._counts[cells].min())
+            if len(self._candidates) > self.capacity:
+                del self._candidates[min(self._candidates, key=self._candidates.get)]
+
+    def estimate(self, key: Hashable) -> float:
+        """Decayed request count for `key` as of now."""
+        with self._lock:
+            return float(self._counts[self._cells(key)].min()) / self._weight(self.clock())
+
+    def top(self, n: int) -> List[Tuple[Hashable, float]]:
+        """The `n` most requested keys with their decayed counts, most requested first."""
+        with self._lock:
+            weight = self._weight(self.clock())
+            ranked = sorted(self._candidates.items(), key=lambda item: item[1], reverse=True)[:n]
+            return [(key, scaled / weight) for key, scaled in ranked]
+
+    def _cells(self, key: Hashable) -> Tuple[np.ndarray, np.ndarray]:
+        columns = [hash((row, key)) % self.width for row in range(self.depth)]
+        return np.arange(self.depth), np.array(columns)
+
+    def _weight(self, now: float) -> float:
+        return math.pow(2.0, (now - self._epoch) / self.half_life_seconds)
+
+    def _rebase(self) -> None:
+        now = self.clock()
+        scale = self._weight(now)
+        self._counts /= scale
+        self._candidates = {key: scaled / scale for key, scaled in self._candidates.items()}
+        self._epoch = now
@@ -0,0 +1,114 @@
+"""
+Shared, pooled HTTP clients for the external API services and the PDF loader.
+
+Every service uses the same keep-alive connection pool instead of opening a new
+TCP+TLS connection per request:
+
+- get_async_client(): httpx.AsyncClient for the running event loop (async MCP handlers)
+- get_http_client(): process-wide httpx.Client for the synchronous code paths
+
+Configuration: HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS,
+HTTP_KEEPALIVE_EXPIRY_SECONDS, HTTP_TIMEOUT_SECONDS, HTTP_CONNECT_TIMEOUT_SECONDS and
+HTTP_HTTP2 (used when the optional `h2` package is installed).
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+DEFAULT_MAX_CONCURRENCY_PER_HOST = 8
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+
+# httpx.AsyncClient and asyncio.Semaphore belong to one event loop, so each loop gets its own
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+_sync_client: Optional[httpx.Client] = None
+_sync_client_lock = threading.Lock()
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("HTTP_HTTP2", "true").lower() not in ("1", "true", "yes"):
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.debug("h2 is not installed, using HTTP/1.1")
+        return False
+    return True
+
+
+def client_options() -> dict:
+    """Keyword arguments shared by the sync and async clients."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", str(DEFAULT_MAX_CONNECTIONS))),
+            max_keepalive_connections=int(
+                os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", str(DEFAULT_MAX_KEEPALIVE_CONNECTIONS))
+            ),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", str(DEFAULT_KEEPALIVE_EXPIRY_SECONDS))),
+        ),
+        "timeout": httpx.Timeout(
+            float(os.getenv("HTTP_TIMEOUT_SECONDS", str(DEFAULT_TIMEOUT_SECONDS))),
+            connect=float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", str(DEFAULT_CONNECT_TIMEOUT_SECONDS))),
+        ),
+        "http2": _http2_enabled(),
+        "follow_redirects": True,
+    }
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Pooled keep-alive AsyncClient shared by every service on the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**client_options())
+        _async_clients[loop] = client
+        logger.info("Async HTTP client created")
+    return client
+
+
+def get_http_client() -> httpx.Client:
+    """Pooled keep-alive Client shared by every thread in the process (sync code paths)."""
+    global _sync_client
+    with _sync_client_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(**client_options())
+            logger.info("HTTP client created")
+        return _sync_client
+
+
+def host_semaphore(url: str) -> asyncio.Semaphore:
+    """Caps concurrent requests per upstream host (HTTP_MAX_CONCURRENCY_PER_HOST, default 8)."""
+    loop = asyncio.get_running_loop()
+    semaphores = _host_semaphores.setdefault(loop, {})
+    host = urlsplit(url).netloc
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(
+            int(os.getenv("HTTP_MAX_CONCURRENCY_PER_HOST", str(DEFAULT_MAX_CONCURRENCY_PER_HOST)))
+        )
+    return semaphores[host]
+
+
+async def close_async_client() -> None:
+    """Close the running loop's client, e.g. on server shutdown."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def close_http_client() -> None:
+    global _sync_client
+    with _sync_client_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
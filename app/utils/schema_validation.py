@@ -0,0 +1,122 @@
+"""
+Central registry of precompiled JSON schema validators.
+
+`jsonschema.validate` re-checks the schema and builds a new validator on every call.
+Tools instead compile their schemas once at import with `compile_schema(...)` and call
+`validate_input` / `validate_output` on the returned validator.
+
+When the optional `fastjsonschema` package is installed (and SCHEMA_VALIDATION_FAST is
+not "false") valid instances are checked with its generated code; failures are re-checked
+with jsonschema so error messages stay the same. SKIP_OUTPUT_VALIDATION=true turns
+output validation off. Per-schema call counts and time spent are available from
+`get_validation_stats()`; `merge_validation_stats()` adds up snapshots taken in several
+processes (e.g. tool worker processes).
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+import jsonschema
+import logging
+
+try:
+    import fastjsonschema
+except ImportError:  # optional dependency
+    fastjsonschema = None
+
+logger = logging.getLogger(__name__)
+
+_registry: Dict[str, "SchemaValidator"] = {}
+_registry_lock = threading.Lock()
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes")
+
+
+class SchemaValidator:
+    def __init__(self, name: str, schema: dict, use_fast: Optional[bool] = None):
+        jsonschema.validators.validator_for(schema).check_schema(schema)
+        self.name = name
+        self.schema = schema
+        self._validator = jsonschema.validators.validator_for(schema)(schema)
+        if use_fast is None:
+            use_fast = _env_flag("SCHEMA_VALIDATION_FAST", "true")
+        self._fast = fastjsonschema.compile(schema) if use_fast and fastjsonschema is not None else None
+        self.calls = 0
+        self.seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def validate(self, instance) -> None:
+        """Raise jsonschema.ValidationError (the same error jsonschema.validate would) if invalid."""
+        started = time.perf_counter()
+        try:
+            if self._fast is not None:
+                try:
+                    self._fast(instance)
+                    return
+                except fastjsonschema.JsonSchemaException:
+                    pass
+            error = jsonschema.exceptions.best_match(self._validator.iter_errors(instance))
+            if error is not None:
+                raise error
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self.calls += 1
+                self.seconds += elapsed
+            logger.debug(f"Validated against {self.name} in {elapsed * 1000:.3f} ms")
+
+    def validate_input(self, instance) -> None:
+        try:
+            self.validate(instance)
+        except jsonschema.ValidationError as e:
+            logger.error(f"Input validation failed: {e.message}")
+            raise ValueError(f"Invalid input data: {e.message}")
+
+    def validate_output(self, instance) -> None:
+        if _env_flag("SKIP_OUTPUT_VALIDATION", "false"):
+            return
+        try:
+            self.validate(instance)
+        except jsonschema.ValidationError as e:
+            logger.error(f"Output validation failed: {e.message}")
+            raise ValueError(f"Invalid output data: {e.message}")
+
+
+def compile_schema(name: str, schema: dict) -> SchemaValidator:
+    """Compile `schema` once and register it under `name`; later calls return the same validator."""
+    with _registry_lock:
+        validator = _registry.get(name)
+        if validator is None or validator.schema is not schema:
+            validator = SchemaValidator(name, schema)
+            _registry[name] = validator
+            logger.debug(f"Compiled schema validator {name} ({'fast' if validator._fast else 'jsonschema'})")
+        return validator
+
+
+def get_validation_stats() -> Dict[str, dict]:
+    """Calls and total/average validation time per registered schema."""
+    with _registry_lock:
+        validators = list(_registry.values())
+    return {
+        v.name: {
+            "calls": v.calls,
+            "total_ms": v.seconds * 1000,
+            "avg_ms": v.seconds * 1000 / v.calls if v.calls else 0.0,
+        }
+        for v in validators
+    }
+
+
+def merge_validation_stats(*snapshots: Dict[str, dict]) -> Dict[str, dict]:
+    """Sum `get_validation_stats()` snapshots from several processes into one."""
+    merged: Dict[str, dict] = {}
+    for snapshot in snapshots:
+        for name, stats in snapshot.items():
+            total = merged.setdefault(name, {"calls": 0, "total_ms": 0.0})
+            total["calls"] += stats["calls"]
+            total["total_ms"] += stats["total_ms"]
+    for total in merged.values():
+        total["avg_ms"] = total["total_ms"] / total["calls"] if total["calls"] else 0.0
+    return merged
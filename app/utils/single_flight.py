@@ -0,0 +1,117 @@
+"""
+Request coalescing: concurrent calls with the same key share one in-flight operation.
+
+The first caller for a key runs the work; callers arriving while it is still running
+wait for it and receive the same result (or exception) instead of repeating the fetch,
+parse or LLM call. Nothing is remembered once the work finishes - caching is left to
+the caller (see TTLCache, which coalesces its misses with these classes).
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_groups: Dict[str, Any] = {}
+_groups_lock = threading.Lock()
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+def _register(group) -> None:
+    with _groups_lock:
+        _groups[group.name] = group
+
+
+class SingleFlight:
+    """Coalesces concurrent calls across threads."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+        _register(self)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._stats["executions"] += 1
+                leader = True
+
+        if not leader:
+            logger.debug(f"{self.name}: waiting for in-flight call {key!r}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent coroutine calls on an event loop. The work runs in its own
+    task, so a cancelled caller does not cancel it for the others.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        # Tasks belong to one event loop, so in-flight calls are tracked per loop
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+        _register(self)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        tasks = self._tasks.setdefault(loop, {})
+        self._stats["calls"] += 1
+        task = tasks.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            logger.debug(f"{self.name}: waiting for in-flight call {key!r}")
+        else:
+            self._stats["executions"] += 1
+            task = tasks[key] = loop.create_task(fn())
+            task.add_done_callback(lambda _: tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return dict(self._stats, in_flight=sum(len(tasks) for tasks in list(self._tasks.values())))
+
+
+def get_single_flight_stats() -> Dict[str, dict]:
+    """Calls, executions and coalesced calls of every single-flight group, by name."""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
@@ -0,0 +1,63 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+TEXT_URI_PREFIX = "text://documents/"
+DEFAULT_MAX_CHARS = 200_000_000
+
+
+class TextStore:
+    """
+    Process-wide store for large texts handed between tools by reference.
+
+    Tools that produce big texts (e.g. extract_pdf_text) store them here and return a
+    `text://documents/{id}` URI; tools that consume text (e.g. summarize_text) resolve
+    the URI locally, so the text never travels through the agent. Entries are evicted
+    least-recently-used first once the total size exceeds `max_chars`.
+    """
+
+    def __init__(self, max_chars: int = None):
+        self.max_chars = max_chars or int(os.getenv("TEXT_STORE_MAX_CHARS", DEFAULT_MAX_CHARS))
+        self._texts: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def put(self, text: str) -> str:
+        """Store text and return its URI."""
+        ref_id = uuid.uuid4().hex
+        with self._lock:
+            self._texts[ref_id] = text
+            self._size += len(text)
+            while self._size > self.max_chars and len(self._texts) > 1:
+                evicted_id, evicted = self._texts.popitem(last=False)
+                self._size -= len(evicted)
+                logger.info(f"Evicted stored text {evicted_id} ({len(evicted)} characters)")
+        logger.info(f"Stored text {ref_id} ({len(text)} characters)")
+        return TEXT_URI_PREFIX + ref_id
+
+    def get(self, uri_or_id: str) -> str:
+        """Return the text for a URI (or bare id); raises KeyError when unknown or evicted."""
+        ref_id = uri_or_id[len(TEXT_URI_PREFIX):] if uri_or_id.startswith(TEXT_URI_PREFIX) else uri_or_id
+        with self._lock:
+            if ref_id not in self._texts:
+                raise KeyError(f"Unknown or expired text reference: {uri_or_id}")
+            self._texts.move_to_end(ref_id)
+            return self._texts[ref_id]
+
+    def delete(self, uri_or_id: str) -> None:
+        ref_id = uri_or_id[len(TEXT_URI_PREFIX):] if uri_or_id.startswith(TEXT_URI_PREFIX) else uri_or_id
+        with self._lock:
+            text = self._texts.pop(ref_id, None)
+            if text is not None:
+                self._size -= len(text)
+
+
+_text_store = TextStore()
+
+
+def get_text_store() -> TextStore:
+    return _text_store
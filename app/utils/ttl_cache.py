@@ -0,0 +1,284 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from .single_flight import SingleFlight, AsyncSingleFlight
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_HIT = "hit"
+CACHE_STALE = "stale"
+CACHE_MISS = "miss"
+CACHE_FALLBACK = "fallback"
+
+_caches: Dict[str, "TTLCache"] = {}
+_caches_lock = threading.Lock()
+
+
+class _Entry:
+    __slots__ = ("value", "error", "stored_at", "expires_at", "stale_until")
+
+    def __init__(self, value: Any, error: Optional[BaseException], stored_at: float, expires_at: float,
+                 stale_until: float):
+        self.value = value
+        self.error = error
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+def _fresh_error(error: BaseException) -> BaseException:
+    """
+    A new instance of a cached error, carrying its args and attributes but no traceback,
+    so each negative hit raises its own exception. Built without calling __init__, since
+    some exceptions (e.g. httpx.HTTPStatusError) require keyword arguments.
+    """
+    fresh = type(error).__new__(type(error), *error.args)
+    fresh.args = error.args
+    fresh.__dict__.update(vars(error))
+    return fresh
+
+
+class TTLCache:
+    """
+    Process-wide cache for upstream lookups, shared by all tool instances.
+
+    Values are fresh for `ttl` seconds. For a further `stale_ttl` seconds an expired
+    value is still served while one background thread reloads it (stale-while-revalidate);
+    after that the next caller reloads synchronously. Errors for which `negative_if(error)`
+    is true (e.g. an unknown city) are cached for `negative_ttl` seconds and raised again,
+    as a fresh copy per lookup, without calling upstream. At most `max_entries` keys are kept, least recently used
+    first out. A `ttl` of 0 disables caching. `ttl_of(value)` can shorten the TTL per
+    value, e.g. to the provider's next scheduled update. Concurrent misses for the same
+    key share one load (single-flight), so an expiry does not stampede upstream.
+
+    With `fallback_if(error)`, a failed reload (e.g. upstream down or its circuit open)
+    returns the last value stored for the key, however old, flagged as status "fallback";
+    expired values are kept until evicted for this.
+
+    `on_access(key)`, when set, is called on every lookup, e.g. to track key popularity
+    for a CacheWarmer, which reloads popular keys with refresh_async before they expire.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0.0, negative_ttl: float = 0.0,
+                 max_entries: int = 1024, negative_if: Optional[Callable[[BaseException], bool]] = None,
+                 ttl_of: Optional[Callable[[Any], Optional[float]]] = None,
+                 fallback_if: Optional[Callable[[BaseException], bool]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.negative_if = negative_if
+        self.ttl_of = ttl_of
+        self.fallback_if = fallback_if
+        self.clock = clock
+        self.on_access: Optional[Callable[[Hashable], None]] = None
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._refreshing = set()
+        self._tasks = set()
+        self._flight = SingleFlight(f"cache:{name}")
+        self._async_flight = AsyncSingleFlight(f"cache:{name}:async")
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "stale_hits": 0, "negative_hits": 0, "misses": 0, "refreshes": 0,
+                       "refresh_errors": 0, "fallbacks": 0, "warmed": 0, "evictions": 0}
+        with _caches_lock:
+            _caches[name] = self
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Tuple[Any, dict]:
+        """
+        Return (value, info) for `key`, calling `loader()` on a miss. `info` holds the
+        cache status ("hit", "stale", "miss" or "fallback"), whether the value is stale,
+        its age in seconds and the cache's hit ratio so far.
+        """
+        if self.ttl <= 0:
+            return self._flight.do(key, loader), self._info(CACHE_MISS, 0.0)
+
+        status, value, age, refresh = self._lookup(key)
+        if status == CACHE_STALE and refresh:
+            threading.Thread(target=self._refresh, args=(key, loader), name=f"{self.name}-refresh", daemon=True).start()
+        if status is not None:
+            return value, self._info(status, age)
+
+        value, status, age = self._flight.do(key, lambda: self._load(key, loader))
+        return value, self._info(status, age)
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Tuple[Any, dict]:
+        """get_or_load for coroutine loaders; stale entries are refreshed in an asyncio task."""
+        if self.ttl <= 0:
+            return await self._async_flight.do(key, loader), self._info(CACHE_MISS, 0.0)
+
+        status, value, age, refresh = self._lookup(key)
+        if status == CACHE_STALE and refresh:
+            task = asyncio.get_running_loop().create_task(self._refresh_async(key, loader))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if status is not None:
+            return value, self._info(status, age)
+
+        value, status, age = await self._async_flight.do(key, lambda: self._load_async(key, loader))
+        return value, self._info(status, age)
+
+    def _lookup(self, key: Hashable) -> Tuple[Optional[str], Any, float, bool]:
+        """(status or None on a miss, value, age, whether the caller should start a refresh)."""
+        if self.on_access is not None:
+            self.on_access(key)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self._entries.move_to_end(key)
+                if entry.error is not None:
+                    self._stats["negative_hits"] += 1
+                    raise _fresh_error(entry.error)
+                self._stats["hits"] += 1
+                return CACHE_HIT, entry.value, now - entry.stored_at, False
+            if entry is not None and entry.error is None and now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                refresh = key not in self._refreshing
+                self._refreshing.add(key)
+                return CACHE_STALE, entry.value, now - entry.stored_at, refresh
+            self._stats["misses"] += 1
+            return None, None, 0.0, False
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """Seconds until `key`'s value expires (negative once expired), or None without a stored value."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.error is not None:
+                return None
+            return entry.expires_at - self.clock()
+
+    async def refresh_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Reload `key` now, before it expires. Shares the in-flight load with concurrent
+        misses; errors are raised to the caller and leave the stored value in place.
+        """
+        async def warm():
+            value = await loader()
+            self._loaded(key, value)
+            with self._lock:
+                self._stats["warmed"] += 1
+            return value, CACHE_MISS, 0.0
+
+        await self._async_flight.do(key, warm)
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Tuple[Any, str, float]:
+        try:
+            value = loader()
+        except Exception as e:
+            return self._failed(key, e)
+        self._loaded(key, value)
+        return value, CACHE_MISS, 0.0
+
+    async def _load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Tuple[Any, str, float]:
+        try:
+            value = await loader()
+        except Exception as e:
+            return self._failed(key, e)
+        self._loaded(key, value)
+        return value, CACHE_MISS, 0.0
+
+    def _loaded(self, key: Hashable, value: Any) -> None:
+        ttl = self.ttl
+        if self.ttl_of is not None:
+            value_ttl = self.ttl_of(value)
+            if value_ttl is not None:
+                ttl = max(0.0, min(ttl, value_ttl))
+        self._store(key, value, None, ttl, self.stale_ttl)
+
+    def _failed(self, key: Hashable, error: Exception) -> Tuple[Any, str, float]:
+        """Cache a negative answer or fall back to the last known value; otherwise re-raise."""
+        if self.negative_if is not None and self.negative_if(error):
+            if self.negative_ttl > 0:
+                logger.info(f"{self.name} cache: caching failure for {key!r} for {self.negative_ttl}s")
+                self._store(key, None, error, self.negative_ttl, 0.0)
+            raise error
+        if self.fallback_if is not None and self.fallback_if(error):
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.error is None:
+                    self._stats["fallbacks"] += 1
+                    logger.warning(f"{self.name} cache: serving last known value for {key!r} after error: {error}")
+                    return entry.value, CACHE_FALLBACK, self.clock() - entry.stored_at
+        raise error
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        try:
+            value = loader()
+        except Exception as e:
+            self._refresh_failed(key, e)
+        else:
+            self._refreshed(key, value)
+
+    async def _refresh_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            value = await loader()
+        except Exception as e:
+            self._refresh_failed(key, e)
+        else:
+            self._refreshed(key, value)
+
+    def _refreshed(self, key: Hashable, value: Any) -> None:
+        self._loaded(key, value)
+        with self._lock:
+            self._stats["refreshes"] += 1
+            self._refreshing.discard(key)
+        logger.debug(f"{self.name} cache: refreshed {key!r}")
+
+    def _refresh_failed(self, key: Hashable, error: Exception) -> None:
+        # Keep serving the stale value until it runs out; the next miss retries
+        with self._lock:
+            self._stats["refresh_errors"] += 1
+            self._refreshing.discard(key)
+        logger.warning(f"{self.name} cache: background refresh of {key!r} failed: {error}")
+
+    def _store(self, key: Hashable, value: Any, error: Optional[BaseException], ttl: float, stale_ttl: float) -> None:
+        now = self.clock()
+        with self._lock:
+            self._entries[key] = _Entry(value, error, now, now + ttl, now + ttl + stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or everything when `key` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def hit_ratio(self) -> float:
+        with self._lock:
+            return self._hit_ratio()
+
+    def _hit_ratio(self) -> float:
+        served = self._stats["hits"] + self._stats["stale_hits"] + self._stats["negative_hits"]
+        total = served + self._stats["misses"]
+        return served / total if total else 0.0
+
+    def _info(self, status: str, age: float) -> dict:
+        with self._lock:
+            return {
+                "status": status,
+                "stale": status in (CACHE_STALE, CACHE_FALLBACK),
+                "age_seconds": round(age, 3),
+                "hit_ratio": round(self._hit_ratio(), 4),
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, size=len(self._entries), hit_ratio=self._hit_ratio())
+
+
+def get_cache_stats() -> Dict[str, dict]:
+    """Counters and hit ratio of every TTLCache in this process, by name."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Load test for the external API MCP server against the local mock upstream.
+
+Starts benchmarks/mock_upstream.py in-process, launches mcp_servers/external_api_server.py
+with OPEN_WEATHER_MAP_BASE_URL / EXCHANGE_RATE_API_BASE_URL pointing at it, then drives
+fetch_weather / fetch_exchange_rate over SSE from several concurrent MCP sessions and
+reports latency percentiles and requests/sec. No real API quota is used.
+
+Usage:
+    python benchmarks/external_api_load_test.py [--requests 2000] [--concurrency 50]
+        [--tool mixed|fetch_weather|fetch_exchange_rate] [--latency-ms 50] [--jitter-ms 20]
+        [--error-rate 0.0] [--rate-limit 500] [--cities 100] [--port 8090]
+
+Pass --server-url to drive an already running server instead (its upstream settings are
+then up to you).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from benchmarks.mock_upstream import MockUpstream, USD_RATES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Server did not listen on port {port} within {timeout}s")
+
+
+def make_calls(args) -> list:
+    rng = random.Random(0)
+    cities = [f"City{i}" for i in range(args.cities)]
+    currencies = sorted(USD_RATES)
+    calls = []
+    for _ in range(args.requests):
+        tool = args.tool if args.tool != "mixed" else rng.choice(["fetch_weather", "fetch_exchange_rate"])
+        if tool == "fetch_weather":
+            calls.append((tool, {"city": rng.choice(cities)}))
+        else:
+            base, target = rng.sample(currencies, 2)
+            calls.append((tool, {"base_currency": base, "target_currency": target}))
+    return calls
+
+
+async def run_load(server_url: str, calls: list, concurrency: int) -> dict:
+    queue: asyncio.Queue = asyncio.Queue()
+    for call in calls:
+        queue.put_nowait(call)
+    latencies, errors = [], 0
+
+    async def worker() -> None:
+        nonlocal errors
+        async with AsyncExitStack() as stack:
+            read, write = await stack.enter_async_context(sse_client(server_url))
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+            while True:
+                try:
+                    name, arguments = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    result = await session.call_tool(name, arguments)
+                    text = "".join(getattr(c, "text", "") for c in result.content)
+                    failed = result.isError or text.startswith("Error")
+                except Exception:
+                    failed = True
+                latencies.append(time.perf_counter() - started)
+                errors += int(failed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean": statistics.fmean(latencies) if latencies else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--tool", choices=["mixed", "fetch_weather", "fetch_exchange_rate"], default="mixed")
+    parser.add_argument("--cities", type=int, default=100, help="Distinct cities to request")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mock upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of upstream requests answering 503")
+    parser.add_argument("--rate-limit", type=float, help="Upstream requests per second before answering 429")
+    parser.add_argument("--port", type=int, default=8090, help="Port for the MCP server under test")
+    parser.add_argument("--server-url", help="Drive an already running server (e.g. http://127.0.0.1:8000/sse)")
+    args = parser.parse_args()
+
+    upstream = MockUpstream(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                            rate_limit=args.rate_limit, seed=0).start_in_thread()
+    server = None
+    server_url = args.server_url
+    try:
+        if server_url is None:
+            env = dict(
+                os.environ,
+                SERVER_PORT=str(args.port),
+                OPEN_WEATHER_MAP_BASE_URL=upstream.base_url,
+                EXCHANGE_RATE_API_BASE_URL=upstream.base_url,
+                OPEN_WEATHER_MAP_API_KEY=os.getenv("OPEN_WEATHER_MAP_API_KEY", "mock-key"),
+                EXCHANGE_RATE_API_KEY=os.getenv("EXCHANGE_RATE_API_KEY", "mock-key"),
+            )
+            server = subprocess.Popen(
+                [sys.executable, os.path.join(ROOT, "mcp_servers", "external_api_server.py")],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            wait_for_port(args.port)
+            server_url = f"http://127.0.0.1:{args.port}/sse"
+
+        report = asyncio.run(run_load(server_url, make_calls(args), args.concurrency))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        upstream.stop()
+
+    print(f"Requests:   {report['requests']} ({report['errors']} errors) in {report['seconds']:.2f}s")
+    print(f"Throughput: {report['rps']:.1f} requests/s at concurrency {args.concurrency}")
+    print(f"Latency:    mean {report['mean'] * 1000:.1f} ms, p50 {report['p50'] * 1000:.1f} ms, "
+          f"p95 {report['p95'] * 1000:.1f} ms, p99 {report['p99'] * 1000:.1f} ms")
+    print(f"Upstream:   {sum(upstream.requests.values())} requests {dict(upstream.requests)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenWeatherMap and ExchangeRate-API endpoints.
+
+A small asyncio HTTP/1.1 server (keep-alive, no dependencies) that answers with the
+same response shapes the services parse:
+
+    GET /data/2.5/weather?q=<city>&appid=<key>&units=metric
+    GET /v6/<key>/pair/<base>/<target>
+    GET /v6/<key>/latest/<base>
+    GET /__stats                      request counts per route
+
+Cities starting with "unknown" get a 404, like a city OpenWeatherMap does not know.
+Latency and failures are tunable, so the external API server can be load-tested
+without touching the paid APIs:
+
+    python benchmarks/mock_upstream.py --port 8765 --latency-ms 50 --error-rate 0.01
+    OPEN_WEATHER_MAP_BASE_URL=http://127.0.0.1:8765 \\
+    EXCHANGE_RATE_API_BASE_URL=http://127.0.0.1:8765 python mcp_servers/external_api_server.py
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Units per USD
+USD_RATES = {
+    "USD": 1.0, "EUR": 0.92, "GBP": 0.79, "JPY": 151.2, "CHF": 0.88, "CAD": 1.36, "AUD": 1.52,
+    "CNY": 7.23, "INR": 83.4, "EGP": 47.6, "BRL": 5.05, "MXN": 16.9, "SEK": 10.6, "ZAR": 18.7,
+}
+CONDITIONS = ["clear sky", "few clouds", "scattered clouds", "light rain", "overcast clouds", "mist"]
+
+
+class MockUpstream:
+    """
+    Serves both APIs on one port. `latency_ms` (+/- `jitter_ms`) is added to every
+    request, a share `error_rate` answer 503, and more than `rate_limit` requests per
+    second answer 429.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: Optional[float] = None, seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> "MockUpstream":
+        """Run on a background event loop (for tests and in-process benchmarks)."""
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="mock-upstream", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        handlers = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = True
+                content_length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    name, value = name.strip().lower(), value.strip().lower()
+                    if name == "connection" and value == "close":
+                        keep_alive = False
+                    elif name == "content-length":
+                        content_length = int(value)
+                if content_length:
+                    await reader.readexactly(content_length)
+
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                status, body = await self._respond(method, target)
+                payload = json.dumps(body).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, target: str) -> Tuple[int, dict]:
+        url = urlsplit(target)
+        if url.path == "/__stats":
+            return 200, dict(self.requests)
+
+        route = self._route_name(url.path)
+        self.requests[route] += 1
+        if self.latency_ms or self.jitter_ms:
+            await asyncio.sleep(max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000)
+        if self._throttled():
+            return 429, {"result": "error", "error-type": "quota-reached"}
+        if self._random.random() < self.error_rate:
+            return 503, {"result": "error", "error-type": "service-unavailable"}
+        if method != "GET":
+            return 405, {"result": "error", "error-type": "method-not-allowed"}
+
+        if route == "weather":
+            return self._weather(parse_qs(url.query))
+        if route in ("pair", "latest"):
+            return self._exchange(route, [unquote(p) for p in url.path.split("/")[4:]])
+        return 404, {"result": "error", "error-type": "not-found"}
+
+    @staticmethod
+    def _route_name(path: str) -> str:
+        if path == "/data/2.5/weather":
+            return "weather"
+        parts = path.split("/")
+        if len(parts) >= 4 and parts[1] == "v6" and parts[3] in ("pair", "latest"):
+            return parts[3]
+        return "other"
+
+    def _throttled(self) -> bool:
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start, self._window_count = now, 0
+        self._window_count += 1
+        return self._window_count > self.rate_limit
+
+    @staticmethod
+    def _weather(query: dict) -> Tuple[int, dict]:
+        city = (query.get("q") or [""])[0]
+        if not city or city.strip().lower().startswith("unknown"):
+            return 404, {"cod": "404", "message": "city not found"}
+        # Deterministic per city, so repeated runs are comparable
+        seed = int(hashlib.sha256(city.strip().lower().encode("utf-8")).hexdigest()[:8], 16)
+        return 200, {
+            "name": city.split(",")[0].strip().title(),
+            "main": {"temp": round(-10 + seed % 450 / 10, 1), "humidity": seed % 100},
+            "wind": {"speed": round(seed % 150 / 10, 1)},
+            "weather": [{"main": "Mock", "description": CONDITIONS[seed % len(CONDITIONS)]}],
+            "cod": 200,
+        }
+
+    @staticmethod
+    def _exchange(route: str, codes: list) -> Tuple[int, dict]:
+        codes = [c.upper() for c in codes]
+        if not codes or any(c not in USD_RATES for c in codes):
+            return 404, {"result": "error", "error-type": "unsupported-code"}
+        base = codes[0]
+        now = int(time.time())
+        common = {
+            "result": "success",
+            "time_last_update_unix": now - now % 86400,
+            "time_next_update_unix": now - now % 86400 + 86400,
+            "base_code": base,
+        }
+        if route == "latest":
+            rates = {code: round(rate / USD_RATES[base], 6) for code, rate in USD_RATES.items()}
+            return 200, dict(common, conversion_rates=rates)
+        if len(codes) < 2:
+            return 404, {"result": "error", "error-type": "malformed-request"}
+        target = codes[1]
+        return 200, dict(common, target_code=target, conversion_rate=round(USD_RATES[target] / USD_RATES[base], 6))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, help="Requests per second before answering 429")
+    args = parser.parse_args()
+
+    upstream = MockUpstream(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit)
+    print(f"Mock upstream listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(upstream.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for PDFTextExtractor.
+
+Builds a synthetic text PDF (2000 pages by default) and extracts it in the default
+and streaming modes, each in a fresh process, reporting wall time, peak RSS and
+(optionally) the tracemalloc peak.
+
+Usage:
+    python benchmarks/pdf_extraction_memory.py [--pages 2000] [--lines-per-page 40] [--tracemalloc]
+
+The default mode keeps every parsed page alive until the file is closed, so on a
+2000-page document it needs several GB; use `--modes streaming` on small machines.
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.tools.extract_pdf_text.PDF_text_extractor import PDFTextExtractor
+from tests.pdf_factory import write_text_pdf
+
+
+def _measure(pdf_path: str, streaming: bool, trace: bool, queue) -> None:
+    extractor = PDFTextExtractor(streaming=streaming)
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    text, pages = extractor.extract(pdf_path)
+    elapsed = time.perf_counter() - started
+    traced_peak = tracemalloc.get_traced_memory()[1] if trace else float("nan")
+    tracemalloc.stop()
+    # ru_maxrss is KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    queue.put({
+        "pages": pages,
+        "characters": len(text),
+        "seconds": elapsed,
+        "tracemalloc_peak_mb": traced_peak / 2**20,
+        "peak_rss_mb": peak_rss / 2**20,
+    })
+
+
+def run_mode(pdf_path: str, streaming: bool, trace: bool) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(pdf_path, streaming, trace, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--lines-per-page", type=int, default=40)
+    parser.add_argument("--modes", nargs="+", choices=["default", "streaming"], default=["default", "streaming"])
+    parser.add_argument(
+        "--tracemalloc", action="store_true",
+        help="Also record the tracemalloc peak (much slower; RSS alone is usually enough)",
+    )
+    args = parser.parse_args()
+
+    line = "The quick brown fox jumps over the lazy dog while benchmarks measure memory."
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = write_text_pdf(
+            os.path.join(tmp, "synthetic.pdf"),
+            [[f"{page}.{n} {line}" for n in range(args.lines_per_page)] for page in range(args.pages)],
+        )
+        print(f"Synthetic PDF: {args.pages} pages, {os.path.getsize(pdf_path) / 2**20:.1f} MB")
+        print(f"{'mode':<10} {'pages':>6} {'chars':>10} {'seconds':>8} {'tracemalloc MB':>15} {'peak RSS MB':>12}")
+        for mode in args.modes:
+            r = run_mode(pdf_path, mode == "streaming", args.tracemalloc)
+            print(
+                f"{mode:<10} {r['pages']:>6} {r['characters']:>10} {r['seconds']:>8.2f} "
+                f"{r['tracemalloc_peak_mb']:>15.1f} {r['peak_rss_mb']:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
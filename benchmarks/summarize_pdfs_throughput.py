@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for the summarize_pdfs pipeline.
+
+Builds synthetic PDFs and summarizes them with SummarizePDFsService while every LLM
+call is served by SyntheticLLMClient (LLM_CLIENT_MODE=synthetic), so no network or
+API key is needed. Latency, error rate and rate limit mimic the real API.
+
+Usage:
+    python benchmarks/summarize_pdfs_throughput.py [--documents 20] [--pages 10]
+        [--latency-ms 800] [--error-rate 0.0] [--rate-limit 15] [--llm-concurrency 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.tools.summarize_pdfs.summarize_pdfs_service import SummarizePDFsService
+from tests.pdf_factory import write_text_pdf
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Median synthetic LLM latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, help="Synthetic LLM requests per second per model")
+    parser.add_argument("--llm-concurrency", type=int, default=4)
+    parser.add_argument("--extraction-workers", type=int)
+    args = parser.parse_args()
+
+    os.environ["LLM_CLIENT_MODE"] = "synthetic"
+    os.environ["LLM_SYNTHETIC_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LLM_SYNTHETIC_ERROR_RATE"] = str(args.error_rate)
+    os.environ["LLM_SYNTHETIC_SEED"] = "0"
+    if args.rate_limit:
+        os.environ["LLM_SYNTHETIC_RATE_LIMIT"] = str(args.rate_limit)
+
+    line = "Synthetic benchmark text about document summarization throughput and latency."
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [
+            write_text_pdf(
+                os.path.join(tmp, f"doc{d}.pdf"),
+                [[f"{d}.{page}.{n} {line}" for n in range(40)] for page in range(args.pages)],
+            )
+            for d in range(args.documents)
+        ]
+        service = SummarizePDFsService(
+            max_extraction_workers=args.extraction_workers,
+            max_llm_concurrency=args.llm_concurrency,
+        )
+        failed = 0
+        for event in service.summarize(paths):
+            if event.get("status") == "failed":
+                failed += 1
+            if "throughput" in event:
+                t = event["throughput"]
+                print(
+                    f"{t['documents']} documents ({failed} failed), {t['pages']} pages, {t['chunks']} chunks "
+                    f"in {t['elapsed_seconds']:.2f}s: {t['documents_per_second']:.2f} docs/s, "
+                    f"{t['pages_per_second']:.1f} pages/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,19 @@ MCP Evaluation Tool Server
 
 Exposes tools for:
 - evaluate_llm_responses
+- evaluate_llm_responses_batch
 - hallucination_checker
+
+Tools are created once and warmed up at startup; GET /ready answers 200 once they are warm.
+Evaluations run in worker processes and hallucination checks (LLM-bound) on a thread
+pool, so no tool blocks the event loop (see app/tools/executor.py).
 """
 
 import logging
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,14 +29,57 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize FastMCP server
-mcp = FastMCP("evaluation-server")
-
 # Import tools
 from app.tools import (
     EvaluateLLMResponsesTool,
     HallucinationCheckerTool,
+    ToolRegistry,
+    ToolExecutor,
+)
+from app.tools.warmup import run_tiny_evaluation, ping_llm
+from app.tools.hallucination_checker import get_prefilter_stats
+from app.llm import get_route_stats
+from app.utils import get_validation_stats, merge_validation_stats
+
+# Tools that run in this process, on the executor's thread pool
+registry = ToolRegistry(
+    "evaluation-server",
+    {
+        "hallucination_checker": HallucinationCheckerTool,
+    },
+    warmups={
+        "llm_ping": ping_llm,
+    },
+)
+# evaluate_llm_responses is built and warmed only in the executor's worker processes;
+# building it loads the TF-IDF model (COSINE_TFIDF_MODEL_PATH)
+executor = ToolExecutor(
+    registry,
+    cpu_factories={"evaluate_llm_responses": EvaluateLLMResponsesTool},
+    worker_warmups={"tiny_evaluation": run_tiny_evaluation},
+    # evaluate_llm_responses validates its input and output in the workers
+    worker_stats=get_validation_stats,
 )
+registry.warmups["tool_workers"] = executor.warm
+
+
+@asynccontextmanager
+async def lifespan(server):
+    registry.start()
+    try:
+        yield
+    finally:
+        executor.shutdown()
+
+
+# Initialize FastMCP server
+mcp = FastMCP("evaluation-server", lifespan=lifespan)
+
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> JSONResponse:
+    """200 once the tools are built and warm, 503 before."""
+    return JSONResponse(registry.status(), status_code=200 if registry.ready else 503)
 
 
 @mcp.tool()
@@ -45,13 +96,32 @@ async def evaluate_llm_responses(ground_truth: str, response: str) -> str:
         Similarity scores (cosine, lexical, conciseness) and metadata
     """
     try:
-        tool = EvaluateLLMResponsesTool()
-        result = tool.run({"ground_truth": ground_truth, "response": response})
+        result = await executor.run("evaluate_llm_responses", "run", {"ground_truth": ground_truth, "response": response})
         return str(result)
     except Exception as e:
         return f"Error evaluating LLM responses: {str(e)}"
 
 
+@mcp.tool()
+async def evaluate_llm_responses_batch(pairs: list[dict[str, str]]) -> str:
+    """Evaluate many LLM responses against their ground truths in one call.
+    
+    Every text is tokenized once and the cosine, lexical and conciseness scores
+    for all pairs are computed together with sparse matrix operations.
+    
+    Args:
+        pairs: List of {"ground_truth": ..., "response": ...} objects
+        
+    Returns:
+        Similarity scores for each pair, in input order, and metadata
+    """
+    try:
+        result = await executor.run("evaluate_llm_responses", "run_batch", {"pairs": pairs})
+        return str(result)
+    except Exception as e:
+        return f"Error evaluating LLM responses batch: {str(e)}"
+
+
 @mcp.tool()
 async def hallucination_checker(ground_truth: str, response: str) -> str:
     """Check whether the response contains information not supported by ground truth.
@@ -65,13 +135,58 @@ async def hallucination_checker(ground_truth: str, response: str) -> str:
         explanation, and metadata
     """
     try:
-        tool = HallucinationCheckerTool()
-        result = tool.run({"ground_truth": ground_truth, "response": response})
+        result = await executor.run("hallucination_checker", "run", {"ground_truth": ground_truth, "response": response})
+        return str(result)
+    except Exception as e:
+        return f"Error checking for hallucinations: {str(e)}"
+
+
+@mcp.tool()
+async def hallucination_checker_batch(ground_truth: str, responses: list[str]) -> str:
+    """Check many responses against the same ground truth for hallucinated content.
+
+    Responses are packed into as few LLM calls as fit a token budget, so the
+    ground truth is sent once per batch instead of once per response.
+
+    Args:
+        ground_truth: The factual reference text
+        responses: The response texts to check
+
+    Returns:
+        One hallucination result per response (in input order) and metadata
+    """
+    try:
+        result = await executor.run("hallucination_checker", "run_batch",
+                                    {"ground_truth": ground_truth, "responses": responses})
         return str(result)
     except Exception as e:
         return f"Error checking for hallucinations: {str(e)}"
 
 
+@mcp.resource("metrics://schema-validation", mime_type="application/json")
+def schema_validation_stats() -> dict:
+    """Calls and time spent per precompiled JSON schema validator, in this process and the tool workers."""
+    return merge_validation_stats(get_validation_stats(), *executor.worker_snapshots())
+
+
+@mcp.resource("metrics://hallucination-prefilter", mime_type="application/json")
+def hallucination_prefilter_stats() -> dict:
+    """Hallucination checks, LLM calls avoided and sentences sent to the LLM by the local pre-filter."""
+    return get_prefilter_stats()
+
+
+@mcp.resource("metrics://tool-executor", mime_type="application/json")
+def tool_executor_stats() -> dict:
+    """Pool, calls, errors, queue depth and wait/run time per tool."""
+    return executor.stats()
+
+
+@mcp.resource("metrics://llm-routes", mime_type="application/json")
+def llm_route_stats() -> dict:
+    """Calls, latency, escalations and estimated tokens per LLM task and route."""
+    return get_route_stats()
+
+
 def main():
     """Initialize and run the MCP server with SSE."""
     port = int(os.getenv("SERVER_PORT", "8000"))
@@ -4,11 +4,20 @@ MCP External API Tooling Server
 
 Exposes tools for:
 - fetch_weather
+- fetch_weather_many
 - fetch_exchange_rate
+- convert_amounts
+
+Tools are created once and warmed up at startup; GET /ready answers 200 once they are
+warm. A background cache warmer refreshes the most requested weather and exchange-rate
+entries before they expire (CACHE_WARMER_* settings, see app/utils/cache_warmer.py).
 """
 
 import logging
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,14 +30,64 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize FastMCP server
-mcp = FastMCP("external-api-server")
-
 # Import tools
 from app.tools import (
     FetchWeatherTool,
     FetchExchangeRateTool,
+    ConvertAmountsTool,
+    ToolRegistry,
 )
+from app.tools.fetch_exchange_rate.fetch_exchange_rate_service import ExchangeRateService
+from app.tools.warmup import open_http_pool
+from app.utils import CacheWarmer, get_async_client, get_cache_stats, get_single_flight_stats, get_circuit_breaker_stats
+
+registry = ToolRegistry(
+    "external-api-server",
+    {
+        "fetch_weather": FetchWeatherTool,
+        "fetch_exchange_rate": FetchExchangeRateTool,
+        "convert_amounts": ConvertAmountsTool,
+    },
+    warmups={"http_pool": open_http_pool},
+)
+warmer = CacheWarmer()
+
+
+def watch_caches(warmer: CacheWarmer) -> None:
+    """Track popularity on the weather and exchange-rate caches and keep their hot keys warm."""
+    try:
+        weather = registry.get("fetch_weather").service
+        warmer.watch(weather.cache, weather.warm_async)
+    except ValueError as e:
+        logger.warning(f"Not warming weather cache: {e}")
+    rates = registry.get("fetch_exchange_rate").service
+    warmer.watch(rates.cache, lambda key: ExchangeRateService(pivot=key).warm_async())
+
+
+@asynccontextmanager
+async def lifespan(server):
+    # The async pool belongs to this event loop, so it is opened here rather than in a warm-up step
+    get_async_client()
+    registry.start()
+    enabled = os.getenv("CACHE_WARMER_ENABLED", "true").lower() in ("1", "true", "yes")
+    if enabled:
+        watch_caches(warmer)
+        warmer.start()
+    try:
+        yield
+    finally:
+        if enabled:
+            await warmer.stop()
+
+
+# Initialize FastMCP server
+mcp = FastMCP("external-api-server", lifespan=lifespan)
+
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> JSONResponse:
+    """200 once the tools are built and warm, 503 before."""
+    return JSONResponse(registry.status(), status_code=200 if registry.ready else 503)
 
 
 @mcp.tool()
@@ -42,8 +101,29 @@ async def fetch_weather(city: str) -> str:
         Temperature in Celsius, wind speed in km/h, condition, and metadata
     """
     try:
-        tool = FetchWeatherTool()
-        result = tool.run(city)
+        tool = registry.get("fetch_weather")
+        result = await tool.run_async(city)
+        return str(result)
+    except Exception as e:
+        return f"Error fetching weather: {str(e)}"
+
+
+@mcp.tool()
+async def fetch_weather_many(cities: list[str]) -> str:
+    """Retrieve current weather for several cities in one call.
+    
+    Cities are fetched concurrently; a city that fails gets an error entry while
+    the others still return data.
+    
+    Args:
+        cities: Names of the cities to fetch weather for (at most 50)
+        
+    Returns:
+        Weather per city in input order, with per-city errors and metadata
+    """
+    try:
+        tool = registry.get("fetch_weather")
+        result = await tool.run_many(cities)
         return str(result)
     except Exception as e:
         return f"Error fetching weather: {str(e)}"
@@ -61,13 +141,52 @@ async def fetch_exchange_rate(base_currency: str, target_currency: str) -> str:
         Exchange rate along with provider and timestamp metadata
     """
     try:
-        tool = FetchExchangeRateTool()
-        result = tool.run(base_currency, target_currency)
+        tool = registry.get("fetch_exchange_rate")
+        result = await tool.run_async(base_currency, target_currency)
         return str(result)
     except Exception as e:
         return f"Error fetching exchange rate: {str(e)}"
 
 
+@mcp.tool()
+async def convert_amounts(conversions: list[dict]) -> str:
+    """Convert many amounts between currencies in one call.
+    
+    All rates come from one cached rate table, so a whole list costs at most one
+    upstream request.
+    
+    Args:
+        conversions: List of {"amount": ..., "from_currency": ..., "to_currency": ...} objects
+        
+    Returns:
+        Converted amount and rate for each item, in input order, with provider and timestamp metadata
+    """
+    try:
+        tool = registry.get("convert_amounts")
+        result = await tool.run_async({"conversions": conversions})
+        return str(result)
+    except Exception as e:
+        return f"Error converting amounts: {str(e)}"
+
+
+@mcp.resource("metrics://upstream-cache", mime_type="application/json")
+def upstream_cache_stats() -> dict:
+    """Hit ratio per upstream cache and how many concurrent identical requests were coalesced."""
+    return {"caches": get_cache_stats(), "single_flight": get_single_flight_stats()}
+
+
+@mcp.resource("metrics://circuit-breakers", mime_type="application/json")
+def circuit_breaker_stats() -> dict:
+    """State, failure and slow-call rates, rejections and openings per upstream circuit breaker."""
+    return get_circuit_breaker_stats()
+
+
+@mcp.resource("metrics://cache-warmer", mime_type="application/json")
+def cache_warmer_stats() -> dict:
+    """Warmer runs, refreshes, errors, budget use and the currently hottest keys per cache."""
+    return warmer.stats()
+
+
 def main():
  """Initialize and run the MCP server with SSE."""
  port = int(os.getenv("SERVER_PORT", "8000"))
@@ -4,16 +4,26 @@ MCP Summarization Server
 
 Exposes tools for:
 - extract_pdf_text
+- extract_pdf_text_base64
 - summarize_text
 - summarize_pdf
+- summarize_pdfs
 - detect_language
+
+Tools are created once and warmed up at startup; GET /ready answers 200 once they are warm.
+PDF extraction and language detection run in worker processes, the LLM-bound tools on a
+thread pool, so no tool blocks the event loop (see app/tools/executor.py).
 """
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
 import logging
-from fastmcp import FastMCP
+from contextlib import asynccontextmanager
+from fastmcp import FastMCP, Context
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 # Configure logging to stderr (not stdout, as that breaks STDIO communication)
 logging.basicConfig(
@@ -23,50 +33,129 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize FastMCP server
-mcp = FastMCP("summarization-server")
-
 # Import tools
 from app.tools import (
     ExtractPDFTextTool,
     SummarizeTextTool,
     SummarizePDFTool,
+    SummarizePDFsTool,
     DetectLanguageTool,
+    ToolRegistry,
+    ToolExecutor,
+)
+from app.tools.warmup import load_language_profiles, open_http_pool, ping_llm
+from app.llm import get_route_stats
+from app.utils import get_text_store, TEXT_URI_PREFIX, AsyncSingleFlight
+
+# Tools that run in this process, on the executor's thread pool
+registry = ToolRegistry(
+    "summarization-server",
+    {
+        "summarize_text": SummarizeTextTool,
+        "summarize_pdf": SummarizePDFTool,
+        "summarize_pdfs": SummarizePDFsTool,
+    },
+    warmups={
+        "http_pool": open_http_pool,
+        "llm_ping": ping_llm,
+    },
+)
+# CPU-bound tools are built and warmed only in the executor's worker processes
+executor = ToolExecutor(
+    registry,
+    cpu_factories={
+        "extract_pdf_text": ExtractPDFTextTool,
+        "detect_language": DetectLanguageTool,
+    },
+    worker_warmups={"language_profiles": load_language_profiles},
 )
+registry.warmups["tool_workers"] = executor.warm
+# Worker processes cannot see each other's in-flight extractions, so identical ones are coalesced here
+extraction_flight = AsyncSingleFlight("extract_pdf_text")
+
+
+@asynccontextmanager
+async def lifespan(server):
+    registry.start()
+    try:
+        yield
+    finally:
+        executor.shutdown()
+        if registry.status()["tools"]["summarize_pdfs"] == "ready":
+            registry.get("summarize_pdfs").service.shutdown()
+
+
+# Initialize FastMCP server
+mcp = FastMCP("summarization-server", lifespan=lifespan)
+
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> JSONResponse:
+    """200 once the tools are built and warm, 503 before."""
+    return JSONResponse(registry.status(), status_code=200 if registry.ready else 503)
 
 
 @mcp.tool()
-async def extract_pdf_text(pdf_path_or_url: str) -> str:
+async def extract_pdf_text(pdf_path_or_url: str, pages: str | None = None, by_reference: bool = False) -> str:
     """Extract text from a PDF file given a local path or HTTP URL.
     
     Args:
         pdf_path_or_url: Local file path or HTTP URL to the PDF file
+        pages: Optional 1-based page selection such as "1-3,7"; only these pages are parsed
+        by_reference: Keep the text on the server and return a text_uri that
+            summarize_text (or the text://documents resource) can read
+        
+    Returns:
+        Extracted text (or text_uri), number of pages and per-page character offsets
+    """
+    try:
+        result = await extraction_flight.do(
+            (pdf_path_or_url, pages), lambda: executor.run("extract_pdf_text", "run", pdf_path_or_url, pages=pages)
+        )
+        if by_reference and result.get("success"):
+            # Extracted in a worker process; the text store lives in this one
+            result = ExtractPDFTextTool.store_by_reference(result)
+        return str(result)
+    except Exception as e:
+        return f"Error extracting PDF text: {str(e)}"
+
+
+@mcp.tool()
+async def extract_pdf_text_base64(pdf_base64: str, pages: str | None = None, by_reference: bool = False) -> str:
+    """Extract text from a PDF sent inline as base64-encoded bytes.
+    
+    The PDF is parsed from memory; nothing is written to disk.
+    
+    Args:
+        pdf_base64: Base64-encoded PDF file contents
+        pages: Optional 1-based page selection such as "1-3,7"
+        by_reference: Keep the text on the server and return a text_uri
         
     Returns:
-        Extracted text and number of pages
+        Extracted text (or text_uri), number of pages and per-page character offsets
     """
     try:
-        tool = ExtractPDFTextTool()
-        result = tool.run(pdf_path_or_url)
+        result = await executor.run("extract_pdf_text", "run_base64", pdf_base64, pages=pages)
+        if by_reference and result.get("success"):
+            result = ExtractPDFTextTool.store_by_reference(result)
         return str(result)
     except Exception as e:
         return f"Error extracting PDF text: {str(e)}"
 
 
 @mcp.tool()
-async def summarize_text(text: str) -> dict:
+async def summarize_text(text: str = "", text_uri: str | None = None) -> dict:
     """Summarize a given text using an LLM.
     
     Args:
         text: The text to summarize
+        text_uri: Reference returned by extract_pdf_text(by_reference=True), used instead of text
         
     Returns:
         Summary along with prompt and metadata information
     """
     try:
-        tool = SummarizeTextTool()
-        result = tool.run(text)
-        return result
+        return await executor.run("summarize_text", "run", text, text_uri=text_uri)
     except Exception as e:
         return {
             "summary": f"Error summarizing text: {str(e)}",
@@ -75,6 +164,24 @@ async def summarize_text(text: str) -> dict:
         }
 
 
+@mcp.resource(TEXT_URI_PREFIX + "{ref_id}", mime_type="text/plain")
+def stored_text(ref_id: str) -> str:
+    """Text stored server-side by extract_pdf_text(by_reference=True)."""
+    return get_text_store().get(ref_id)
+
+
+@mcp.resource("metrics://llm-routes", mime_type="application/json")
+def llm_route_stats() -> dict:
+    """Calls, latency, escalations and estimated tokens per LLM task and route."""
+    return get_route_stats()
+
+
+@mcp.resource("metrics://tool-executor", mime_type="application/json")
+def tool_executor_stats() -> dict:
+    """Pool, calls, errors, queue depth and wait/run time per tool."""
+    return executor.stats()
+
+
 @mcp.tool()
 async def summarize_pdf(file_path: str) -> str:
     """Summarize the content of a PDF file from a local path or HTTP URL.
@@ -86,10 +193,9 @@ async def summarize_pdf(file_path: str) -> str:
         Summary of the PDF document with metadata
     """
     try:
-        tool = SummarizePDFTool()
-        # Consume the generator and return the final summary
+        # The summarization events, collected on the thread pool
         summary_text = ""
-        for chunk in tool.run(file_path):
+        for chunk in await executor.run("summarize_pdf", "run", file_path):
             if isinstance(chunk, dict) and "partial_summary" in chunk:
                 summary_text += chunk["partial_summary"]
             elif isinstance(chunk, dict) and "final_summary" in chunk:
@@ -99,6 +205,40 @@ async def summarize_pdf(file_path: str) -> str:
         return f"Error summarizing PDF: {str(e)}"
 
 
+@mcp.tool()
+async def summarize_pdfs(file_paths: list[str], ctx: Context) -> str:
+    """Summarize a batch of PDF files from local paths or HTTP URLs.
+
+    Documents are extracted and summarized concurrently; each document's result
+    is reported as a progress message as soon as it completes.
+
+    Args:
+        file_paths: Local file paths or HTTP URLs to the PDF files
+
+    Returns:
+        Per-document summaries with metadata and aggregate throughput statistics
+    """
+    try:
+        tool = registry.get("summarize_pdfs")
+        events = tool.run(file_paths)
+        documents = []
+        throughput = {}
+        while True:
+            # The batch runs on worker pools; pull events off the event loop
+            event = await asyncio.to_thread(next, events, None)
+            if event is None:
+                break
+            if "throughput" in event:
+                throughput = event["throughput"]
+                continue
+            documents.append(event)
+            await ctx.report_progress(len(documents), len(file_paths))
+            await ctx.info(f"{event['status']}: {event['source']}")
+        return str({"documents": documents, "throughput": throughput})
+    except Exception as e:
+        return f"Error summarizing PDFs: {str(e)}"
+
+
 @mcp.tool()
 async def detect_language(text: str) -> str:
     """Detect the language of a given text string.
@@ -110,8 +250,7 @@ async def detect_language(text: str) -> str:
         ISO 639-1 language code and confidence score
     """
     try:
-        tool = DetectLanguageTool()
-        result = tool.run(text)
+        result = await executor.run("detect_language", "run", text)
         return str(result)
     except Exception as e:
         return f"Error detecting language: {str(e)}"
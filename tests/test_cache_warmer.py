@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils import CacheWarmer, DecayingCountMinSketch, TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sketch_ranks_keys_and_decays_old_traffic():
+    clock = Clock()
+    sketch = DecayingCountMinSketch(width=64, depth=4, half_life_seconds=10, capacity=8, clock=clock)
+    for _ in range(8):
+        sketch.add("london")
+    for _ in range(2):
+        sketch.add("paris")
+    assert [key for key, _ in sketch.top(2)] == ["london", "paris"]
+    assert sketch.estimate("london") >= 8
+
+    # Ten seconds later london's 8 requests count as 4, so fresh traffic overtakes it
+    clock.now = 10
+    for _ in range(6):
+        sketch.add("tokyo")
+    top = sketch.top(3)
+    assert [key for key, _ in top] == ["tokyo", "london", "paris"]
+    assert round(top[1][1]) == 4
+
+
+async def test_warmer_refreshes_hot_keys_before_expiry_within_budget():
+    clock = Clock()
+    cache = TTLCache("test-warmer", ttl=100, clock=clock)
+    warmer = CacheWarmer(top_n=3, lead_seconds=10, max_calls_per_minute=1, half_life_seconds=600,
+                         min_count=2, clock=clock)
+    loads = []
+
+    async def load(key):
+        loads.append(key)
+        return f"{key}@{clock.now}"
+
+    warmer.watch(cache, lambda key: cache.refresh_async(key, lambda: load(key)))
+    for key, lookups in (("hot", 5), ("warm", 3), ("cold", 1)):
+        for _ in range(lookups):
+            await cache.get_or_load_async(key, lambda key=key: load(key))
+    loads.clear()
+
+    assert await warmer.warm_once() == 0  # nothing close to expiry yet
+
+    # Hot and warm are due (cold is below min_count), but the budget allows one upstream call per minute
+    clock.now = 95
+    assert await warmer.warm_once() == 1
+    assert loads == ["hot"]
+    assert warmer.stats()["over_budget"] == 1
+    value, info = await cache.get_or_load_async("hot", lambda: load("hot"))
+    assert (value, info["status"]) == ("hot@95", "hit")
+
+    clock.now = 120
+    assert await warmer.warm_once() == 0
+    # Warm expired at 100; an expired value is reloaded by its next lookup, not by the warmer
+    clock.now = 155
+    assert await warmer.warm_once() == 0
+    assert loads == ["hot"]
+    clock.now = 190
+    assert await warmer.warm_once() == 1
+    assert loads == ["hot", "hot"]
+    assert cache.stats()["warmed"] == 2
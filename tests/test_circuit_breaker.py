@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+from app.utils import CircuitBreaker, CircuitOpenError, get_circuit_breaker_stats
+import pytest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "http://upstream.test")
+    return httpx.HTTPStatusError(f"{status}", request=request, response=httpx.Response(status, request=request))
+
+
+def fail(error):
+    def call():
+        raise error
+    return call
+
+
+def test_opens_on_failure_rate_and_recovers_after_probe():
+    clock = Clock()
+    breaker = CircuitBreaker("test-failures", failure_rate_threshold=0.5, window_size=4, min_calls=4,
+                             open_seconds=30, slow_call_seconds=10, clock=clock)
+    breaker.call(lambda: "ok")
+    breaker.call(lambda: "ok")
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            breaker.call(fail(status_error(503)))
+    assert breaker.state == "open"
+
+    calls = []
+    with pytest.raises(CircuitOpenError, match="retry in 30s"):
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+
+    clock.now = 31
+    assert breaker.state == "half_open"
+    assert breaker.call(lambda: "probe") == "probe"
+    assert breaker.state == "closed"
+    stats = get_circuit_breaker_stats()["test-failures"]
+    assert (stats["opened"], stats["rejected"]) == (1, 1)
+
+
+def test_failed_probe_reopens_and_client_errors_do_not_count():
+    clock = Clock()
+    breaker = CircuitBreaker("test-probe", failure_rate_threshold=0.5, window_size=2, min_calls=2,
+                             open_seconds=10, slow_call_seconds=10, clock=clock)
+    for _ in range(5):
+        with pytest.raises(httpx.HTTPStatusError):
+            breaker.call(fail(status_error(404)))
+    assert breaker.state == "closed"
+
+    with pytest.raises(httpx.ConnectError):
+        breaker.call(fail(httpx.ConnectError("refused")))
+    assert breaker.state == "open"
+
+    clock.now = 11
+    with pytest.raises(httpx.HTTPStatusError):
+        breaker.call(fail(status_error(429)))
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+
+
+def test_opens_on_slow_calls():
+    clock = Clock()
+    breaker = CircuitBreaker("test-slow", slow_call_seconds=2, slow_call_rate_threshold=0.5, window_size=4,
+                             min_calls=4, open_seconds=10, clock=clock)
+
+    def slow():
+        clock.now += 3
+        return "late"
+
+    for _ in range(3):
+        breaker.call(lambda: "fast")
+    assert breaker.call(slow) == "late"
+    assert breaker.state == "closed"
+    breaker.call(slow)
+    assert breaker.state == "open"
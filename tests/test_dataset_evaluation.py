@@ -0,0 +1,117 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.dataset_evaluation import DatasetEvaluationRunner
+from app.tools.evaluate_llm.evaluate_llm_service_responses import EvaluateLLMResponsesService
+import json
+import pytest
+
+
+class StubChecker:
+    def run(self, input_data: dict) -> dict:
+        return {"result": {"hallucination_detected": input_data["response"].endswith("!")}}
+
+
+def write_dataset(path, rows: int):
+    with open(path, "w") as f:
+        for i in range(rows):
+            f.write(json.dumps({"id": i, "ground_truth": f"the cat sat on mat {i}", "response": f"a cat sat {i}!"}) + "\n")
+        f.write("not json\n")
+    return str(path)
+
+
+def read_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_runner_writes_ordered_results(tmp_path):
+    dataset = write_dataset(tmp_path / "data.jsonl", 25)
+    output = str(tmp_path / "out.jsonl")
+
+    summary = DatasetEvaluationRunner(
+        dataset, output, chunk_size=4, metric_workers=2, hallucination_checker=StubChecker()
+    ).run()
+
+    results = read_results(output)
+    assert summary["rows_done"] == summary["total_rows"] == 26
+    assert [r["row"] for r in results] == list(range(26))
+    expected = EvaluateLLMResponsesService().evaluate_batch(
+        [{"ground_truth": f"the cat sat on mat {i}", "response": f"a cat sat {i}!"} for i in range(25)]
+    )
+    assert [r["scores"] for r in results[:25]] == expected
+    assert results[3]["id"] == 3 and results[3]["hallucination"] == {"hallucination_detected": True}
+    assert results[25]["error"].startswith("Invalid row")
+
+
+def test_runner_resumes_after_crash(tmp_path):
+    dataset = write_dataset(tmp_path / "data.jsonl", 30)
+    output = str(tmp_path / "out.jsonl")
+    reference = str(tmp_path / "reference.jsonl")
+    DatasetEvaluationRunner(dataset, reference, chunk_size=5, metric_workers=1).run()
+
+    def crash(progress):
+        if progress["rows_done"] >= 10:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        DatasetEvaluationRunner(dataset, output, chunk_size=5, metric_workers=1, on_progress=crash).run()
+    assert len(read_results(output)) == 10
+
+    summary = DatasetEvaluationRunner(dataset, output, chunk_size=5, metric_workers=1).run()
+
+    assert summary["rows_done"] == 31
+    assert read_results(output) == read_results(reference)
+
+
+def test_runner_removes_checkpoint_and_ignores_stale_one(tmp_path):
+    dataset = write_dataset(tmp_path / "data.jsonl", 12)
+    output = str(tmp_path / "out.jsonl")
+
+    def crash(progress):
+        if progress["rows_done"] >= 5:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        DatasetEvaluationRunner(dataset, output, chunk_size=5, metric_workers=1, on_progress=crash).run()
+    assert os.path.exists(f"{output}.checkpoint")
+
+    # The input changed after the crash: the checkpoint's offsets no longer apply
+    write_dataset(tmp_path / "data.jsonl", 8)
+    summary = DatasetEvaluationRunner(dataset, output, chunk_size=5, metric_workers=1).run()
+
+    assert summary["rows_done"] == 9
+    assert [r["row"] for r in read_results(output)] == list(range(9))
+    assert not os.path.exists(f"{output}.checkpoint")
+
+    summary = DatasetEvaluationRunner(dataset, output, chunk_size=5, metric_workers=1).run()
+    assert summary["rows_done"] == 9 and len(read_results(output)) == 9
+
+
+def test_runner_ignores_checkpoint_when_input_rewritten_in_place(tmp_path):
+    dataset = write_dataset(tmp_path / "data.jsonl", 12)
+    output = str(tmp_path / "out.jsonl")
+
+    def crash(progress):
+        if progress["rows_done"] >= 5:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        DatasetEvaluationRunner(dataset, output, chunk_size=5, metric_workers=1, on_progress=crash).run()
+
+    # Same size, new contents and a later modification time
+    stat = os.stat(dataset)
+    with open(dataset) as f:
+        rewritten = f.read().replace("cat", "dog")
+    with open(dataset, "w") as f:
+        f.write(rewritten)
+    os.utime(dataset, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert os.path.getsize(dataset) == stat.st_size
+
+    summary = DatasetEvaluationRunner(dataset, output, chunk_size=5, metric_workers=1).run()
+    reference = str(tmp_path / "reference.jsonl")
+    DatasetEvaluationRunner(dataset, reference, chunk_size=5, metric_workers=1).run()
+
+    assert summary["rows_done"] == 13
+    assert read_results(output) == read_results(reference)
@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.tools.evaluate_llm.metrics import (
+    CosineSimilarityMetric,
+    VectorizedMetrics,
+    fit_tfidf_model,
+    load_tfidf_model,
+    save_tfidf_model,
+)
+from app.tools.evaluate_llm.evaluate_llm_service_responses import EvaluateLLMResponsesService
+import pytest
+
+CORPUS = [
+    "the cat sat on the mat",
+    "the dog chased the cat",
+    "stock markets rallied as inflation cooled",
+    "the central bank held interest rates steady",
+]
+
+
+@pytest.mark.parametrize("hashing", [False, True])
+def test_persisted_tfidf_model_scores(tmp_path, hashing):
+    path = str(tmp_path / "model.joblib")
+    save_tfidf_model(fit_tfidf_model(CORPUS, hashing=hashing, n_features=2 ** 12), path)
+    metric = CosineSimilarityMetric(model=load_tfidf_model(path))
+
+    assert metric.compute("the cat sat", "the cat sat") == pytest.approx(1.0)
+    assert metric.compute("the cat sat", "interest rates") == pytest.approx(0.0)
+    # "the" is frequent in the corpus, so it matters less than "cat"
+    assert metric.compute("the cat", "a cat") > metric.compute("the cat", "the dog")
+
+
+def test_cosine_without_model_fits_on_pair():
+    metric = CosineSimilarityMetric(model=None)
+
+    assert metric.model is None
+    assert metric.compute("alpha beta", "alpha beta") == pytest.approx(1.0)
+
+
+def test_batch_evaluation_matches_pairwise_metrics():
+    service = EvaluateLLMResponsesService()
+    ground_truth = "Python is a programming language created by Guido van Rossum."
+    pairs = [
+        {"ground_truth": ground_truth, "response": "Python is a language by Guido van Rossum in 1989."},
+        {"ground_truth": ground_truth, "response": "Python, python: a snake!"},
+        {"ground_truth": "The cat sat on the mat", "response": "the the cat cat"},
+        {"ground_truth": "short", "response": "a much longer response with many extra words"},
+    ]
+
+    batch = service.evaluate_batch(pairs)
+
+    for pair, scores in zip(pairs, batch):
+        expected = service.evaluate(pair["ground_truth"], pair["response"])
+        assert scores == pytest.approx(expected)
+
+
+def test_vectorized_metrics_handle_token_free_pairs():
+    scores = VectorizedMetrics().compute(["a"], ["b"])
+
+    assert scores["cosine_similarity"][0] == 0.0
+    assert scores["lexical_similarity"][0] == 0.0
+    assert scores["conciseness_score"][0] == 1.0
+
+
+def test_analyzed_text_is_shared_and_cached():
+    from app.tools.evaluate_llm.metrics import analyze_text
+
+    analyzed = analyze_text("The cat, the CAT sat")
+
+    assert analyzed is analyze_text("The cat, the CAT sat")
+    assert analyzed.tokens == ("the", "cat,", "the", "cat", "sat")
+    assert analyzed.token_set == {"the", "cat,", "cat", "sat"}
+    assert analyzed.length == 5
+    assert analyzed.term_counts == {"the": 2, "cat": 2, "sat": 1}
+    # Shared between callers, so it must not be mutable
+    with pytest.raises(TypeError):
+        analyzed.term_counts["cat"] = 0
+
+
+def test_closed_form_cosine_matches_pair_fitted_vectorizer():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    metric = CosineSimilarityMetric(model=None)
+    for ground_truth, response in [
+        ("Python is a programming language.", "Python, python: a snake!"),
+        ("the the cat", "cat dog dog"),
+        ("alpha", "beta"),
+    ]:
+        vectors = TfidfVectorizer().fit_transform([ground_truth, response])
+        expected = cosine_similarity(vectors[0], vectors[1])[0][0]
+        assert metric.compute(ground_truth, response) == pytest.approx(expected)
+    with pytest.raises(ValueError, match="empty vocabulary"):
+        metric.compute("a", "b")
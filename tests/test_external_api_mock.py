@@ -0,0 +1,191 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.mock_upstream import MockUpstream
+from app.tools.fetch_weather.fetch_weather_service import WeatherService, _weather_cache
+from app.tools.fetch_exchange_rate.fetch_exchange_rate_service import ExchangeRateService, _rate_table_cache
+from app.tools import FetchWeatherTool
+import httpx
+import pytest
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    server = MockUpstream(seed=0).start_in_thread()
+    monkeypatch.setenv("OPEN_WEATHER_MAP_BASE_URL", server.base_url)
+    monkeypatch.setenv("EXCHANGE_RATE_API_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPEN_WEATHER_MAP_API_KEY", "test-key")
+    monkeypatch.setenv("EXCHANGE_RATE_API_KEY", "test-key")
+    _weather_cache.invalidate()
+    _rate_table_cache.invalidate()
+    yield server
+    server.stop()
+
+
+def test_services_use_configured_base_urls(upstream):
+    weather = WeatherService().fetch_weather("Cairo")
+    rate = ExchangeRateService().fetch_rate("USD", "EUR")
+
+    assert weather["city"] == "Cairo"
+    assert weather["cache"]["status"] == "miss"
+    assert rate["rate"] == 0.92
+    assert rate["endpoint"] == upstream.base_url + "/v6"
+    assert upstream.requests == {"weather": 1, "latest": 1}
+
+
+def test_weather_cache_normalizes_cities(upstream):
+    first = WeatherService().fetch_weather("London, UK")
+    second = WeatherService().fetch_weather("  london ,gb ")
+
+    assert second["cache"]["status"] == "hit"
+    assert second["city"] == "  london ,gb "
+    assert second["temperature_celsius"] == first["temperature_celsius"]
+    assert upstream.requests == {"weather": 1}
+
+
+def test_mock_upstream_errors(upstream):
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError, match="404"):
+            WeatherService().fetch_weather("Unknownville")
+    assert upstream.requests["weather"] == 1
+    with pytest.raises(ValueError, match="Unsupported currency code: XXX"):
+        ExchangeRateService().fetch_rate("USD", "XXX")
+
+    _rate_table_cache.invalidate()
+    upstream.error_rate = 1.0
+    with pytest.raises(httpx.HTTPStatusError, match="503"):
+        ExchangeRateService().fetch_rate("USD", "EUR")
+
+
+def test_exchange_rates_derived_from_one_table(upstream):
+    service = ExchangeRateService()
+    pairs = [("EUR", "GBP"), ("gbp", "jpy"), ("JPY", "EUR"), ("CHF", "CHF"), ("USD", "INR")]
+    rates = {pair: service.fetch_rate(*pair) for pair in pairs}
+
+    assert rates[("EUR", "GBP")]["rate"] == pytest.approx(0.79 / 0.92)
+    assert rates[("gbp", "jpy")]["rate"] == pytest.approx(151.2 / 0.79)
+    assert rates[("CHF", "CHF")]["rate"] == 1.0
+    assert rates[("USD", "INR")]["cache"]["status"] == "hit"
+    assert upstream.requests == {"latest": 1}
+
+
+def test_mock_upstream_latest_table(upstream):
+    table = httpx.get(f"{upstream.base_url}/v6/test-key/latest/EUR").json()
+
+    assert table["base_code"] == "EUR"
+    assert table["conversion_rates"]["EUR"] == 1.0
+    assert table["conversion_rates"]["USD"] == pytest.approx(1 / 0.92, rel=1e-5)
+
+
+def test_convert_amounts_uses_one_table(upstream):
+    from app.tools import ConvertAmountsTool
+
+    result = ConvertAmountsTool().run({"conversions": [
+        {"amount": 100, "from_currency": "USD", "to_currency": "EUR"},
+        {"amount": 50.5, "from_currency": "eur", "to_currency": "GBP"},
+        {"amount": 10, "from_currency": "JPY", "to_currency": "JPY"},
+        {"amount": 1, "from_currency": "XXX", "to_currency": "YYY"},
+    ]})
+    conversions = result["data"]["conversions"]
+
+    assert conversions[0]["converted_amount"] == pytest.approx(92.0)
+    assert conversions[1]["rate"] == pytest.approx(0.79 / 0.92)
+    assert conversions[1]["converted_amount"] == pytest.approx(50.5 * 0.79 / 0.92)
+    assert conversions[2]["converted_amount"] == 10.0
+    assert conversions[3] == {"amount": 1, "from_currency": "XXX", "to_currency": "YYY",
+                              "error": "Unsupported currency code: XXX"}
+    assert result["metadata"]["cache"]["status"] == "miss"
+    assert upstream.requests == {"latest": 1}
+
+    with pytest.raises(ValueError, match="Invalid input data"):
+        ConvertAmountsTool().run({"conversions": [{"amount": "ten", "from_currency": "USD", "to_currency": "EUR"}]})
+
+
+async def test_fetch_weather_many_concurrent_with_partial_results(upstream):
+    from app.utils.http_client import close_async_client
+    import time
+
+    upstream.latency_ms = 200
+    WeatherService().fetch_weather("Paris")
+    cities = ["Paris", "Berlin", "berlin ", "Unknownville", "Rome", "Madrid", "Oslo", "Vienna", "Lisbon"]
+
+    started = time.perf_counter()
+    result = await FetchWeatherTool().run_many(cities)
+    elapsed = time.perf_counter() - started
+    await close_async_client()
+
+    results = result["data"]["results"]
+    assert [item["city"] for item in results] == cities
+    assert results[0]["cache"]["status"] == "hit"
+    assert results[1]["temperature_celsius"] == results[2]["temperature_celsius"]
+    assert results[3] == {"city": "Unknownville", "error": "City not found"}
+    assert result["metadata"]["failed"] == 1
+    # 7 distinct lookups at 200 ms each, all in flight at once
+    assert upstream.requests["weather"] == 8
+    assert elapsed < 1.0
+
+
+async def test_async_tools_share_cache_with_sync_paths(upstream):
+    from app.tools import FetchExchangeRateTool, ConvertAmountsTool
+    from app.utils.http_client import close_async_client
+
+    rate = await FetchExchangeRateTool().run_async("EUR", "USD")
+    converted = await ConvertAmountsTool().run_async(
+        {"conversions": [{"amount": 2, "from_currency": "USD", "to_currency": "GBP"}]}
+    )
+    weather = await FetchWeatherTool().run_async("Cairo")
+    sync_weather = FetchWeatherTool().run("cairo")
+    await close_async_client()
+
+    assert rate["data"]["exchange_rate"] == pytest.approx(1 / 0.92)
+    assert converted["data"]["conversions"][0]["converted_amount"] == pytest.approx(1.58)
+    assert converted["metadata"]["cache"]["status"] == "hit"
+    assert sync_weather["data"]["temperature_celsius"] == weather["data"]["temperature_celsius"]
+    assert sync_weather["metadata"]["cache"]["status"] == "hit"
+    assert upstream.requests == {"latest": 1, "weather": 1}
+
+
+def test_last_known_weather_served_while_upstream_fails(upstream):
+    from app.utils import CircuitBreaker, CircuitOpenError, TTLCache
+    from app.utils.circuit_breaker import is_upstream_failure
+
+    now = [0.0]
+    cache = TTLCache("test-weather-fallback", ttl=10, fallback_if=is_upstream_failure, clock=lambda: now[0])
+    breaker = CircuitBreaker("test-openweathermap", window_size=2, min_calls=2, open_seconds=60)
+    service = WeatherService(cache=cache, breaker=breaker)
+    fresh = service.fetch_weather("Cairo")
+
+    now[0] = 100
+    upstream.error_rate = 1.0
+    for _ in range(3):
+        fallback = service.fetch_weather("Cairo")
+        assert fallback["cache"]["status"] == "fallback"
+        assert fallback["cache"]["stale"] is True
+        assert fallback["temperature_celsius"] == fresh["temperature_celsius"]
+
+    # One success and one 503 reach the 50% failure rate; later calls never reach upstream
+    assert breaker.state == "open"
+    assert upstream.requests["weather"] == 2
+    with pytest.raises(CircuitOpenError):
+        service.fetch_weather("Lima")
+
+
+async def test_warmer_refreshes_popular_city_ahead_of_expiry(upstream):
+    from app.utils import CacheWarmer, TTLCache
+
+    now = [0.0]
+    service = WeatherService(cache=TTLCache("test-weather-warm", ttl=600, clock=lambda: now[0]))
+    warmer = CacheWarmer(lead_seconds=60, max_calls_per_minute=10, clock=lambda: now[0])
+    warmer.watch(service.cache, service.warm_async)
+    for _ in range(3):
+        await service.fetch_weather_async("London, UK")
+    assert upstream.requests["weather"] == 1
+
+    now[0] = 580
+    assert await warmer.warm_once() == 1
+    assert upstream.requests["weather"] == 2
+    now[0] = 700
+    result = await service.fetch_weather_async("london,gb")
+    assert result["cache"]["status"] == "hit"
+    assert upstream.requests["weather"] == 2
@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.llm import CassetteLLMClient, SyntheticLLMClient, create_llm_client
+from app.llm.fake_clients import SyntheticLLMError, ThrottledError
+from app.tools.hallucination_checker import HallucinationCheckerTool
+from app.tools.summarize_text import SummarizeTextTool
+import pytest
+
+
+def test_cassette_records_then_replays(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    recorder = CassetteLLMClient(path, model="m", record=True, inner=SyntheticLLMClient(model="m"))
+    schema = {"type": "object", "required": ["summary"], "properties": {"summary": {"type": "string"}}}
+
+    recorded = recorder.generate("sys", "Summarize: alpha beta", response_schema=schema)
+    replayed = CassetteLLMClient(path, model="m").generate("sys", "Summarize: alpha beta", response_schema=schema)
+
+    assert replayed == recorded
+    assert recorded["json"] == {"summary": "Summarize: alpha beta"}
+    with pytest.raises(KeyError, match="No recorded response"):
+        CassetteLLMClient(path, model="m").generate("sys", "unrecorded prompt")
+
+
+def test_synthetic_client_injects_errors_and_throttles():
+    with pytest.raises(SyntheticLLMError):
+        SyntheticLLMClient(error_rate=1.0).generate("sys", "prompt")
+
+    throttled = SyntheticLLMClient(rate_limit=2)
+    throttled.generate("sys", "one")
+    throttled.generate("sys", "two")
+    with pytest.raises(ThrottledError):
+        throttled.generate("sys", "three")
+
+
+def test_tools_run_offline_with_synthetic_client(monkeypatch):
+    monkeypatch.setenv("LLM_CLIENT_MODE", "synthetic")
+    assert isinstance(create_llm_client("any-model"), SyntheticLLMClient)
+
+    summary = SummarizeTextTool(llm_client=SyntheticLLMClient()).run("Some long text about synthetic clients.")
+    checker = HallucinationCheckerTool(llm=SyntheticLLMClient())
+    batch = checker.run_batch({"ground_truth": "The sky is blue.", "responses": ["Grass is red.", "Snow is hot."]})
+
+    assert summary["summary"].endswith("synthetic clients.")
+    assert [r["has_hallucination"] for r in batch["results"]] == [False, False]
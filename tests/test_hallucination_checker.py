@@ -0,0 +1,189 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.tools.hallucination_checker import SupportFilter, get_prefilter_stats
+from app.tools.hallucination_checker.hallucination_checker_service import HallucinationCheckerService
+
+GROUND_TRUTH = (
+    "Python is a programming language created by Guido van Rossum. "
+    "It was first released in 1991. Python emphasizes code readability."
+)
+
+
+class RecordingLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, system_prompt, user_prompt, response_schema=None, response_type=None, temperature=None):
+        self.prompts.append(user_prompt)
+        return {"json": {"has_hallucination": True, "hallucinated_statements": ["x"], "explanation": "llm"},
+                "model": "recording-model"}
+
+
+def test_supported_response_skips_llm():
+    llm = RecordingLLM()
+    service = HallucinationCheckerService(llm, prefilter=SupportFilter(threshold=0.9))
+    before = get_prefilter_stats()["llm_calls_avoided"]
+
+    result = service.check(GROUND_TRUTH, "It was first released in 1991. Python emphasizes code readability!")
+
+    assert result["has_hallucination"] is False
+    assert llm.prompts == []
+    assert get_prefilter_stats()["llm_calls_avoided"] == before + 1
+
+
+def test_only_unsupported_sentences_reach_llm():
+    llm = RecordingLLM()
+    service = HallucinationCheckerService(llm, prefilter=SupportFilter(threshold=0.9))
+
+    result = service.check(GROUND_TRUTH, "Python was first released in 1989. Python emphasizes code readability.")
+
+    assert result["explanation"] == "llm"
+    response_part = llm.prompts[0].split("RESPONSE:")[1]
+    assert "released in 1989" in response_part
+    assert "readability" not in response_part
+
+
+def test_disabled_prefilter_always_calls_llm():
+    llm = RecordingLLM()
+    HallucinationCheckerService(llm, prefilter=SupportFilter(enabled=False)).check(GROUND_TRUTH, GROUND_TRUTH)
+
+    assert len(llm.prompts) == 1
+
+
+def test_long_ground_truth_is_narrowed_to_relevant_passages():
+    from app.tools.hallucination_checker import PassageRetriever, get_passage_index
+
+    filler = [f"Section {i} describes unrelated topic number {i} in detail." for i in range(200)]
+    filler[120] = "The Eiffel Tower was completed in 1889 for the World Fair."
+    ground_truth = " ".join(filler)
+    llm = RecordingLLM()
+    service = HallucinationCheckerService(
+        llm, prefilter=SupportFilter(enabled=False), retriever=PassageRetriever(top_k=1, min_chars=1000)
+    )
+
+    service.check(ground_truth, "The Eiffel Tower was completed in 1901.")
+
+    reference = llm.prompts[0].split("GROUND TRUTH:")[1].split("RESPONSE:")[0]
+    assert "Eiffel Tower was completed in 1889" in reference
+    assert len(reference) < len(ground_truth) / 20
+    assert get_passage_index(ground_truth) is get_passage_index(ground_truth)
+
+
+class BatchLLM(RecordingLLM):
+    def __init__(self, broken=False):
+        super().__init__()
+        self.broken = broken
+
+    def generate(self, system_prompt, user_prompt, response_schema=None, response_type=None, temperature=None):
+        self.prompts.append(user_prompt)
+        if "RESPONSES:" not in user_prompt:
+            return {"json": {"has_hallucination": True, "hallucinated_statements": [], "explanation": "single"}}
+        count = user_prompt.split("RESPONSES:")[1].count("\n[")
+        results = [
+            {"index": i, "has_hallucination": True, "hallucinated_statements": [], "explanation": "batched"}
+            for i in range(count - 1 if self.broken else count)
+        ]
+        return {"json": {"results": results}}
+
+
+def test_check_batch_packs_responses_into_budgeted_calls():
+    llm = BatchLLM()
+    service = HallucinationCheckerService(llm, prefilter=SupportFilter(threshold=0.9), batch_max_items=2)
+    responses = [
+        "Python emphasizes code readability.",
+        "Python was released in 1989.",
+        "Guido invented Java.",
+        "Python is a snake.",
+    ]
+
+    results = service.check_batch(GROUND_TRUTH, responses)
+
+    assert results[0]["has_hallucination"] is False
+    assert [r["explanation"] for r in results[1:]] == ["batched"] * 3
+    assert len(llm.prompts) == 2
+    assert llm.prompts[0].count(GROUND_TRUTH.split(".")[0]) == 1
+
+
+def test_check_batch_falls_back_to_single_checks():
+    llm = BatchLLM(broken=True)
+    service = HallucinationCheckerService(llm, prefilter=SupportFilter(enabled=False))
+
+    results = service.check_batch(GROUND_TRUTH, ["Python is a snake.", "Guido invented Java."])
+
+    assert [r["explanation"] for r in results] == ["single", "single"]
+    assert len(llm.prompts) == 3
+
+
+def test_check_batch_narrows_reference_per_batch_within_budget():
+    from app.tools.hallucination_checker import PassageRetriever
+    from app.tools.hallucination_checker.hallucination_checker_prompt import SYSTEM_PROMPT
+
+    ground_truth = " ".join(f"Landmark {i} named Tower{i} opened in year {1800 + i}." for i in range(300))
+    responses = [f"Tower{i} opened in year 2{i:03d}." for i in range(0, 300, 15)]
+    llm = BatchLLM()
+    service = HallucinationCheckerService(
+        llm, prefilter=SupportFilter(enabled=False), retriever=PassageRetriever(top_k=3, min_chars=1000),
+        batch_token_budget=700,
+    )
+
+    results = service.check_batch(ground_truth, responses)
+
+    assert [r["explanation"] for r in results] == ["batched"] * len(responses)
+    assert 1 < len(llm.prompts) < len(responses)
+    for prompt in llm.prompts:
+        assert (len(prompt) + len(SYSTEM_PROMPT)) // 4 <= 700
+        reference = prompt.split("RESPONSES:")[0]
+        for line in prompt.split("RESPONSES:")[1].splitlines():
+            if line.startswith("["):
+                assert f"named {line.split()[1]} opened" in reference
+
+
+def test_reference_over_budget_keeps_fewer_passages():
+    from app.tools.hallucination_checker import PassageRetriever
+
+    ground_truth = " ".join(f"Landmark {i} named Tower{i} opened in year {1800 + i}." for i in range(300))
+    retriever = PassageRetriever(top_k=3, min_chars=1000)
+    service = HallucinationCheckerService(BatchLLM(), retriever=retriever)
+    claims = ["Tower5 and Tower6 and Tower7 opened in year 1805."]
+
+    full = retriever.narrow(ground_truth, claims)
+    selected, reference = service._fit_reference(ground_truth, claims, len(full) // 4 - 1)
+
+    assert len(reference) // 4 <= len(full) // 4 - 1
+    assert len(selected) < len(retriever.select(ground_truth, claims))
+
+
+def test_tool_reports_the_prompt_sent_to_the_llm():
+    from app.tools.hallucination_checker import HallucinationCheckerTool
+
+    tool = HallucinationCheckerTool(llm=RecordingLLM())
+    tool.service.prefilter = SupportFilter(threshold=0.9)
+
+    output = tool.run({
+        "ground_truth": GROUND_TRUTH,
+        "response": "Python was first released in 1989. Python emphasizes code readability.",
+    })
+    assert output["prompt"]["user"] == tool.service.llm.prompts[0]
+    assert output["metadata"]["model"] == "recording-model"
+    assert "readability" not in output["prompt"]["user"].split("RESPONSE:")[1]
+
+    output = tool.run({"ground_truth": GROUND_TRUTH, "response": "Python emphasizes code readability."})
+    assert output["prompt"]["user"] is None
+    assert output["metadata"]["model"] is None
+    assert len(tool.service.llm.prompts) == 1
+
+
+def test_true_pieces_recombined_into_a_false_statement_reach_llm():
+    llm = RecordingLLM()
+    service = HallucinationCheckerService(llm, prefilter=SupportFilter(threshold=0.9))
+    ground_truth = "Paris is the capital of France. Berlin is the capital of Germany."
+
+    assert SupportFilter(threshold=0.9).unsupported_sentences(ground_truth, "Paris is the capital of Germany.") == (
+        ["Paris is the capital of Germany."], 1
+    )
+    result = service.check(ground_truth, "Paris is the capital of Germany.")
+
+    assert result["has_hallucination"] is True
+    assert len(llm.prompts) == 1
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.llm import ModelRouter, get_route_stats
+
+MODELS = {"fast": "tiny", "default": "medium", "strong": "large"}
+
+
+class ScriptedClient:
+    """Answers with the confidence configured for its model."""
+    confidence = {"tiny": 0.9, "medium": 0.4, "large": 0.95}
+
+    def __init__(self, model):
+        self.model = model
+
+    def generate(self, system_prompt, user_prompt, response_schema=None, response_type=None, temperature=0.0):
+        return {"json": {"answer": self.model, "confidence": self.confidence[self.model]}, "model": self.model}
+
+
+def test_small_inputs_use_fast_route():
+    router = ModelRouter("router-test-small", models=MODELS, small_input_chars=100, client_factory=ScriptedClient)
+
+    result = router.generate("sys", "short prompt", response_schema={"type": "object"})
+
+    assert result["model"] == "tiny"
+    assert get_route_stats()["router-test-small/fast"]["calls"] == 1
+
+
+def test_low_confidence_escalates_to_strong_route():
+    router = ModelRouter("router-test-escalate", models=MODELS, small_input_chars=10,
+                         escalation_confidence=0.7, client_factory=ScriptedClient)
+
+    result = router.generate("sys", "a much longer prompt", response_schema={"type": "object"})
+
+    assert result["model"] == "large"
+    stats = get_route_stats()
+    assert stats["router-test-escalate/default"]["calls"] == 1
+    assert stats["router-test-escalate/strong"]["escalations"] == 1
+
+
+def test_escalation_can_be_disabled():
+    router = ModelRouter("router-test-off", models=MODELS, small_input_chars=10, escalation=False,
+                         client_factory=ScriptedClient)
+
+    assert router.generate("sys", "a much longer prompt", response_schema={"type": "object"})["model"] == "medium"
+
+
+def test_routes_differ_by_size_and_task(monkeypatch):
+    from app.llm import route_models
+
+    for route in ("FAST", "DEFAULT", "STRONG"):
+        monkeypatch.delenv(f"LLM_MODEL_{route}", raising=False)
+    models = route_models()
+    assert len(set(models.values())) == 3
+
+    summarize = ModelRouter("summarize", models=MODELS, small_input_chars=100, escalation=False,
+                            client_factory=ScriptedClient)
+    checker = ModelRouter("hallucination_check", models=MODELS, small_input_chars=100, escalation=False,
+                          client_factory=ScriptedClient)
+
+    assert summarize.generate("sys", "short prompt", response_schema={"type": "object"})["model"] == "tiny"
+    assert summarize.generate("sys", "x" * 200, response_schema={"type": "object"})["model"] == "medium"
+    assert checker.generate("sys", "short prompt", response_schema={"type": "object"})["model"] == "medium"
+
+    monkeypatch.setenv("LLM_ROUTE_SUMMARIZE", "strong")
+    pinned = ModelRouter("summarize", models=MODELS, client_factory=ScriptedClient)
+    assert pinned.generate("sys", "short prompt", response_schema={"type": "object"})["model"] == "large"
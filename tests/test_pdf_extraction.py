@@ -0,0 +1,166 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.tools.extract_pdf_text import ExtractPDFTextTool
+from app.tools.extract_pdf_text.PDF_source_loader import PDFSourceLoader
+from app.tools.extract_pdf_text.PDF_text_extractor import PDFTextExtractor
+from app.tools.extract_pdf_text.page_ranges import parse_page_ranges
+from app.utils import get_text_store
+from tests.pdf_factory import build_text_pdf, write_text_pdf
+import base64
+import pytest
+
+PAGES = [["First page, line one", "line two"], [], ["Third page"]]
+
+
+def test_streaming_extraction_matches_default(tmp_path):
+    pdf_path = write_text_pdf(tmp_path / "doc.pdf", PAGES)
+
+    default = PDFTextExtractor(streaming=False).extract(pdf_path)
+    streaming = PDFTextExtractor(streaming=True, spool_max_size=16).extract(pdf_path)
+
+    assert streaming == default
+    assert streaming == ("First page, line one\nline two\nThird page", 3)
+
+
+def test_streaming_extraction_enforces_memory_limit(tmp_path, monkeypatch):
+    from app.tools.extract_pdf_text import PDF_text_extractor
+
+    pdf_path = write_text_pdf(tmp_path / "doc.pdf", [[f"page {i}"] for i in range(10)])
+    # RSS grows by 10 MB per page from 100 MB, so a 150 MB limit trips on the seventh page (160 MB)
+    rss = iter(range(100 * 2**20, 1000 * 2**20, 10 * 2**20))
+    monkeypatch.setattr(PDF_text_extractor, "_current_rss_bytes", lambda: next(rss))
+    extractor = PDFTextExtractor(streaming=True, memory_limit_mb=150, memory_check_interval=1)
+    with pytest.raises(MemoryError, match="memory limit of 150 MB after 7 pages"):
+        extractor.extract(pdf_path)
+
+    # Where the current RSS cannot be read the limit is not checked
+    monkeypatch.setattr(PDF_text_extractor, "_current_rss_bytes", lambda: None)
+    assert extractor.extract(pdf_path)[1] == 10
+
+
+def test_extract_to_file_returns_offsets_only(tmp_path):
+    pdf_path = write_text_pdf(tmp_path / "doc.pdf", PAGES)
+    with open(tmp_path / "doc.txt", "w+", encoding="utf-8") as out:
+        pages, spans = PDFTextExtractor(streaming=True).extract_to_file(pdf_path, out)
+        out.seek(0)
+        text = out.read()
+    assert pages == 3
+    assert text == "First page, line one\nline two\nThird page"
+    assert [text[span["start"]:span["end"]] for span in spans] == ["First page, line one\nline two", "", "Third page"]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_page_range_extraction_reports_offsets(tmp_path, streaming, caplog):
+    pdf_path = write_text_pdf(tmp_path / "doc.pdf", PAGES)
+
+    with caplog.at_level("WARNING"):
+        text, pages, spans = PDFTextExtractor(streaming=streaming).extract_with_offsets(pdf_path, [2, 3, 9])
+
+    assert "Ignoring requested pages beyond page 3" in caplog.text
+    assert text == "Third page"
+    assert pages == 3
+    assert spans == [{"page": 2, "start": 0, "end": 0}, {"page": 3, "start": 0, "end": 10}]
+
+
+def test_streaming_page_selection_stops_after_last_selected_page(tmp_path, monkeypatch):
+    from pdfminer.pdfpage import PDFPage
+
+    pdf_path = write_text_pdf(tmp_path / "doc.pdf", [[f"page {i}"] for i in range(1, 41)])
+    create_pages = PDFPage.create_pages
+    walked = []
+
+    def counting(doc):
+        for page in create_pages(doc):
+            walked.append(page)
+            yield page
+
+    monkeypatch.setattr(PDFPage, "create_pages", counting)
+    text, pages, spans = PDFTextExtractor(streaming=True).extract_with_offsets(pdf_path, [2])
+
+    assert (text, pages) == ("page 2", 40)
+    assert len(walked) <= 3
+    with pytest.raises(ValueError, match="out of range"):
+        PDFTextExtractor(streaming=True).extract(pdf_path, [41])
+
+
+def test_extract_tool_by_reference(tmp_path):
+    pdf_path = write_text_pdf(tmp_path / "doc.pdf", PAGES)
+
+    result = ExtractPDFTextTool().run(pdf_path, pages="1,3", by_reference=True)
+
+    assert "text" not in result
+    assert result["text_uri"].startswith("text://documents/")
+    stored = get_text_store().get(result["text_uri"])
+    assert stored == "First page, line one\nline two\nThird page"
+    assert result["characters"] == len(stored)
+    assert [stored[span["start"]:span["end"]] for span in result["page_results"]] == [
+        "First page, line one\nline two",
+        "Third page",
+    ]
+
+
+def test_parse_page_ranges():
+    assert parse_page_ranges("3, 1-2,2") == [1, 2, 3]
+    assert parse_page_ranges("") is None
+    with pytest.raises(ValueError):
+        parse_page_ranges("4-2")
+    with pytest.raises(ValueError, match="maximum page number"):
+        parse_page_ranges("1-2000000000")
+    with pytest.raises(ValueError, match="maximum page number"):
+        parse_page_ranges([1, 10**9])
+
+
+def test_extract_from_memory(tmp_path):
+    pdf_bytes = build_text_pdf(PAGES)
+    tool = ExtractPDFTextTool()
+
+    from_base64 = tool.run_base64(base64.b64encode(pdf_bytes).decode())
+    mapped = ExtractPDFTextTool()
+    mapped.service.loader = PDFSourceLoader(use_mmap=True)
+    from_mmap = mapped.run(write_text_pdf(tmp_path / "doc.pdf", PAGES))
+
+    assert from_base64["text"] == from_mmap["text"] == "First page, line one\nline two\nThird page"
+    with pytest.raises(ValueError, match="Invalid base64"):
+        tool.run_base64("not base64!")
+
+
+def test_coalesced_extractions_are_independent_and_respect_settings(tmp_path):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from app.tools.extract_pdf_text.PDF_extraction_service import PDFExtractionService, _extraction_flight
+
+    pdf_path = write_text_pdf(tmp_path / "doc.pdf", PAGES)
+    release = threading.Event()
+    loads = []
+
+    class SlowLoader(PDFSourceLoader):
+        def load(self, source):
+            loads.append(source)
+            release.wait(5)
+            return super().load(source)
+
+    default = PDFExtractionService(SlowLoader(), PDFTextExtractor(streaming=False))
+    streaming = PDFExtractionService(SlowLoader(), PDFTextExtractor(streaming=True))
+    calls = _extraction_flight.stats()["calls"]
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(default.extract, pdf_path), pool.submit(default.extract, pdf_path),
+                   pool.submit(streaming.extract, pdf_path)]
+        deadline = time.monotonic() + 5
+        while (_extraction_flight.stats()["calls"] < calls + 3 or len(loads) < 2) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        first, second, third = [future.result() for future in futures]
+
+    assert len(loads) == 2
+    assert first == second == third
+    first["page_results"][0]["page"] = -1
+    assert second["page_results"][0]["page"] == 1
+
+    # HTTP clients are not settings; memory limits are
+    clients = [PDFExtractionService(PDFSourceLoader(http_client=object()), PDFTextExtractor()) for _ in range(2)]
+    assert clients[0]._settings() == clients[1]._settings()
+    limited = PDFExtractionService(PDFSourceLoader(), PDFTextExtractor(memory_limit_mb=64))
+    assert limited._settings() != PDFExtractionService(PDFSourceLoader(), PDFTextExtractor())._settings()
@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.tools.evaluate_llm import EvaluateLLMResponsesTool
+from app.tools.evaluate_llm.evaluate_llm_responses_schema import EVALUATION_INPUT_SCHEMA
+from app.utils import compile_schema, get_validation_stats
+import jsonschema
+import pytest
+
+
+def test_compiled_validator_matches_jsonschema_messages():
+    validator = compile_schema("evaluate_llm_responses.input", EVALUATION_INPUT_SCHEMA)
+    invalid = {"ground_truth": "", "response": 3}
+
+    with pytest.raises(jsonschema.ValidationError) as expected:
+        jsonschema.validate(instance=invalid, schema=EVALUATION_INPUT_SCHEMA)
+    with pytest.raises(ValueError) as actual:
+        validator.validate_input(invalid)
+
+    assert str(actual.value) == f"Invalid input data: {expected.value.message}"
+    assert compile_schema("evaluate_llm_responses.input", EVALUATION_INPUT_SCHEMA) is validator
+
+
+def test_output_validation_toggle_and_stats(monkeypatch):
+    validator = compile_schema("test.output", {"type": "object", "required": ["summary"]})
+
+    with pytest.raises(ValueError, match="Invalid output data:"):
+        validator.validate_output({})
+    monkeypatch.setenv("SKIP_OUTPUT_VALIDATION", "true")
+    validator.validate_output({})
+
+    tool = EvaluateLLMResponsesTool()
+    before = get_validation_stats()
+    tool.run({"ground_truth": "a cat", "response": "the cat"})
+    after = get_validation_stats()
+    assert after["test.output"]["calls"] == 1
+    assert after["evaluate_llm_responses.input"]["calls"] == before["evaluate_llm_responses.input"]["calls"] + 1
+    assert after["evaluate_llm_responses.output"]["calls"] == before["evaluate_llm_responses.output"]["calls"]
+
+
+async def test_evaluation_server_reports_validation_in_tool_workers(monkeypatch):
+    import importlib
+    import json
+    from fastmcp import Client
+
+    monkeypatch.setenv("TOOL_PROCESS_WORKERS", "1")
+    monkeypatch.syspath_prepend(os.path.join(os.path.dirname(__file__), "..", "mcp_servers"))
+    server = importlib.import_module("evaluation_server")
+    assert server.executor.cpu_bound == {"evaluate_llm_responses"}
+
+    async with Client(server.mcp) as client:
+        before = json.loads((await client.read_resource("metrics://schema-validation"))[0].text)
+        in_process = get_validation_stats().get("evaluate_llm_responses.input", {}).get("calls", 0)
+        await client.call_tool("evaluate_llm_responses", {"ground_truth": "a cat", "response": "the cat"})
+        after = json.loads((await client.read_resource("metrics://schema-validation"))[0].text)
+
+    # The call was validated in the worker process, yet the server's resource counts it
+    assert get_validation_stats().get("evaluate_llm_responses.input", {}).get("calls", 0) == in_process
+    calls_before = before.get("evaluate_llm_responses.input", {}).get("calls", 0)
+    assert after["evaluate_llm_responses.input"]["calls"] >= calls_before + 1
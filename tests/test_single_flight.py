@@ -0,0 +1,113 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.llm import ModelRouter, SyntheticLLMClient
+from app.utils import SingleFlight, AsyncSingleFlight, TTLCache
+import pytest
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test-sync")
+    calls = []
+    release = threading.Event()
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return {"value": 42}
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(flight.do, "key", work) for _ in range(8)]
+        while flight.stats()["calls"] < 8:
+            time.sleep(0.005)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(result == {"value": 42} for result in results)
+    assert flight.stats() == {"calls": 8, "executions": 1, "coalesced": 7, "in_flight": 0}
+    # Once finished, the next call runs again
+    assert flight.do("key", lambda: "fresh") == "fresh"
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight("test-errors")
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "key", fail)
+        started.wait(5)
+        follower = pool.submit(flight.do, "key", lambda: "not called")
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="upstream down"):
+                future.result()
+
+
+async def test_async_calls_share_one_task_and_survive_cancellation():
+    flight = AsyncSingleFlight("test-async")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+    others = [asyncio.ensure_future(flight.do("key", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await asyncio.gather(*others) == ["done"] * 5
+    assert len(calls) == 1
+
+
+async def test_cache_misses_are_coalesced():
+    cache = TTLCache("test-coalesced-misses", ttl=60)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load_async("k", load) for _ in range(10)))
+
+    assert [value for value, _ in results] == ["value"] * 10
+    assert len(loads) == 1
+
+
+def test_identical_llm_requests_are_coalesced():
+    client = SyntheticLLMClient(latency_ms=100, latency_sigma=0.0)
+    counted = []
+
+    def factory(model):
+        counted.append(model)
+        return client
+
+    calls = []
+    original = client.generate
+
+    def generate(**kwargs):
+        calls.append(1)
+        return original(**kwargs)
+
+    client.generate = generate
+    router = ModelRouter(task="test", client_factory=factory, escalation=False)
+    with ThreadPoolExecutor(6) as pool:
+        results = list(pool.map(lambda _: router.generate("sys", "same prompt"), range(6)))
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    results[0]["text"] = "changed"
+    assert results[1]["text"] != "changed"
@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.tools.summarize_pdfs.summarize_pdfs_service import SummarizePDFsService
+from tests.pdf_factory import write_text_pdf
+
+
+class StubSummarizer:
+    def run(self, text: str) -> dict:
+        return {
+            "summary": f"summary of {len(text.split())} words",
+            "metadata": {"document_length": len(text), "summary_length": 10, "processing_time": 0.1},
+        }
+
+
+class StubLanguageDetector:
+    def run(self, text: str) -> dict:
+        return {"language": "en", "confidence": 1.0}
+
+
+def test_summarize_pdfs_streams_each_document_then_throughput(tmp_path):
+    first = write_text_pdf(tmp_path / "first.pdf", [["alpha beta gamma"], ["delta epsilon"]])
+    second = write_text_pdf(tmp_path / "second.pdf", [["one two three four"]])
+    missing = str(tmp_path / "missing.pdf")
+
+    service = SummarizePDFsService(
+        max_extraction_workers=2,
+        max_llm_concurrency=2,
+        summarizer=StubSummarizer(),
+        language_detector=StubLanguageDetector(),
+    )
+    try:
+        events = list(service.summarize([first, missing, second]))
+        # The same spawned workers and LLM threads serve the next batch
+        pool, llm_pool = service._extraction_pool, service._llm_pool
+        assert pool._mp_context.get_start_method() == "spawn"
+        list(service.summarize([second]))
+        assert service._extraction_pool is pool and service._llm_pool is llm_pool
+    finally:
+        service.shutdown()
+    assert service._extraction_pool is None and service._llm_pool is None
+
+    documents = {event["document"]: event for event in events[:-1]}
+    assert set(documents) == {0, 1, 2}
+    assert documents[0]["status"] == "completed"
+    assert documents[0]["final_summary"] == "summary of 5 words"
+    assert documents[0]["metadata"]["pages"] == 2
+    assert documents[2]["metadata"]["chunks"] == 1
+    assert documents[1]["status"] == "failed"
+    assert "does not exist" in documents[1]["error"]
+
+    throughput = events[-1]["throughput"]
+    assert throughput["documents"] == 3
+    assert throughput["completed"] == 2
+    assert throughput["failed"] == 1
+    assert throughput["pages"] == 3
+    assert throughput["documents_per_second"] > 0
@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import time
+from app.tools import ToolExecutor, ToolRegistry
+import pytest
+
+
+class SleepyTool:
+    def run(self, seconds: float) -> float:
+        time.sleep(seconds)
+        return seconds
+
+    def stream(self, n: int):
+        for i in range(n):
+            yield {"event": i}
+
+    def fail(self):
+        raise ValueError("bad input")
+
+
+class PidTool:
+    def run(self) -> int:
+        return os.getpid()
+
+
+async def test_blocking_tools_run_off_the_event_loop():
+    registry = ToolRegistry("test-server", {"sleepy": SleepyTool})
+    executor = ToolExecutor(registry, process_workers=0, thread_workers=4)
+
+    started = time.perf_counter()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while time.perf_counter() - started < 0.2:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    results = await asyncio.gather(*(executor.run("sleepy", "run", 0.2) for _ in range(4)), ticker())
+    assert results[:4] == [0.2] * 4
+    assert time.perf_counter() - started < 0.6
+    assert ticks > 5  # the loop kept running while the tools slept
+    assert await executor.run("sleepy", "stream", 3) == [{"event": 0}, {"event": 1}, {"event": 2}]
+    with pytest.raises(ValueError, match="bad input"):
+        await executor.run("sleepy", "fail")
+
+    stats = executor.stats()["tools"]["sleepy"]
+    assert (stats["pool"], stats["calls"], stats["errors"], stats["queued"], stats["running"]) == ("thread", 6, 1, 0, 0)
+    executor.shutdown()
+
+
+async def test_per_tool_limit_queues_calls(monkeypatch):
+    monkeypatch.setenv("TOOL_CONCURRENCY_SLEEPY", "1")
+    registry = ToolRegistry("test-server", {"sleepy": SleepyTool})
+    executor = ToolExecutor(registry, process_workers=0, thread_workers=4)
+
+    calls = [asyncio.ensure_future(executor.run("sleepy", "run", 0.05)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    snapshot = executor.stats()
+    assert (snapshot["queued"], snapshot["running"]) == (2, 1)
+    await asyncio.gather(*calls)
+
+    stats = executor.stats()["tools"]["sleepy"]
+    assert (stats["limit"], stats["max_queued"]) == (1, 2)
+    assert stats["mean_wait_seconds"] > 0.02
+    executor.shutdown()
+
+
+async def test_cpu_bound_tools_run_in_warm_worker_processes():
+    registry = ToolRegistry("test-server", {"sleepy": SleepyTool})
+    executor = ToolExecutor(registry, cpu_factories={"pid": PidTool}, process_workers=1, thread_workers=2)
+    try:
+        await asyncio.to_thread(registry.warm)
+        await asyncio.to_thread(executor.warm)
+        assert list(registry.status()["tools"]) == ["sleepy"]  # never built in this process
+        worker_pid = await executor.run("pid", "run")
+        assert worker_pid != os.getpid()
+        assert await executor.run("pid", "run") == worker_pid
+        assert executor.stats()["tools"]["pid"]["pool"] == "process"
+        assert executor.stats()["tools"]["sleepy"]["pool"] == "thread"
+    finally:
+        executor.shutdown()
+
+
+async def test_cpu_bound_tools_without_worker_processes_use_their_own_registry():
+    registry = ToolRegistry("test-server", {"sleepy": SleepyTool})
+    warmed = []
+    executor = ToolExecutor(registry, cpu_factories={"pid": PidTool},
+                            worker_warmups={"pid": lambda cpu_registry: warmed.append(cpu_registry.get("pid").run())},
+                            process_workers=0, thread_workers=2)
+    try:
+        await asyncio.to_thread(executor.warm)
+        assert warmed == [os.getpid()]
+        assert await executor.run("pid", "run") == os.getpid()
+        assert executor.stats()["tools"]["pid"]["pool"] == "thread"
+        assert "pid" not in registry.status()["tools"]
+    finally:
+        executor.shutdown()
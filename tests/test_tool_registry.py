@@ -0,0 +1,91 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.tools import ToolRegistry
+from app.tools.summarize_pdf.summarize_pdf_service import SummarizePDFService
+import pytest
+
+
+class Counter:
+    created = 0
+
+    def __init__(self):
+        Counter.created += 1
+
+
+def test_tools_are_built_once_and_shared():
+    Counter.created = 0
+    registry = ToolRegistry("test-server", {"counter": Counter})
+    assert registry.get("counter") is registry.get("counter")
+    assert Counter.created == 1
+    assert registry.status()["tools"] == {"counter": "ready"}
+
+
+def test_failed_tool_is_reported_and_retried():
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise ValueError("OPEN_WEATHER_MAP_API_KEY is not found")
+
+    registry = ToolRegistry("test-server", {"fetch_weather": broken, "counter": Counter})
+    registry.build()
+    assert registry.status()["tools"] == {
+        "fetch_weather": "error: OPEN_WEATHER_MAP_API_KEY is not found",
+        "counter": "ready",
+    }
+    with pytest.raises(ValueError, match="API_KEY"):
+        registry.get("fetch_weather")
+    assert len(attempts) == 2
+
+
+async def test_ready_only_after_warmup():
+    steps = []
+
+    def warm_counter(registry):
+        assert registry.status()["tools"]["counter"] == "ready"
+        steps.append("counter")
+
+    def failing_step(registry):
+        raise RuntimeError("LLM unavailable")
+
+    registry = ToolRegistry("test-server", {"counter": Counter},
+                            warmups={"counter": warm_counter, "llm_ping": failing_step})
+    assert not registry.ready
+    await registry.start()
+    assert registry.ready
+    assert steps == ["counter"]
+    warmups = registry.status()["warmups"]
+    assert warmups["counter"]["error"] is None
+    assert warmups["llm_ping"]["error"] == "LLM unavailable"
+
+
+class StubExtractor:
+    def run(self, source):
+        return {"success": True, "text": " ".join([source] * 40), "pages": 1}
+
+
+class StubLanguageDetector:
+    def run(self, text):
+        return {"language": "en", "confidence": 1.0}
+
+
+class StubSummarizer:
+    def run(self, text):
+        return {"summary": text.split()[0],
+                "metadata": {"document_length": len(text), "summary_length": 1, "processing_time": 0.1}}
+
+
+def test_shared_summarize_pdf_service_keeps_requests_apart():
+    service = SummarizePDFService()
+    service.pdf_extractor, service.language_detector, service.summarizer = (
+        StubExtractor(), StubLanguageDetector(), StubSummarizer())
+
+    # Two requests interleaved on one instance, as concurrent handlers would run them
+    short, long = service.summarize("a"), service.summarize("bbbbbbbbbb")
+    next(short)
+    next(long)
+    short_final, long_final = list(short)[-1], list(long)[-1]
+    assert short_final["metadata"]["document_length"] == len(" ".join(["a"] * 40))
+    assert long_final["metadata"]["document_length"] == len(" ".join(["bbbbbbbbbb"] * 40))
@@ -0,0 +1,121 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+import time
+import traceback
+from app.utils import TTLCache, get_cache_stats
+import pytest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fresh_stale_and_expired_entries():
+    clock = Clock()
+    cache = TTLCache("test-swr", ttl=10, stale_ttl=20, clock=clock)
+    calls = []
+    refreshed = threading.Event()
+
+    def loader():
+        calls.append(clock.now)
+        if len(calls) > 1:
+            refreshed.set()
+        return len(calls)
+
+    assert cache.get_or_load("k", loader)[0] == 1
+    clock.now = 5
+    value, info = cache.get_or_load("k", loader)
+    assert (value, info["status"], info["age_seconds"]) == (1, "hit", 5)
+
+    # Expired but within the stale window: old value now, reload in the background
+    clock.now = 15
+    value, info = cache.get_or_load("k", loader)
+    assert (value, info["status"]) == (1, "stale")
+    assert refreshed.wait(5)
+    while not cache.stats()["refreshes"]:
+        time.sleep(0.01)
+    assert cache.get_or_load("k", loader) == (2, {"status": "hit", "stale": False, "age_seconds": 0.0, "hit_ratio": 0.75})
+
+    # Past the stale window the caller waits for a reload
+    clock.now = 100
+    value, info = cache.get_or_load("k", loader)
+    assert (value, info["status"]) == (3, "miss")
+    assert get_cache_stats()["test-swr"]["refreshes"] == 1
+
+
+def test_negative_caching_and_eviction():
+    clock = Clock()
+    cache = TTLCache("test-negative", ttl=10, negative_ttl=5, max_entries=2,
+                     negative_if=lambda e: isinstance(e, LookupError), clock=clock)
+    calls = []
+
+    def unknown():
+        calls.append(1)
+        raise LookupError("unknown")
+
+    for _ in range(3):
+        with pytest.raises(LookupError):
+            cache.get_or_load("missing", unknown)
+    assert len(calls) == 1
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("flaky", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert cache.get_or_load("flaky", lambda: "ok")[0] == "ok"
+
+    clock.now = 6
+    with pytest.raises(LookupError):
+        cache.get_or_load("missing", unknown)
+    assert len(calls) == 2
+
+    cache.get_or_load("third", lambda: 3)
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_of_shortens_entry_lifetime():
+    clock = Clock()
+    cache = TTLCache("test-ttl-of", ttl=100, ttl_of=lambda value: value["expires_in"], clock=clock)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {"expires_in": 10}
+
+    cache.get_or_load("k", loader)
+    clock.now = 9
+    cache.get_or_load("k", loader)
+    clock.now = 11
+    cache.get_or_load("k", loader)
+    assert len(loads) == 2
+
+
+def test_negative_hits_raise_a_fresh_exception():
+    import httpx
+
+    cache = TTLCache("test-negative-fresh", ttl=10, negative_ttl=5,
+                     negative_if=lambda e: isinstance(e, httpx.HTTPStatusError), clock=Clock())
+    request = httpx.Request("GET", "https://upstream.test/weather")
+    response = httpx.Response(404, request=request)
+
+    def unknown():
+        raise httpx.HTTPStatusError("not found", request=request, response=response)
+
+    raised = []
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError) as info:
+            cache.get_or_load("atlantis", unknown)
+        raised.append(info.value)
+
+    assert len({id(error) for error in raised}) == 3
+    for error in raised[1:]:
+        assert str(error) == "not found"
+        assert error.response is response and error.request is request
+        # Only this lookup's frames, not every earlier negative hit's
+        assert len(traceback.extract_tb(error.__traceback__)) == len(traceback.extract_tb(raised[1].__traceback__))